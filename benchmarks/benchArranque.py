@@ -0,0 +1,46 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tiempo de importación del núcleo medido dentro de un proceso nuevo; falla si se cargó la interfaz
+CODIGO_IMPORTACION = """
+import sys, time
+inicio = time.perf_counter()
+import main
+fin = time.perf_counter()
+assert "tkinter" not in sys.modules and "PIL" not in sys.modules, "se importó la interfaz gráfica"
+print(fin - inicio)
+"""
+
+def medirImportacion():
+    salida = subprocess.run([sys.executable, "-c", CODIGO_IMPORTACION], cwd=RAIZ,
+                            check=True, capture_output=True, text=True).stdout
+    return float(salida)
+
+def medirPrimerResultado(argumentos):
+    """Tiempo de pared desde lanzar el proceso hasta que termina la primera simulación"""
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "simulation", "--silencioso", *argumentos], cwd=RAIZ,
+                   check=True, capture_output=True)
+    return time.perf_counter() - inicio
+
+def main(repeticiones: int, argumentos):
+    importaciones = [medirImportacion() for _ in range(repeticiones)]
+    primerosResultados = [medirPrimerResultado(argumentos) for _ in range(repeticiones)]
+
+    print(f"=== ARRANQUE ({repeticiones} repeticiones) ===")
+    print(f"Importación de main:        mediana {statistics.median(importaciones) * 1000:8.1f} ms")
+    print(f"Proceso hasta 1er resultado: mediana {statistics.median(primerosResultados) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide la latencia de arranque del modo sin interfaz")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("argumentos", nargs="*", default=["--cajeros", "5", "--clientes", "25"],
+                        help="argumentos para python -m simulation")
+    args = parser.parse_args()
+    main(args.repeticiones, args.argumentos)
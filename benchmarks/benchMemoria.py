@@ -0,0 +1,45 @@
+import argparse
+import random
+import tracemalloc
+import numpy as np
+from models.cliente import Cliente
+from models.almacenClientes import AlmacenClientes
+
+class ClienteConDict:
+    """Cliente como estaba antes de __slots__, para comparar"""
+    def __init__(self, numeroArticulos: int):
+        self.numeroArticulos = numeroArticulos
+        self.tiempoTotal = 0.0
+        self.tiempoLlegada = 0.0
+        self.tiempoEspera = 0.0
+
+def medirMemoria(construir):
+    """Bytes reservados por lo que retorna construir() (se mantiene vivo durante la medición)"""
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    objeto = construir()
+    usado = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del objeto
+    return usado
+
+def main(numeroClientes: int):
+    articulos = [random.randint(1, 50) for _ in range(numeroClientes)]
+    variantes = {
+        "Cliente con __dict__ (lista)": lambda: [ClienteConDict(n) for n in articulos],
+        "Cliente con __slots__ (lista)": lambda: [Cliente(n) for n in articulos],
+        "AlmacenClientes (columnar)": lambda: AlmacenClientes(np.array(articulos)),
+    }
+
+    print(f"=== MEMORIA PARA {numeroClientes} CLIENTES ===")
+    base = None
+    for nombre, construir in variantes.items():
+        usado = medirMemoria(construir)
+        base = base or usado
+        print(f"{nombre:32} {usado / 2**20:10.1f} MiB  {usado / numeroClientes:7.1f} B/cliente  "
+              f"({base / usado:5.1f}x menos)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara la memoria de las representaciones de clientes")
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    main(parser.parse_args().clientes)
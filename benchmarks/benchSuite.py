@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+import main as simulacionMain
+from models.caja import Caja
+from models.cajero import Cajero
+from simulation.asignacion import Enrutador
+from simulation.generadorDatos import GeneradorDatos
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+
+# Suite de rendimiento del núcleo y del renderizador. Cada caso retorna una función sin
+# argumentos que se cronometra varias veces; el resultado se guarda como JSON y se puede
+# comparar contra una línea base guardada con umbrales de regresión por caso.
+
+SEMILLA = 12345
+UMBRAL = 0.15  # regresión tolerada por defecto: 15% más lento que la línea base
+
+def prepararGeneracion(numeroClientes):
+    def caso():
+        GeneradorDatos(SEMILLA).generaClientes(numeroClientes)
+    return caso
+
+def prepararEnrutamiento(numeroClientes, numeroCajas):
+    cajas = Simulacion(ConfiguracionSimulacion(numeroCajas, 0, "medio", SEMILLA)).ejecutar().cajas
+    generador = GeneradorDatos(SEMILLA)
+    articulos = generador.articulosClientes(numeroClientes)
+    enrutador = Enrutador(cajas, generador)
+    return lambda: enrutador.enrutar(articulos)
+
+def prepararTiempoAtencion(numeroClientes, vectorizado):
+    caja = Caja(1, Cajero(True, 20), False, GeneradorDatos(SEMILLA).generaClientes(numeroClientes))
+    return lambda: caja.calcularTiempoAtencion(vectorizado)
+
+def prepararCajaMasRapida(numeroCajas, consultas=10_000):
+    cajas = Simulacion(ConfiguracionSimulacion(numeroCajas, numeroCajas * 20, "medio", SEMILLA)).ejecutar().cajas
+    articulos = GeneradorDatos(SEMILLA).articulosClientes(consultas).tolist()
+    def caso():
+        for numeroArticulos in articulos:
+            simulacionMain.encontrarCajaMasRapida(cajas, numeroArticulos)
+    return caso
+
+def prepararBusqueda(numeroClientes, numeroCajas, consultas=1_000):
+    configuracion = ConfiguracionSimulacion(numeroCajas, numeroClientes, "medio", SEMILLA, lineaTiempo=True)
+    linea = Simulacion(configuracion).ejecutar().lineaTiempo
+    instantes = np.random.default_rng(SEMILLA).uniform(0, linea.duracion, consultas).tolist()
+    def caso():
+        for instante in instantes:
+            linea.atendidos(instante)
+    return caso
+
+def prepararPrincipal(numeroClientes, numeroCajas):
+    return lambda: simulacionMain.main(numeroCajas, numeroClientes, "medio", mostrar_resultados=False, semilla=SEMILLA)
+
+def casosNucleo(rapido: bool):
+    """(nombre, preparar, repeticiones) de cada caso sin interfaz"""
+    tamanos = [1_000, 100_000] if rapido else [1_000, 100_000, 10_000_000]
+    casos = [
+        ("generaClientes/100000", lambda: prepararGeneracion(100_000), 5),
+        ("enrutar/1000000x100", lambda: prepararEnrutamiento(1_000_000, 100), 5),
+        ("calcularTiempoAtencion/100000", lambda: prepararTiempoAtencion(100_000, False), 5),
+        ("calcularTiempoAtencionVectorizado/100000", lambda: prepararTiempoAtencion(100_000, True), 5),
+        ("encontrarCajaMasRapida/1000cajas", lambda: prepararCajaMasRapida(1000), 5),
+        ("lineaTiempo/1000busquedas/1000000x100", lambda: prepararBusqueda(1_000_000, 100), 5),
+    ]
+    for numeroClientes in tamanos:
+        for numeroCajas in (5, 100, 1000):
+            repeticiones = 5 if numeroClientes <= 100_000 else 1
+            casos.append((f"main/{numeroClientes}x{numeroCajas}",
+                          lambda c=numeroClientes, n=numeroCajas: prepararPrincipal(c, n), repeticiones))
+    return casos
+
+def abrirPantalla():
+    """
+    Retorna (raíz de Tk, pantalla virtual o None), o (None, motivo) si no hay dónde dibujar.
+    Usa pyvirtualdisplay (Xvfb) si está instalado y no hay DISPLAY.
+    """
+    virtual = None
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        try:
+            from pyvirtualdisplay import Display
+            virtual = Display(visible=False, size=(1280, 800))
+            virtual.start()
+        except Exception as error:  # sin pyvirtualdisplay o sin Xvfb
+            return None, f"sin pantalla ({error})"
+    try:
+        import tkinter as tk
+        raiz = tk.Tk()
+        raiz.geometry("1280x800")
+        return raiz, virtual
+    except Exception as error:
+        if virtual is not None:
+            virtual.stop()
+        return None, f"sin pantalla ({error})"
+
+def casosInterfaz(raiz):
+    from display.interfaz import SupermercadoGUI
+
+    def prepararRedibujo(numeroCajas, numeroClientes, vista):
+        for widget in raiz.winfo_children():
+            widget.destroy()
+        app = SupermercadoGUI(raiz)
+        app.combo_vista.set(vista)
+        app.cajas = Simulacion(ConfiguracionSimulacion(numeroCajas, numeroClientes, "medio", SEMILLA)).ejecutar().cajas
+        app.dibujar_cajas()
+        raiz.update()
+        if app.lienzo is not None:
+            def caso():
+                app.lienzo.desplazar_y("scroll", 1, "units")
+                raiz.update_idletasks()
+        else:
+            def caso():
+                app.limpiar_frame_principal()
+                app.dibujar_cajas()
+                raiz.update_idletasks()
+        return caso
+
+    return [
+        ("gui/cuadricula/6x60", lambda: prepararRedibujo(6, 60, "cuadrícula"), 10),
+        ("gui/lienzo/1000x100000", lambda: prepararRedibujo(1000, 100_000, "lienzo"), 50),
+    ]
+
+def medir(preparar, repeticiones: int):
+    caso = preparar()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        caso()
+        tiempos.append(time.perf_counter() - inicio)
+    return {"mediana": statistics.median(tiempos), "minimo": min(tiempos), "repeticiones": repeticiones}
+
+def ejecutarSuite(rapido: bool = False, interfaz: bool = True, filtro: str = None):
+    resultados = {}
+    omitidos = {}
+    casos = casosNucleo(rapido)
+
+    raiz, virtual = abrirPantalla() if interfaz else (None, "desactivado con --sin-interfaz")
+    if raiz is not None:
+        casos += casosInterfaz(raiz)
+    elif interfaz:
+        omitidos["gui"] = virtual
+
+    for nombre, preparar, repeticiones in casos:
+        if filtro and filtro not in nombre:
+            continue
+        resultados[nombre] = medir(preparar, repeticiones)
+        print(f"  {nombre:42} mediana {resultados[nombre]['mediana'] * 1000:10.2f} ms", flush=True)
+
+    if raiz is not None:
+        raiz.destroy()
+        if virtual is not None:
+            virtual.stop()
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+        "omitidos": omitidos,
+    }
+
+def compararConBase(actual: dict, base: dict, umbral: float = UMBRAL, umbrales: dict = None):
+    """Retorna la lista de (caso, razón actual/base, umbral) que superan su umbral"""
+    umbrales = umbrales or {}
+    regresiones = []
+    for nombre, medicion in actual["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None:
+            continue
+        razon = medicion["mediana"] / anterior["mediana"]
+        limite = umbrales.get(nombre, umbral)
+        if razon > 1 + limite:
+            regresiones.append((nombre, razon, limite))
+    return regresiones
+
+def leerUmbrales(pares):
+    """["caso=0.3", ...] -> {"caso": 0.3}"""
+    umbrales = {}
+    for par in pares or []:
+        nombre, _, valor = par.rpartition("=")
+        umbrales[nombre] = float(valor)
+    return umbrales
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suite de rendimiento del núcleo y del renderizador")
+    parser.add_argument("--salida", default="benchmarks/resultados.json", help="JSON con las mediciones")
+    parser.add_argument("--base", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="regresión tolerada (0.15 = 15%%)")
+    parser.add_argument("--umbral-caso", nargs="+", metavar="CASO=UMBRAL", help="umbral propio de un caso")
+    parser.add_argument("--rapido", action="store_true", help="omitir los casos de 10 millones de clientes")
+    parser.add_argument("--sin-interfaz", action="store_true", help="omitir los casos de la interfaz gráfica")
+    parser.add_argument("--filtro", help="ejecutar solo los casos cuyo nombre contenga este texto")
+    args = parser.parse_args()
+
+    print("=== SUITE DE RENDIMIENTO ===")
+    actual = ejecutarSuite(args.rapido, not args.sin_interfaz, args.filtro)
+    for grupo, motivo in actual["omitidos"].items():
+        print(f"  {grupo}: omitido, {motivo}")
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(actual, archivo, indent=2)
+    print(f"Resultados en {args.salida}")
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = compararConBase(actual, base, args.umbral, leerUmbrales(args.umbral_caso))
+        for nombre, razon, limite in regresiones:
+            print(f"  REGRESIÓN {nombre}: {razon:.2f}x la línea base (tolerado {1 + limite:.2f}x)")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones respecto a la línea base")
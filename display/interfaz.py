@@ -3,16 +3,27 @@ from tkinter import ttk
 from PIL import Image, ImageTk
 import os
 import sys
+import time
+from collections import deque
 
-# Agregar el directorio raíz al path para importar módulos
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Agregar el directorio raíz al path para importar módulos (solo al ejecutar este archivo directamente)
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from simulation.generadorDatos import GeneradorDatos
-from models.caja import Caja
-import random
+from display.lienzoVirtual import LienzoCajas
+from display.trabajoSimulacion import FASE, RESULTADO, CANCELADO, TrabajoSimulacion
+from simulation.lineaTiempo import LineaTiempo
+from simulation.simulacion import ConfiguracionSimulacion
+from simulation import instrumentacion
 
 class SupermercadoGUI:
-    def __init__(self, root, cajas_precalculadas=None, clientes_precalculados=None):
+    PRESUPUESTO_CUADRO_MS = 8  # tiempo máximo por revisión de la cola del hilo de simulación
+    INTERVALO_REVISION_MS = 16  # ~60 revisiones por segundo mientras se simula
+    CUADROS_POR_SEGUNDO = 30  # la animación dibuja a ritmo fijo, sin importar cuántos clientes salen
+    MAXIMO_CUADROS_POR_PASO = 4  # tras una pausa de la ventana el reloj avanza a lo sumo 4 cuadros
+    FACTORES_VELOCIDAD = ("1", "10", "60", "100", "300", "1000")  # segundos simulados por segundo real
+
+    def __init__(self, root, cajas_precalculadas=None, clientes_precalculados=None, linea_tiempo=None):
         self.root = root
         self.root.title("Simulación de Supermercado")
         # Ventana más grande para mostrar todo
@@ -23,7 +34,17 @@ class SupermercadoGUI:
         self.cajas = cajas_precalculadas or []
         self.clientes_precalculados = clientes_precalculados
         self.animacion_activa = False
-        self.velocidad_animacion = 1000  # milisegundos
+        self.factor_velocidad = 60.0  # segundos simulados por segundo real
+        self.reloj_simulado = 0.0  # segundos desde que abrió la tienda
+        self.proximo_cuadro = 0.0  # instante (perf_counter) en que toca el siguiente cuadro
+        self.linea_tiempo = linea_tiempo  # salidas por caja para ubicarse en cualquier instante
+        self.atendidos = []  # clientes ya atendidos de cada caja en lo que está dibujado
+        self.instante_escala = None  # último valor que la animación puso en la línea de tiempo
+        self.id_animacion = None  # callback pendiente de root.after
+        self.vistas_cajas = []  # widgets de cada caja, se crean una vez y se actualizan en sitio
+        self.lienzo = None  # renderizador de un solo Canvas para tiendas grandes
+        self.trabajo = None  # simulación en curso en un hilo aparte
+        self.id_revision = None  # callback pendiente que lee la cola del hilo
         self.modo_precalculado = cajas_precalculadas is not None
 
         # Cargar imágenes
@@ -34,11 +55,6 @@ class SupermercadoGUI:
 
         # Si hay datos precalculados, mostrarlos inmediatamente
         if self.modo_precalculado:
-            # Guardar el estado original de las filas antes de mostrar
-            self.clientes_originales = []
-            for caja in self.cajas:
-                self.clientes_originales.append(caja.filaClientes.copy())
-
             self.mostrar_simulacion_precalculada()
             # En modo precalculado, permitir nueva simulación con configuración modificable
             # Los controles permanecen habilitados para que el usuario pueda cambiarlos
@@ -87,7 +103,7 @@ class SupermercadoGUI:
         tk.Label(frame_config, text="Cajeros:",
                 bg="#2c3e50", fg="white", font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
 
-        self.spin_cajeros = tk.Spinbox(frame_config, from_=3, to=8, width=4, font=("Arial", 9))
+        self.spin_cajeros = tk.Spinbox(frame_config, from_=3, to=200, width=4, font=("Arial", 9))
         self.spin_cajeros.delete(0, tk.END)
         self.spin_cajeros.insert(0, "5")
         self.spin_cajeros.pack(side=tk.LEFT, padx=3)
@@ -95,7 +111,7 @@ class SupermercadoGUI:
         tk.Label(frame_config, text="Clientes:",
                 bg="#2c3e50", fg="white", font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
 
-        self.spin_clientes = tk.Spinbox(frame_config, from_=10, to=50, width=4, font=("Arial", 9))
+        self.spin_clientes = tk.Spinbox(frame_config, from_=10, to=100000, width=6, font=("Arial", 9))
         self.spin_clientes.delete(0, tk.END)
         self.spin_clientes.insert(0, "25")
         self.spin_clientes.pack(side=tk.LEFT, padx=3)
@@ -108,15 +124,24 @@ class SupermercadoGUI:
         self.combo_posicion.set("ultima")
         self.combo_posicion.pack(side=tk.LEFT, padx=3)
 
+        tk.Label(frame_config, text="Vista:",
+                bg="#2c3e50", fg="white", font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
+
+        # "auto" usa el lienzo cuando la tienda no cabe en la cuadrícula de widgets
+        self.combo_vista = ttk.Combobox(frame_config, values=["auto", "cuadrícula", "lienzo"],
+                                        width=9, font=("Arial", 9), state="readonly")
+        self.combo_vista.set("auto")
+        self.combo_vista.pack(side=tk.LEFT, padx=3)
+
         tk.Label(frame_config, text="Velocidad:",
                 bg="#2c3e50", fg="white", font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
 
-        self.spin_velocidad = tk.Spinbox(frame_config, from_=500, to=3000, increment=500,
-                                        width=4, font=("Arial", 9))
+        self.spin_velocidad = tk.Spinbox(frame_config, values=self.FACTORES_VELOCIDAD,
+                                        width=5, font=("Arial", 9))
         self.spin_velocidad.delete(0, tk.END)
-        self.spin_velocidad.insert(0, "1000")
+        self.spin_velocidad.insert(0, "60")
         self.spin_velocidad.pack(side=tk.LEFT, padx=3)
-        tk.Label(frame_config, text="ms",
+        tk.Label(frame_config, text="×",
                 bg="#2c3e50", fg="white", font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
         
         # Separador vertical
@@ -149,6 +174,29 @@ class SupermercadoGUI:
             state=tk.DISABLED
         )
         self.btn_detener.pack(side=tk.LEFT, padx=3)
+
+        # Estado de la simulación en segundo plano
+        self.label_estado = tk.Label(frame_config, text="", bg="#2c3e50", fg="white", font=("Arial", 9))
+        self.label_estado.pack(side=tk.LEFT, padx=8)
+
+        # Línea de tiempo: arrastrarla muestra la tienda en ese instante sin repetir la atención
+        frame_linea = tk.Frame(self.root, bg="#2c3e50")
+        frame_linea.pack(fill=tk.X, padx=5)
+        tk.Label(frame_linea, text="Tiempo (s):",
+                bg="#2c3e50", fg="white", font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
+        self.escala_tiempo = tk.Scale(
+            frame_linea,
+            from_=0,
+            to=0,
+            orient=tk.HORIZONTAL,
+            resolution=1,
+            command=self.buscar_instante,
+            bg="#2c3e50",
+            fg="white",
+            font=("Arial", 8),
+            highlightthickness=0
+        )
+        self.escala_tiempo.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=3)
         
         # Frame principal 
         self.frame_principal = tk.Frame(self.root, bg="#ecf0f1")
@@ -169,41 +217,17 @@ class SupermercadoGUI:
     
     def mostrar_simulacion_precalculada(self):
         """Muestra la simulación con datos precalculados del main.py"""
-        # Limpiar frame principal
-        for widget in self.frame_principal.winfo_children():
-            widget.destroy()
-
-        # Dibujar cajas con datos precalculados
-        self.dibujar_cajas_grid()
-
-        # Configurar velocidad de animación
-        self.velocidad_animacion = int(self.spin_velocidad.get())
+        # La animación no modifica las filas, así que se puede repetir sin restaurarlas
+        # Limpiar frame principal y dibujar cajas con datos precalculados
+        self.limpiar_frame_principal()
+        self.dibujar_cajas()
 
-        # Reiniciar las filas de clientes a su estado original para la animación
-        self.resetear_clientes()
-
-        # Iniciar animación
-        self.animacion_activa = True
         self.btn_iniciar.config(state=tk.NORMAL)  # Permitir reiniciar
         self.btn_detener.config(state=tk.NORMAL)
-        self.animar_atencion()
-
-    def resetear_clientes(self):
-        """Resetea las filas de clientes a su estado original para reiniciar la animación"""
-        # Los datos precalculados incluyen las filas originales, pero la animación las modifica
-        # Necesitamos guardar el estado original al inicio
-        if not hasattr(self, 'clientes_originales'):
-            # Guardar el estado original de las filas
-            self.clientes_originales = []
-            for caja in self.cajas:
-                self.clientes_originales.append(caja.filaClientes.copy())
-
-        # Restaurar las filas originales
-        for i, caja in enumerate(self.cajas):
-            caja.filaClientes = self.clientes_originales[i].copy()
+        self.iniciar_animacion()
 
     def iniciar_simulacion(self):
-        """Inicia una nueva simulación con animación automática"""
+        """Inicia una nueva simulación en un hilo aparte; la animación empieza al recibir el resultado"""
         # Siempre permitir nuevas simulaciones, incluso en modo precalculado
         # El usuario puede cambiar la configuración y ejecutar nuevas simulaciones
 
@@ -211,76 +235,118 @@ class SupermercadoGUI:
         self.frame_stats.pack_forget()
 
         # Limpiar frame principal
-        for widget in self.frame_principal.winfo_children():
-            widget.destroy()
+        self.limpiar_frame_principal()
+
+        # La simulación (mismo núcleo que la consola) corre fuera del hilo de Tk para no congelar la ventana
+        configuracion = ConfiguracionSimulacion(
+            numeroCajeros=int(self.spin_cajeros.get()),
+            numeroClientes=int(self.spin_clientes.get()),
+            posicionExpress=self.combo_posicion.get(),
+            lineaTiempo=True,
+        )
+        self.trabajo = TrabajoSimulacion(configuracion).iniciar()
+        self.label_estado.config(text="⏳ Simulando...")
+        self.btn_iniciar.config(state=tk.DISABLED)
+        self.btn_detener.config(state=tk.NORMAL)
+        self.revisar_trabajo()
 
-        # Generar datos con configuración de la interfaz
-        generador = GeneradorDatos()
-        num_cajeros = int(self.spin_cajeros.get())
-        num_clientes = int(self.spin_clientes.get())
-        posicion_express = self.combo_posicion.get()
-
-        cajeros = generador.generarCajeros(num_cajeros)
-
-        # Determinar posición de la caja express
-        posicion_express_idx = None
-        if posicion_express == "primera":
-            posicion_express_idx = 0
-        elif posicion_express == "medio":
-            posicion_express_idx = num_cajeros // 2  # Posición central
-        elif posicion_express == "ultima":
-            posicion_express_idx = num_cajeros - 1
-        elif posicion_express == "aleatoria":
-            posicion_express_idx = random.randint(0, num_cajeros - 1)
-
-        # Crear cajas con configuración
-        self.cajas = []
-        for i in range(num_cajeros):
-            es_express = (i == posicion_express_idx)
-            caja = Caja(idCaja=i+1, cajero=cajeros[i], esExpress=es_express)
-            self.cajas.append(caja)
-
-        # Generar y asignar clientes de manera aleatoria
-        clientes = generador.generaClientes(num_clientes)
-        for cliente in clientes:
-            asignado = False
-
-            # Determinar cajas válidas para el cliente
-            if cliente.numeroArticulos <= 10:
-                # Cliente puede usar cualquier caja (express o normal)
-                cajas_validas = self.cajas
-            else:
-                # Cliente solo puede usar cajas normales
-                cajas_validas = [caja for caja in self.cajas if not caja.esExpress]
-
-            # Intentar asignar a una caja aleatoria de las válidas
-            intentos = 0
-            while not asignado and cajas_validas and intentos < 100:
-                caja_aleatoria = random.choice(cajas_validas)
-                if caja_aleatoria.agregarCliente(cliente):
-                    asignado = True
-                else:
-                    # Si no se pudo asignar, remover de la lista para evitar loop infinito
-                    cajas_validas.remove(caja_aleatoria)
-                intentos += 1
-
-        # Calcular tiempos
-        for caja in self.cajas:
-            caja.calcularTiempoAtencion()
+    def revisar_trabajo(self):
+        """Lee los mensajes del hilo de simulación sin pasar del presupuesto de un cuadro"""
+        self.id_revision = None
+        trabajo = self.trabajo
+        if trabajo is None:
+            return
 
-        self.dibujar_cajas_grid()
+        for tipo, dato in trabajo.pendientes(self.PRESUPUESTO_CUADRO_MS / 1000):
+            if tipo == FASE:
+                self.label_estado.config(text=f"⏳ Simulando: {dato}...")
+                continue
+            self.trabajo = None
+            if tipo == RESULTADO and trabajo.cancelacion.is_set():
+                tipo = CANCELADO  # DETENER llegó con el resultado ya en la cola: se descarta
+            if tipo == RESULTADO:
+                self.label_estado.config(text="")
+                self.mostrar_resultado(dato)
+            elif tipo == CANCELADO:
+                self.label_estado.config(text="⏹️ Simulación cancelada")
+            else:
+                self.label_estado.config(text=f"⚠️ Error en la simulación: {dato}")
+                self.detener_animacion()
+            return
 
-        # Configurar velocidad de animación
-        self.velocidad_animacion = int(self.spin_velocidad.get())
+        self.id_revision = self.root.after(self.INTERVALO_REVISION_MS, self.revisar_trabajo)
+
+    def mostrar_resultado(self, resultado):
+        """Dibuja las cajas calculadas por el hilo de simulación e inicia la animación"""
+        self.cajas = resultado.cajas
+        self.linea_tiempo = resultado.lineaTiempo
+        self.dibujar_cajas()
+        self.iniciar_animacion()
+
+    def limpiar_frame_principal(self):
+        """Destruye todas las cajas dibujadas; solo se usa al empezar una simulación nueva"""
+        if self.id_animacion is not None:
+            self.root.after_cancel(self.id_animacion)
+            self.id_animacion = None
+        if self.id_revision is not None:
+            self.root.after_cancel(self.id_revision)
+            self.id_revision = None
+        if self.trabajo is not None:
+            self.trabajo.cancelar()
+            self.trabajo = None
+        for widget in self.frame_principal.winfo_children():
+            widget.destroy()
+        self.vistas_cajas = []
+        self.lienzo = None
+
+    def usar_lienzo(self):
+        """Decide si las cajas se dibujan en el lienzo virtualizado o en la cuadrícula de widgets"""
+        vista = self.combo_vista.get()
+        if vista != "auto":
+            return vista == "lienzo"
+        total_clientes = len(self.linea_tiempo.salidas)
+        return len(self.cajas) > 6 or total_clientes > 50
+
+    def dibujar_cajas(self):
+        """Dibuja las cajas con el renderizador adecuado al tamaño de la tienda"""
+        self.preparar_linea_tiempo()
+        with instrumentacion.medir("gui.dibujar"):
+            if self.usar_lienzo():
+                self.lienzo = LienzoCajas(self.frame_principal, self.img_cajero, self.img_cliente)
+                self.lienzo.pack(fill=tk.BOTH, expand=True)
+                self.lienzo.mostrar(self.cajas, self.linea_tiempo, self.atendidos)
+            else:
+                self.dibujar_cajas_grid()
+        if instrumentacion.activa:
+            instrumentacion.registrar("gui.widgetsPorCuadro", self.contar_widgets(self.frame_principal))
+
+    def preparar_linea_tiempo(self):
+        """Arma la línea de tiempo si las cajas no la traen (datos precalculados) y vuelve al instante 0"""
+        if self.linea_tiempo is None or self.linea_tiempo.cajas is not self.cajas:
+            self.linea_tiempo = LineaTiempo.desdeCajas(self.cajas)
+        self.reloj_simulado = 0.0
+        self.atendidos = [0] * len(self.cajas)
+        self.instante_escala = 0
+        self.escala_tiempo.config(to=max(1, round(self.linea_tiempo.duracion)))
+        self.escala_tiempo.set(0)
+
+    def contar_widgets(self, widget):
+        """Número de widgets dentro de widget (solo se usa con la instrumentación activa)"""
+        hijos = widget.winfo_children()
+        return len(hijos) + sum(self.contar_widgets(hijo) for hijo in hijos)
+
+    def texto_info_caja(self, idx, atendidos):
+        """Texto del encabezado: experiencia, carga pendiente y clientes en fila"""
+        experiencia = "⭐" if self.cajas[idx].cajero.experiencia else "🔰"
+        # carga pendiente y fila salen de la línea de tiempo, sin recorrer la fila
+        carga = self.linea_tiempo.cargaPendiente(idx, atendidos)
+        return f"{experiencia} | ⏱️ {carga:.0f}s | 👥 {self.linea_tiempo.enFila(idx, atendidos)}"
 
-        # Iniciar animación
-        self.animacion_activa = True
-        self.btn_iniciar.config(state=tk.DISABLED)
-        self.btn_detener.config(state=tk.NORMAL)
-        self.animar_atencion()
-    
     def dibujar_cajas_grid(self):
-        """Dibuja las cajas en formato grid compacto (2x3)"""
+        """
+        Dibuja las cajas en formato grid compacto (2x3).
+        Cada caja se construye una sola vez; la animación luego solo actualiza sus widgets.
+        """
         
         for idx, caja in enumerate(self.cajas):
             # Calcular posición en grid
@@ -323,20 +389,14 @@ class SupermercadoGUI:
             ).pack(pady=3)
             
             # Info del cajero y tiempo en una línea
-            experiencia = "⭐" if caja.cajero.experiencia else "🔰"
-            tiempo_inicial = sum(
-                (c.numeroArticulos * caja.cajero.tiempoEscaneoPorArticulo + caja.cajero.tiempoCobro)
-                for c in caja.filaClientes
-            )
-            
-            info_text = f"{experiencia} | ⏱️ {tiempo_inicial:.0f}s | 👥 {len(caja.filaClientes)}"
-            tk.Label(
+            label_info = tk.Label(
                 frame_header,
-                text=info_text,
+                text=self.texto_info_caja(idx, self.atendidos[idx]),
                 font=("Arial", 8),
                 bg=color_border,
                 fg="white"
-            ).pack(pady=2)
+            )
+            label_info.pack(pady=2)
             
             # Frame para cajero y fila 
             frame_contenido = tk.Frame(frame_caja, bg=color_bg)
@@ -397,19 +457,29 @@ class SupermercadoGUI:
             canvas_clientes.configure(xscrollcommand=scrollbar_h.set)
             
             canvas_clientes.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-            if len(caja.filaClientes) > 6:  # Mostrar scrollbar solo si hay muchos clientes
+            if self.linea_tiempo.enFila(idx, self.atendidos[idx]) > 6:  # Mostrar scrollbar solo si hay muchos clientes
                 scrollbar_h.pack(side=tk.BOTTOM, fill=tk.X)
             
-            self.dibujar_clientes(frame_clientes, caja.filaClientes)
+            # Guardar referencias para actualizar la caja sin reconstruirla
+            articulos = self.linea_tiempo.articulosEnFila(idx, self.atendidos[idx])
+            self.vistas_cajas.append({
+                "caja": caja,
+                "label_info": label_info,
+                "scrollbar": scrollbar_h,
+                "frame_clientes": frame_clientes,
+                "atendidos": self.atendidos[idx],
+                "widgets_clientes": deque(self.dibujar_clientes(frame_clientes, articulos)),
+            })
     
-    def dibujar_clientes(self, frame_clientes, clientes):
-        """Dibuja los clientes en la fila (versión compacta)"""
+    def dibujar_clientes(self, frame_clientes, articulos):
+        """Dibuja los clientes en la fila (versión compacta) a partir de sus artículos y retorna sus frames en orden"""
         # Limpiar clientes existentes
         for widget in frame_clientes.winfo_children():
             widget.destroy()
         
         # Dibujar nuevos clientes 
-        for idx, cliente in enumerate(clientes):
+        widgets_clientes = []
+        for numero_articulos in articulos:
             frame_cliente = tk.Frame(
                 frame_clientes, 
                 bg="#ffffff", 
@@ -430,10 +500,12 @@ class SupermercadoGUI:
             
             tk.Label(
                 frame_cliente,
-                text=f"{cliente.numeroArticulos}",
+                text=f"{numero_articulos}",
                 font=("Arial", 7, "bold"),
                 bg="#ffffff"
             ).pack(padx=2)
+            widgets_clientes.append(frame_cliente)
+        return widgets_clientes
     
     def mostrar_estadisticas(self):
         """Muestra las estadísticas finales de la simulación con tiempos totales de todas las cajas"""
@@ -476,38 +548,107 @@ class SupermercadoGUI:
         self.frame_stats.pack(fill=tk.X, padx=5, pady=5)
     
     def detener_animacion(self):
-        """Detiene la animación"""
+        """Detiene la animación, o cancela la simulación si todavía se está calculando"""
         self.animacion_activa = False
+        if self.trabajo is not None:
+            self.trabajo.cancelar()  # el hilo avisa con CANCELADO al empezar su siguiente fase
         self.btn_iniciar.config(state=tk.NORMAL)
         self.btn_detener.config(state=tk.DISABLED)
     
+    def iniciar_animacion(self):
+        """Reproduce la atención desde el instante 0 con el factor de velocidad elegido"""
+        self.factor_velocidad = float(self.spin_velocidad.get())
+        self.reloj_simulado = 0.0
+        self.proximo_cuadro = time.perf_counter()
+        self.animacion_activa = True
+        self.animar_atencion()
+
+    def buscar_instante(self, valor):
+        """Callback de la línea de tiempo: muestra la tienda en el instante elegido por el usuario"""
+        instante = round(float(valor))
+        # Tk también llama aquí (más tarde) cuando la animación mueve la escala con set()
+        if self.linea_tiempo is None or instante == self.instante_escala:
+            return
+        self.reloj_simulado = float(instante)
+        self.mostrar_instante()
+
+    def mostrar_instante(self):
+        """
+        Dibuja la tienda en reloj_simulado: la línea de tiempo da por búsqueda binaria cuántos
+        clientes salieron de cada caja y solo se tocan las cajas que cambiaron. Retorna cuántos
+        clientes entraron o salieron de las filas respecto a lo dibujado.
+        """
+        atendidos = self.linea_tiempo.atendidos(self.reloj_simulado)
+        cambios = sum(abs(nuevo - anterior) for nuevo, anterior in zip(atendidos, self.atendidos))
+        if cambios:
+            # En el lienzo solo se redibuja lo visible
+            if self.lienzo is not None:
+                self.lienzo.ubicar(atendidos)
+            for idx, vista in enumerate(self.vistas_cajas):
+                self.actualizar_vista_caja(idx, vista, atendidos[idx])
+            self.atendidos = atendidos
+
+        duracion = self.linea_tiempo.duracion
+        self.label_estado.config(
+            text=f"🕒 {self.reloj_simulado:.0f}s de {duracion:.0f}s (×{self.factor_velocidad:g})")
+        self.instante_escala = round(self.reloj_simulado)
+        self.escala_tiempo.set(self.instante_escala)
+        return cambios
+
+    def actualizar_vista_caja(self, idx, vista, atendidos):
+        """Lleva los widgets de una caja de la cuadrícula a atendidos clientes ya atendidos"""
+        anteriores = vista["atendidos"]
+        if atendidos == anteriores:
+            return
+        if atendidos > anteriores:
+            # Quitar solo los widgets de los clientes que salieron
+            widgets = vista["widgets_clientes"]
+            for _ in range(atendidos - anteriores):
+                widgets.popleft().destroy()
+        else:
+            # Hacia atrás hay que volver a dibujar la fila; la cuadrícula solo se usa con pocos clientes
+            articulos = self.linea_tiempo.articulosEnFila(idx, atendidos)
+            vista["widgets_clientes"] = deque(self.dibujar_clientes(vista["frame_clientes"], articulos))
+        vista["atendidos"] = atendidos
+        vista["label_info"].config(text=self.texto_info_caja(idx, atendidos))
+        if self.linea_tiempo.enFila(idx, atendidos) > 6:
+            vista["scrollbar"].pack(side=tk.BOTTOM, fill=tk.X)
+        else:
+            vista["scrollbar"].pack_forget()
+
     def animar_atencion(self):
-        """Anima la atención de un cliente en cada caja"""
+        """
+        Dibuja un cuadro: avanza el reloj simulado según el tiempo real transcurrido y el factor
+        de velocidad, y muestra de una vez la tienda en ese instante.
+        """
         if not self.animacion_activa:
             return
-        
-        # Verificar si quedan clientes
-        hay_clientes = any(len(caja.filaClientes) > 0 for caja in self.cajas)
-        
-        if not hay_clientes:
+
+        intervalo = 1 / self.CUADROS_POR_SEGUNDO
+        ahora = time.perf_counter()
+        transcurrido = min(ahora - self.proximo_cuadro + intervalo, self.MAXIMO_CUADROS_POR_PASO * intervalo)
+        self.reloj_simulado = min(self.reloj_simulado + max(transcurrido, 0.0) * self.factor_velocidad,
+                                  self.linea_tiempo.duracion)
+
+        with instrumentacion.medir("gui.cuadro"):
+            salidas = self.mostrar_instante()
+
+        if instrumentacion.activa:
+            instrumentacion.contar("gui.cuadros")
+            instrumentacion.registrar("gui.salidasPorCuadro", salidas)
+
+        # Al llegar a la última salida ya no quedan clientes
+        if self.reloj_simulado >= self.linea_tiempo.duracion:
             self.detener_animacion()
             self.mostrar_estadisticas()
             return
-        
-        # Atender un cliente en cada caja que tenga fila
-        for caja in self.cajas:
-            if len(caja.filaClientes) > 0:
-                # Remover el primer cliente
-                caja.filaClientes.pop(0)
-        
-        # Redibujar todas las cajas
-        for widget in self.frame_principal.winfo_children():
-            widget.destroy()
-        self.dibujar_cajas_grid()
-        
-        # Programar siguiente animación
-        self.root.after(self.velocidad_animacion, self.animar_atencion)
 
+        # Programar el siguiente cuadro a ritmo fijo, descontando lo que tardó este
+        self.proximo_cuadro += intervalo
+        if self.proximo_cuadro < ahora:
+            self.proximo_cuadro = ahora + intervalo  # este cuadro llegó tarde: no acumular atraso
+        espera_ms = max(1, int((self.proximo_cuadro - time.perf_counter()) * 1000))
+        self.id_animacion = self.root.after(espera_ms, self.animar_atencion)
 
 def iniciar_interfaz_con_datos(cajas, clientes):
     """Función para iniciar la interfaz gráfica con datos precalculados"""
@@ -515,6 +656,12 @@ def iniciar_interfaz_con_datos(cajas, clientes):
     app = SupermercadoGUI(root, cajas_precalculadas=cajas, clientes_precalculados=clientes)
     root.mainloop()
 
+def iniciar_interfaz_con_traza(linea_tiempo):
+    """Reproduce una traza guardada (ver simulation/traza.py) a partir de su línea de tiempo"""
+    root = tk.Tk()
+    app = SupermercadoGUI(root, cajas_precalculadas=linea_tiempo.cajas, linea_tiempo=linea_tiempo)
+    root.mainloop()
+
 def iniciar_interfaz():
     """Función para iniciar la interfaz gráfica independiente"""
     root = tk.Tk()
@@ -0,0 +1,176 @@
+import tkinter as tk
+from tkinter import ttk
+from simulation import instrumentacion
+
+class LienzoCajas:
+    """
+    Renderizador virtualizado de cajas sobre un único Canvas.
+
+    Cada caja es una fila horizontal y cada cliente un ícono con su número de artículos.
+    Solo se dibujan las cajas y clientes visibles en el viewport, reutilizando un conjunto
+    fijo de items del Canvas, así el costo por cuadro no depende del total de clientes.
+    """
+    ALTO_CAJA = 64  # alto de cada fila de caja en píxeles
+    ANCHO_CLIENTE = 34  # ancho reservado por cliente
+    ANCHO_ENCABEZADO = 190  # columna fija con el nombre e información de la caja
+
+    def __init__(self, parent, img_cajero=None, img_cliente=None):
+        self.img_cajero = img_cajero
+        self.img_cliente = img_cliente
+        self.cajas = []
+        self.linea = None  # LineaTiempo de las cajas: de ahí salen las filas en el instante mostrado
+        self.atendidos = []  # clientes ya atendidos de cada caja
+        self.region = None  # (ancho, alto) del área desplazable configurada
+
+        # Items reutilizables: se reposicionan en cada redibujo en lugar de crearse de nuevo
+        self.items_cajas = []
+        self.items_clientes = []
+
+        self.frame = tk.Frame(parent, bg="#ecf0f1")
+        self.canvas = tk.Canvas(self.frame, bg="#ecf0f1", highlightthickness=0)
+        self.scroll_x = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.desplazar_x)
+        self.scroll_y = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.desplazar_y)
+        self.canvas.configure(xscrollcommand=self.scroll_x.set, yscrollcommand=self.scroll_y.set)
+
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scroll_y.grid(row=0, column=1, sticky="ns")
+        self.scroll_x.grid(row=1, column=0, sticky="ew")
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self.redibujar())
+        self.canvas.bind("<MouseWheel>", self.rueda)
+        self.canvas.bind("<Shift-MouseWheel>", self.rueda_horizontal)
+        self.canvas.bind("<Button-4>", lambda e: self.desplazar_y("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.desplazar_y("scroll", 1, "units"))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def mostrar(self, cajas, linea, atendidos):
+        """Asigna las cajas a mostrar y dibuja la parte visible"""
+        self.cajas = cajas
+        self.linea = linea
+        self.atendidos = atendidos
+        self.actualizar_region()
+        self.redibujar()
+
+    def ubicar(self, atendidos):
+        """Muestra las filas con atendidos[i] clientes ya atendidos en la caja i"""
+        self.atendidos = atendidos
+        self.actualizar_region()
+        self.redibujar()
+
+    def actualizar_region(self):
+        """Ajusta el área desplazable al número de cajas y a la fila más larga en el instante mostrado"""
+        maxima_fila = self.linea.maximaFila(self.atendidos)
+        region = (self.ANCHO_ENCABEZADO + maxima_fila * self.ANCHO_CLIENTE + self.ANCHO_CLIENTE,
+                  len(self.cajas) * self.ALTO_CAJA)
+        if region != self.region:  # solo cuando cambia la fila más larga, no en cada cuadro
+            self.region = region
+            self.canvas.configure(scrollregion=(0, 0) + region)
+
+    def desplazar_x(self, *args):
+        self.canvas.xview(*args)
+        self.redibujar()
+
+    def desplazar_y(self, *args):
+        self.canvas.yview(*args)
+        self.redibujar()
+
+    def rueda(self, event):
+        self.desplazar_y("scroll", -1 if event.delta > 0 else 1, "units")
+
+    def rueda_horizontal(self, event):
+        self.desplazar_x("scroll", -1 if event.delta > 0 else 1, "units")
+
+    def item_caja(self, indice):
+        """Retorna (o crea) el grupo de items de encabezado número indice"""
+        if indice == len(self.items_cajas):
+            fondo = self.canvas.create_rectangle(0, 0, 0, 0, width=0, tags="encabezado")
+            separador = self.canvas.create_line(0, 0, 0, 0, fill="#bdc3c7")
+            if self.img_cajero:
+                cajero = self.canvas.create_image(0, 0, image=self.img_cajero, anchor="w", tags="encabezado")
+            else:
+                cajero = self.canvas.create_text(0, 0, text="👨‍💼", font=("Arial", 18), anchor="w", tags="encabezado")
+            titulo = self.canvas.create_text(0, 0, anchor="w", font=("Arial", 10, "bold"),
+                                             fill="white", tags="encabezado")
+            info = self.canvas.create_text(0, 0, anchor="w", font=("Arial", 8), fill="white", tags="encabezado")
+            self.items_cajas.append((fondo, separador, cajero, titulo, info))
+            if instrumentacion.activa:
+                instrumentacion.contar("gui.itemsLienzoCreados", 5)
+        return self.items_cajas[indice]
+
+    def item_cliente(self, indice):
+        """Retorna (o crea) el par de items (ícono, artículos) número indice"""
+        if indice == len(self.items_clientes):
+            if self.img_cliente:
+                icono = self.canvas.create_image(0, 0, image=self.img_cliente)
+            else:
+                icono = self.canvas.create_text(0, 0, text="👤", font=("Arial", 14))
+            articulos = self.canvas.create_text(0, 0, font=("Arial", 7, "bold"))
+            self.items_clientes.append((icono, articulos))
+            if instrumentacion.activa:
+                instrumentacion.contar("gui.itemsLienzoCreados", 2)
+        return self.items_clientes[indice]
+
+    def redibujar(self):
+        """Dibuja solo las cajas y clientes que caen dentro del viewport"""
+        if not self.cajas:
+            return
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        ancho = self.canvas.winfo_width()
+        alto = self.canvas.winfo_height()
+
+        primera_caja = max(0, int(y0 // self.ALTO_CAJA))
+        ultima_caja = min(len(self.cajas), int((y0 + alto) // self.ALTO_CAJA) + 1)
+        # el encabezado queda fijo a la izquierda, los clientes se desplazan por debajo
+        primer_cliente = max(0, int(x0 // self.ANCHO_CLIENTE))
+        ultimo_cliente = int((x0 + ancho - self.ANCHO_ENCABEZADO) // self.ANCHO_CLIENTE) + 1
+
+        usados_cajas = 0
+        usados_clientes = 0
+        for idx in range(primera_caja, ultima_caja):
+            caja = self.cajas[idx]
+            atendidos = self.atendidos[idx]
+            y = idx * self.ALTO_CAJA
+            centro = y + self.ALTO_CAJA / 2
+            color = "#4caf50" if caja.esExpress else "#2196f3"
+
+            fondo, separador, cajero, titulo, info = self.item_caja(usados_cajas)
+            usados_cajas += 1
+            self.canvas.coords(fondo, x0, y + 1, x0 + self.ANCHO_ENCABEZADO, y + self.ALTO_CAJA - 1)
+            self.canvas.itemconfigure(fondo, fill=color, state="normal")
+            self.canvas.coords(separador, x0, y + self.ALTO_CAJA, x0 + ancho, y + self.ALTO_CAJA)
+            self.canvas.itemconfigure(separador, state="normal")
+            self.canvas.coords(cajero, x0 + 6, centro)
+            self.canvas.itemconfigure(cajero, state="normal")
+            tipo_caja = "🏃 EXPRESS" if caja.esExpress else "🛒 CAJA"
+            experiencia = "⭐" if caja.cajero.experiencia else "🔰"
+            self.canvas.coords(titulo, x0 + 52, centro - 10)
+            self.canvas.itemconfigure(titulo, text=f"{tipo_caja} {caja.idCaja}", state="normal")
+            self.canvas.coords(info, x0 + 52, centro + 10)
+            self.canvas.itemconfigure(
+                info, state="normal",
+                text=f"{experiencia} | ⏱️ {self.linea.cargaPendiente(idx, atendidos):.0f}s | "
+                     f"👥 {self.linea.enFila(idx, atendidos)}")
+
+            visibles = self.linea.articulosEnFila(idx, atendidos, primer_cliente, ultimo_cliente)
+            for posicion, numero_articulos in enumerate(visibles, start=primer_cliente):
+                x = self.ANCHO_ENCABEZADO + posicion * self.ANCHO_CLIENTE + self.ANCHO_CLIENTE / 2
+                icono, articulos = self.item_cliente(usados_clientes)
+                usados_clientes += 1
+                self.canvas.coords(icono, x, centro - 8)
+                self.canvas.itemconfigure(icono, state="normal")
+                self.canvas.coords(articulos, x, centro + 16)
+                self.canvas.itemconfigure(articulos, text=str(numero_articulos), state="normal")
+
+        # ocultar los items sobrantes del cuadro anterior
+        for items in self.items_cajas[usados_cajas:]:
+            for item in items:
+                self.canvas.itemconfigure(item, state="hidden")
+        for items in self.items_clientes[usados_clientes:]:
+            for item in items:
+                self.canvas.itemconfigure(item, state="hidden")
+        self.canvas.tag_raise("encabezado")
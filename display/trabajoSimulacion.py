@@ -0,0 +1,56 @@
+import queue
+import threading
+import time
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion, SimulacionCancelada
+
+# Mensajes que el hilo de trabajo envía a la interfaz por la cola: (tipo, dato)
+FASE = "fase"            # dato: nombre de la fase que empieza
+RESULTADO = "resultado"  # dato: ResultadoSimulacion
+CANCELADO = "cancelado"  # dato: None
+ERROR = "error"          # dato: la excepción
+
+class TrabajoSimulacion:
+    """
+    Ejecuta una Simulacion en un hilo aparte y publica su avance en una queue.Queue.
+    La interfaz no toca las cajas hasta recibir RESULTADO, así el hilo y Tk no comparten estado;
+    Tk solo lee la cola desde root.after con un presupuesto de tiempo por cuadro.
+    """
+    def __init__(self, configuracion: ConfiguracionSimulacion):
+        self.configuracion = configuracion
+        self.mensajes = queue.Queue()
+        self.cancelacion = threading.Event()
+        self.terminado = False  # True cuando la interfaz ya recibió el último mensaje
+        self.hilo = threading.Thread(target=self.ejecutar, name="simulacion", daemon=True)
+
+    def iniciar(self):
+        self.hilo.start()
+        return self
+
+    def cancelar(self):
+        """Pide detener la simulación; el hilo termina al empezar la siguiente fase o caja"""
+        self.cancelacion.set()
+
+    def ejecutar(self):
+        simulacion = Simulacion(self.configuracion, cancelacion=self.cancelacion,
+                                progreso=lambda nombre: self.mensajes.put((FASE, nombre)))
+        try:
+            resultado = simulacion.ejecutar()
+        except SimulacionCancelada:
+            self.mensajes.put((CANCELADO, None))
+        except Exception as error:  # se muestra en la interfaz en lugar de perderse en el hilo
+            self.mensajes.put((ERROR, error))
+        else:
+            # cancelada en la última fase: la simulación terminó igual, pero nadie espera el resultado
+            self.mensajes.put((CANCELADO, None) if self.cancelacion.is_set() else (RESULTADO, resultado))
+
+    def pendientes(self, presupuesto: float):
+        """Mensajes disponibles sin bloquear, hasta gastar presupuesto segundos"""
+        limite = time.perf_counter() + presupuesto
+        while not self.terminado and time.perf_counter() < limite:
+            try:
+                tipo, dato = self.mensajes.get_nowait()
+            except queue.Empty:
+                return
+            if tipo != FASE:
+                self.terminado = True
+            yield tipo, dato
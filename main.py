@@ -1,22 +1,28 @@
 # Simulación de supermercado con 5 cajas (4 normales y 1 express)
-from display.interfaz import iniciar_interfaz
-from simulation.generadorDatos import GeneradorDatos
-from models.caja import Caja
-import random
+# La interfaz gráfica (tkinter y PIL) se importa solo cuando se abre, ver el bloque __main__
+from simulation.indiceCajas import IndiceCajas
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+from simulation import instrumentacion
 
-def encontrarCajaMasRapida(cajas):
+def encontrarCajaMasRapida(cajas, numero_articulos=None):
     """
     Encuentra la caja que atendería más rápido a un nuevo cliente.
-    Considera el tiempo total de atención acumulado en cada caja.
+    Considera la carga de trabajo pendiente de cada caja, que se mantiene al agregar clientes.
+
+    Args:
+        cajas: Lista de cajas
+        numero_articulos: Si se indica, solo se consideran las cajas válidas para ese cliente
     """
     if not cajas:
         return None
 
-    # Encontrar la caja con el menor tiempo de atención total
-    caja_mas_rapida = min(cajas, key=lambda caja: caja.tiempoAtencionTotal)
-    return caja_mas_rapida
+    # Reutilizar el índice de las cajas si ya existe; consultarlo cuesta O(log n)
+    indice = cajas[0].indice
+    if indice is None or indice.cajas is not cajas:
+        indice = IndiceCajas(cajas)
+    return indice.cajaMasRapida(numero_articulos)
 
-def main(num_cajeros, num_clientes, posicion_express):
+def main(num_cajeros, num_clientes, posicion_express, mostrar_resultados=True, semilla=None):
     """
     Simulación de supermercado con configuración completa.
 
@@ -24,88 +30,52 @@ def main(num_cajeros, num_clientes, posicion_express):
         num_cajeros: Número de cajeros a generar
         num_clientes: Número de clientes a generar
         posicion_express: Posición de la caja express ("primera", "medio", "ultima", "aleatoria")
+        mostrar_resultados: Si es False no se imprime nada (útil para réplicas en lote)
+        semilla: Semilla o SeedSequence para reproducir la corrida
     """
     # === CONFIGURACIÓN DE LA SIMULACIÓN ===
-    # Todas las configuraciones se hacen aquí al inicio
-
-    # Inicializar generador de datos
-    generador = GeneradorDatos()
-
-    # Generar cajeros
-    cajeros = generador.generarCajeros(num_cajeros)
-
-    # Determinar posición de la caja express
-    posicion_express_idx = None
-    if posicion_express == "primera":
-        posicion_express_idx = 0
-    elif posicion_express == "medio":
-        posicion_express_idx = num_cajeros // 2
-    elif posicion_express == "ultima":
-        posicion_express_idx = num_cajeros - 1
-    elif posicion_express == "aleatoria":
-        posicion_express_idx = random.randint(0, num_cajeros - 1)
-
-    # Crear cajas con posición express configurable
-    cajas = []
-    for i in range(num_cajeros):
-        es_express = (i == posicion_express_idx)
-        caja = Caja(idCaja=i+1, cajero=cajeros[i], esExpress=es_express)
-        cajas.append(caja)
-
-    # Generar clientes
-    clientes = generador.generaClientes(num_clientes)
-
-    # Asignar clientes a cajas de manera aleatoria
-    for cliente in clientes:
-        asignado = False
-
-        # Determinar cajas válidas para el cliente
-        if cliente.numeroArticulos <= 10:
-            # Cliente puede usar cualquier caja (express o normal)
-            cajas_validas = cajas
-        else:
-            # Cliente solo puede usar cajas normales
-            cajas_validas = [caja for caja in cajas if not caja.esExpress]
-
-        # Intentar asignar a una caja aleatoria de las válidas
-        while not asignado and cajas_validas:
-            caja_aleatoria = random.choice(cajas_validas)
-            if caja_aleatoria.agregarCliente(cliente):
-                asignado = True
-            else:
-                # Si no se pudo asignar, remover de la lista para evitar loop infinito
-                cajas_validas.remove(caja_aleatoria)
-
-    # Calcular tiempos de atención para cada caja
-    for caja in cajas:
-        caja.calcularTiempoAtencion()
-
-    # Imprimir resultados de la simulación
-    print("=== RESULTADOS DE LA SIMULACIÓN ===")
-    print(f"Total de clientes generados: {len(clientes)}")
-    print(f"Total de cajas: {len(cajas)} (4 normales, 1 express)")
-    print()
-
-    for caja in cajas:
-        print(caja)
-        print("Clientes en fila:")
-        for cliente in caja.filaClientes:
-            print(f"  {cliente}")
-        print()
-
-    # Encontrar y mostrar la caja más rápida para un nuevo cliente
-    caja_mas_rapida = encontrarCajaMasRapida(cajas)
-    print("=== RECOMENDACIÓN PARA NUEVO CLIENTE ===")
-    if caja_mas_rapida:
-        tipo_caja = "Express" if caja_mas_rapida.esExpress else "Normal"
-        print(f"La caja más rápida para un nuevo cliente es la Caja {caja_mas_rapida.idCaja} ({tipo_caja})")
-        print(f"Tiempo total de atención actual: {caja_mas_rapida.tiempoAtencionTotal:.2f}s")
-        print(f"Clientes en fila: {len(caja_mas_rapida.filaClientes)}")
-    print()
+    # La configuración se arma aquí y el núcleo compartido con la interfaz hace el resto
+    configuracion = ConfiguracionSimulacion(
+        numeroCajeros=num_cajeros,
+        numeroClientes=num_clientes,
+        posicionExpress=posicion_express,
+        semilla=semilla,
+    )
+    resultado = Simulacion(configuracion).ejecutar()
+    cajas, clientes = resultado.cajas, resultado.clientes
+
+    if mostrar_resultados:
+        imprimir_resultados(cajas, clientes)
 
     # Retornar los datos para que la interfaz pueda usarlos
     return cajas, clientes
 
+def imprimir_resultados(cajas, clientes):
+    """Imprime en consola el detalle de cada caja y la recomendación para un nuevo cliente"""
+    with instrumentacion.medir("impresion"):
+        # Imprimir resultados de la simulación
+        print("=== RESULTADOS DE LA SIMULACIÓN ===")
+        print(f"Total de clientes generados: {len(clientes)}")
+        print(f"Total de cajas: {len(cajas)} (4 normales, 1 express)")
+        print()
+
+        for caja in cajas:
+            print(caja)
+            print("Clientes en fila:")
+            for cliente in caja.filaClientes:
+                print(f"  {cliente}")
+            print()
+
+        # Encontrar y mostrar la caja más rápida para un nuevo cliente
+        caja_mas_rapida = encontrarCajaMasRapida(cajas)
+        print("=== RECOMENDACIÓN PARA NUEVO CLIENTE ===")
+        if caja_mas_rapida:
+            tipo_caja = "Express" if caja_mas_rapida.esExpress else "Normal"
+            print(f"La caja más rápida para un nuevo cliente es la Caja {caja_mas_rapida.idCaja} ({tipo_caja})")
+            print(f"Tiempo total de atención actual: {caja_mas_rapida.tiempoAtencionTotal:.2f}s")
+            print(f"Clientes en fila: {len(caja_mas_rapida.filaClientes)}")
+        print()
+
 if __name__ == "__main__":
     # === CONFIGURACIÓN FÁCIL DE LA SIMULACIÓN ===
     # Cambia estos valores para probar diferentes escenarios
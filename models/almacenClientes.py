@@ -0,0 +1,54 @@
+from typing import List
+import numpy as np
+from models.cliente import Cliente
+
+def sumaAcumuladaPorGrupo(valores: np.ndarray, grupos: np.ndarray) -> np.ndarray:
+    """
+    Suma acumulada que se reinicia en cada grupo. Los grupos deben venir contiguos
+    (por ejemplo, ordenados de forma estable por caja).
+    """
+    # suma acumulada global y se descuenta lo acumulado antes de cada grupo
+    acumulado = np.cumsum(valores)
+    inicioGrupo = np.empty(len(valores), dtype=bool)
+    inicioGrupo[:1] = True
+    inicioGrupo[1:] = grupos[1:] != grupos[:-1]
+    previoGrupo = (acumulado - valores)[inicioGrupo]
+    return acumulado - previoGrupo[np.cumsum(inicioGrupo) - 1]
+
+class AlmacenClientes:
+    """
+    Almacenamiento columnar de clientes (struct-of-arrays).
+
+    En lugar de un objeto Cliente por persona se guardan arreglos tipados alineados por índice:
+    artículos, caja asignada, tiempo de espera y tiempo total. Lo usan la exportación y la traza
+    para escribir por bloques sin recorrer objetos.
+    """
+    __slots__ = ("numeroArticulos", "caja", "tiempoEspera", "tiempoTotal")
+
+    SIN_CAJA = -1  # valor de caja para clientes todavía sin asignar
+
+    def __init__(self, numeroArticulos):
+        self.numeroArticulos = np.asarray(numeroArticulos, dtype=np.int16)
+        numeroClientes = len(self.numeroArticulos)
+        self.caja = np.full(numeroClientes, self.SIN_CAJA, dtype=np.int32)  # posición de la caja en la lista
+        self.tiempoEspera = np.zeros(numeroClientes, dtype=np.float64)
+        self.tiempoTotal = np.zeros(numeroClientes, dtype=np.float64)
+
+    @classmethod
+    def desdeClientes(cls, clientes: List[Cliente]):
+        return cls(np.fromiter((cliente.numeroArticulos for cliente in clientes),
+                               dtype=np.int16, count=len(clientes)))
+
+    @classmethod
+    def desdeCajas(cls, cajas):
+        """Construye el almacén con los clientes en fila de cada caja, ya con sus tiempos calculados"""
+        clientes = [cliente for caja in cajas for cliente in caja.filaClientes]
+        almacen = cls.desdeClientes(clientes)
+        almacen.caja[:] = np.repeat(np.arange(len(cajas), dtype=np.int32),
+                                    [len(caja.filaClientes) for caja in cajas])
+        almacen.tiempoEspera[:] = [cliente.tiempoEspera for cliente in clientes]
+        almacen.tiempoTotal[:] = [cliente.tiempoTotal for cliente in clientes]
+        return almacen
+
+    def __len__(self):
+        return len(self.numeroArticulos)
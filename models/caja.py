@@ -1,25 +1,72 @@
 from models.cliente import Cliente
 from models.cajero import Cajero
-from typing import List
+from collections import deque
+from typing import List, Tuple
+import numpy as np
 
 class Caja:
-    def __init__(self, idCaja: int, cajero: Cajero, esExpress : bool, filaInicial : List[Cliente] = None):
+    __slots__ = ("idCaja", "cajero", "esExpress", "filaClientes", "tiempoAtencionTotal",
+                 "LIMITE_EXPRESS", "cargaTrabajo", "indice")
+
+    def __init__(self, idCaja: int, cajero: Cajero, esExpress : bool, filaInicial : List[Cliente] = None,
+                 limiteExpress : int = 10):
         self.idCaja = idCaja
         self.cajero = cajero
         self.esExpress = esExpress
-        self.filaClientes = filaInicial if filaInicial is not None else [] # si no hay fila inicial, se crea una vacía
+        # fila FIFO: agregar al final y atender al frente cuestan O(1)
+        self.filaClientes = deque(filaInicial) if filaInicial is not None else deque() # si no hay fila inicial, se crea una vacía
         self.tiempoAtencionTotal = 0.0  # tiempo total de atención en la caja
-        self.LIMITE_EXPRESS = 10  # límite de artículos para cajas express
+        self.LIMITE_EXPRESS = limiteExpress  # límite de artículos para cajas express
+        # carga de trabajo pendiente, se mantiene al agregar o remover clientes
+        self.cargaTrabajo = float(sum(self.tiempoAtencionCliente(cliente) for cliente in self.filaClientes))
+        self.indice = None  # índice de cajas a notificar cuando cambia la carga
+
+    def tiempoAtencionCliente(self, cliente: Cliente) -> float:
+        return cliente.numeroArticulos * self.cajero.tiempoEscaneoPorArticulo + self.cajero.tiempoCobro
 
     def agregarCliente(self, cliente: Cliente):
         if self.esExpress and cliente.numeroArticulos > self.LIMITE_EXPRESS:
-            print(f"El cliente no puede usar la caja express {self.idCaja}.")
-            return False
+            return False  # el cliente no puede usar la caja express
         else:
             self.filaClientes.append(cliente)
+            self.cargaTrabajo += self.tiempoAtencionCliente(cliente)
+            self.notificarIndice()
             return True
+
+    def agregarClientes(self, clientes: List[Cliente]):
+        """Agrega varios clientes ya validados de una vez; la carga y el índice se actualizan una sola vez"""
+        if self.esExpress and any(cliente.numeroArticulos > self.LIMITE_EXPRESS for cliente in clientes):
+            raise ValueError(f"Hay clientes que no pueden usar la caja express {self.idCaja}.")
+        self.filaClientes.extend(clientes)
+        self.cargaTrabajo += sum(self.tiempoAtencionCliente(cliente) for cliente in clientes)
+        self.notificarIndice()
+
+    def atenderSiguiente(self) -> Cliente:
+        """Saca al primer cliente de la fila en O(1) y descuenta su carga"""
+        cliente = self.filaClientes.popleft()
+        self.cargaTrabajo -= self.tiempoAtencionCliente(cliente)
+        self.notificarIndice()
+        return cliente
+
+    def restablecerFila(self, clientes: List[Cliente]):
+        """Reemplaza la fila completa (por ejemplo, para repetir una animación) y recalcula la carga"""
+        self.filaClientes = deque(clientes)
+        self.cargaTrabajo = float(sum(self.tiempoAtencionCliente(cliente) for cliente in self.filaClientes))
+        self.notificarIndice()
+
+    def removerCliente(self, cliente: Cliente):
+        self.filaClientes.remove(cliente)
+        self.cargaTrabajo -= self.tiempoAtencionCliente(cliente)
+        self.notificarIndice()
+
+    def notificarIndice(self):
+        if self.indice is not None:
+            self.indice.actualizar(self)
         
-    def calcularTiempoAtencion(self) -> float:
+    def calcularTiempoAtencion(self, vectorizado: bool = False) -> float:
+        if vectorizado:
+            return self.calcularTiempoAtencionVectorizado()
+
         self.tiempoAtencionTotal = 0.0
 
         #obtenemos la velocidad y tiempo del cajero asignado a la caja
@@ -32,9 +79,41 @@ class Caja:
         for cliente in self.filaClientes:
             tiempoEscaneoPorCliente = cliente.numeroArticulos * tiempoEscaneoPorArticulos
             tiempoAtencionPorCliente = tiempoEscaneoPorCliente + tiempoCobros
+            cliente.tiempoEspera = tiempoEsperaAcumulado
             cliente.tiempoTotal = tiempoAtencionPorCliente + tiempoEsperaAcumulado  # tiempo total incluye espera
             tiempoEsperaAcumulado += tiempoAtencionPorCliente  # acumulamos el tiempo de atención para el siguiente cliente
             self.tiempoAtencionTotal += tiempoAtencionPorCliente # acumulamos el tiempo total de atención
+        self.sincronizarCarga()
+        return self.tiempoAtencionTotal
+
+    def sincronizarCarga(self):
+        # el recorrido completo de la fila también corrige la carga si la lista se modificó directamente
+        if self.cargaTrabajo != self.tiempoAtencionTotal:
+            self.cargaTrabajo = self.tiempoAtencionTotal
+            self.notificarIndice()
+
+    def tiemposVectorizados(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula en bloque los tiempos de toda la fila con NumPy.
+        Retorna dos arreglos alineados con filaClientes: tiempo de atención de cada cliente
+        y tiempo total (atención + espera acumulada).
+        """
+        articulos = np.fromiter((cliente.numeroArticulos for cliente in self.filaClientes),
+                                dtype=np.float64, count=len(self.filaClientes))
+        tiemposAtencion = articulos * self.cajero.tiempoEscaneoPorArticulo + self.cajero.tiempoCobro
+        # la suma acumulada da atención propia + espera de los clientes anteriores
+        tiemposTotales = np.cumsum(tiemposAtencion)
+        return tiemposAtencion, tiemposTotales
+
+    def calcularTiempoAtencionVectorizado(self) -> float:
+        """Versión en bloque de calcularTiempoAtencion; escribe los mismos tiempoTotal en cada cliente."""
+        tiemposAtencion, tiemposTotales = self.tiemposVectorizados()
+        esperas = (tiemposTotales - tiemposAtencion).tolist()
+        for cliente, tiempoTotal, espera in zip(self.filaClientes, tiemposTotales.tolist(), esperas):
+            cliente.tiempoTotal = tiempoTotal
+            cliente.tiempoEspera = espera
+        self.tiempoAtencionTotal = float(tiemposTotales[-1]) if len(tiemposTotales) else 0.0
+        self.sincronizarCarga()
         return self.tiempoAtencionTotal
     
     def __str__(self):
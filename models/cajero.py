@@ -1,14 +1,14 @@
-import random
-
 class Cajero:
-    def __init__(self, tieneExperiencia: bool):
+    __slots__ = ("experiencia", "tiempoEscaneoPorArticulo", "tiempoCobro")
+
+    def __init__(self, tieneExperiencia: bool, tiempoCobro: int):
         self.experiencia = tieneExperiencia
         
         if self.experiencia:
             self.tiempoEscaneoPorArticulo = 3  # segundos por artículo para cajero con experiencia
         else:
             self.tiempoEscaneoPorArticulo = 6  # segundos por artículo para cajero sin experiencia
-        self.tiempoCobro = random.randint(15, 30)  # tiempo de cobro aleatorio entre 15 y 30 segundos
+        self.tiempoCobro = tiempoCobro  # entre 15 y 30 segundos, sorteado por GeneradorDatos.parametrosCajeros
     
     def __str__(self):
         experiencia_str = "con experiencia" if self.experiencia else "sin experiencia"
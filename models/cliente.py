@@ -1,9 +1,12 @@
-import random
-
 class Cliente:
+    # sin __dict__ por instancia: reduce la memoria en corridas con millones de clientes
+    __slots__ = ("numeroArticulos", "tiempoTotal", "tiempoLlegada", "tiempoEspera")
+
     def __init__(self, numeroArticulos: int):
         self.numeroArticulos = numeroArticulos
         self.tiempoTotal = 0.0
+        self.tiempoLlegada = 0.0  # instante en que llega a la fila (simulación por eventos)
+        self.tiempoEspera = 0.0  # tiempo en fila antes de empezar a ser atendido
 
     def __str__(self):
         return (f"Cliente con {self.numeroArticulos} artículos."
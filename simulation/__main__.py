@@ -0,0 +1,107 @@
+import argparse
+import time
+from contextlib import nullcontext
+from dataclasses import replace
+
+from main import imprimir_resultados
+from simulation.simulacion import POSICIONES_EXPRESS, ConfiguracionSimulacion, Simulacion
+from simulation.resultados import FORMATOS, exportarResultados, imprimirResumen
+from simulation.flujo import TAMANO_BLOQUE, ejecutarFlujo
+from simulation.generadorDatos import GeneradorDatos
+from simulation.traza import EscritorTraza, escribirTraza
+from simulation.puntoControl import PuntoControl
+from simulation import instrumentacion
+
+# Punto de entrada sin interfaz gráfica: python -m simulation
+# No importa tkinter ni PIL salvo que se pida la interfaz con --gui.
+
+def crearParser():
+    parser = argparse.ArgumentParser(prog="python -m simulation",
+                                     description="Simulación de supermercado en modo consola")
+    parser.add_argument("--cajeros", type=int, default=5)
+    parser.add_argument("--clientes", type=int, default=25)
+    parser.add_argument("--posicion", default="primera", choices=POSICIONES_EXPRESS)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--silencioso", action="store_true", help="no imprimir resultados")
+    parser.add_argument("--resumen", action="store_true", help="imprimir solo el resumen por caja")
+    parser.add_argument("--exportar", metavar="RUTA", help="exportar resultados con esta ruta base")
+    parser.add_argument("--formatos", nargs="+", default=list(FORMATOS), choices=FORMATOS)
+    parser.add_argument("--traza", metavar="RUTA", help="guardar la traza binaria por cliente (simulation/traza.py)")
+    parser.add_argument("--flujo", action="store_true",
+                        help="simular por bloques sin crear objetos Cliente (corridas que no caben en memoria)")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="clientes por bloque con --flujo")
+    parser.add_argument("--punto-control", metavar="RUTA",
+                        help="con --flujo: guardar el estado cada tanto y, si RUTA ya existe, continuar desde ahí")
+    parser.add_argument("--intervalo-control", type=float, default=5.0, help="segundos entre puntos de control")
+    parser.add_argument("--tiempo", action="store_true", help="mostrar el tiempo de ejecución por fase")
+    parser.add_argument("--metricas", action="store_true", help="mostrar contadores y cronómetros por fase")
+    parser.add_argument("--perfil", nargs="?", const="", metavar="RUTA",
+                        help="capturar cProfile; sin RUTA imprime las funciones más costosas")
+    parser.add_argument("--gui", action="store_true", help="abrir la interfaz gráfica al terminar")
+    return parser
+
+def ejecutarEnFlujo(args, configuracion):
+    """Corrida por bloques: las cajas salen de Simulacion (mismos cajeros) y los clientes de ejecutarFlujo"""
+    cajas = Simulacion(replace(configuracion, numeroClientes=0)).ejecutar().cajas
+    puntoControl = PuntoControl(args.punto_control, args.intervalo_control) if args.punto_control else None
+    reanudar = puntoControl is not None
+    escritor = EscritorTraza(args.traza, cajas, configuracion, reanudar) if args.traza else nullcontext()
+    with escritor:
+        sumidero = ejecutarFlujo(cajas, args.clientes, args.bloque, GeneradorDatos(args.semilla),
+                                 traza=escritor if args.traza else None, puntoControl=puntoControl)
+    if not args.silencioso:
+        print("=== RESUMEN DE LA SIMULACIÓN EN FLUJO ===")
+        for caja, cantidad, media in zip(cajas, sumidero.cantidad.tolist(), sumidero.media.tolist()):
+            tipo_caja = "Express" if caja.esExpress else "Normal"
+            print(f"  Caja {caja.idCaja} ({tipo_caja}): {cantidad} clientes, tiempo total medio {media:.2f}s, "
+                  f"{caja.tiempoAtencionTotal:.2f}s de atención")
+        espera = sumidero.estadisticas.resumen()
+        if espera["cantidad"]:
+            print(f"Espera: media {espera['media']:.2f}s | p50 {espera['p50']:.1f}s | p99 {espera['p99']:.1f}s")
+
+def ejecutar(argumentos=None):
+    parser = crearParser()
+    args = parser.parse_args(argumentos)
+    if args.punto_control and not args.flujo:
+        parser.error("--punto-control solo se usa con --flujo")
+    if args.punto_control and args.semilla is None:
+        parser.error("--punto-control necesita --semilla para que la corrida reanudada sea la misma")
+    for opcion, valor in (("--exportar", args.exportar), ("--resumen", args.resumen), ("--gui", args.gui)):
+        if args.flujo and valor:
+            parser.error(f"{opcion} no se puede usar con --flujo: los clientes no se guardan en memoria")
+    if args.metricas or args.perfil is not None:
+        instrumentacion.activar(perfil=args.perfil is not None)
+    inicio = time.perf_counter()
+    configuracion = ConfiguracionSimulacion(args.cajeros, args.clientes, args.posicion, args.semilla)
+    if args.flujo:
+        ejecutarEnFlujo(args, configuracion)
+        if args.tiempo:
+            print(f"Tiempo de simulación: {time.perf_counter() - inicio:.4f}s")
+    else:
+        resultado = Simulacion(configuracion).ejecutar()
+        cajas, clientes = resultado.cajas, resultado.clientes
+        if not args.silencioso:
+            if args.resumen:
+                imprimirResumen(cajas, len(clientes))
+            else:
+                imprimir_resultados(cajas, clientes)
+        if args.exportar:
+            exportarResultados(args.exportar, cajas, formatos=args.formatos)
+        if args.traza:
+            escribirTraza(args.traza, cajas, configuracion)
+        if args.tiempo:
+            fases = " | ".join(f"{nombre}: {segundos:.4f}s" for nombre, segundos in resultado.tiemposFase.items())
+            print(f"Tiempo de simulación: {time.perf_counter() - inicio:.4f}s ({fases})")
+    if args.metricas:
+        instrumentacion.imprimirInstantanea()
+    if args.perfil:
+        instrumentacion.guardarPerfil(args.perfil)
+    elif args.perfil is not None:
+        print(instrumentacion.perfil())
+
+    if args.gui:
+        from display.interfaz import iniciar_interfaz_con_datos
+        iniciar_interfaz_con_datos(cajas, clientes)
+
+if __name__ == "__main__":
+    ejecutar()
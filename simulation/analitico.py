@@ -0,0 +1,218 @@
+import argparse
+import math
+from dataclasses import replace
+from typing import List
+import numpy as np
+from models.caja import Caja
+from simulation.generadorDatos import GeneradorDatos
+from simulation.motorEventos import MotorEventos
+from simulation.simulacion import POSICIONES_EXPRESS, ConfiguracionSimulacion, Simulacion, indicePosicionExpress
+
+# Estimación analítica de la espera en fila, sin simular.
+# Cada caja es un servidor único con tiempo de atención S = articulos * escaneo + cobro y
+# llegadas de Poisson: M/G/1 con la fórmula de Pollaczek-Khinchine. La fila única compartida
+# por las cajas normales se aproxima como M/G/c con Allen-Cunneen.
+
+def distribucionArticulos(sesgoexpress = True):
+    """(valores, probabilidades) exactos de los artículos que sortea GeneradorDatos"""
+    if sesgoexpress:
+        valores = np.arange(1, 31)
+        probabilidades = np.where(valores <= 10, 0.30 / 10, 0.70 / 20)
+    else:
+        valores = np.arange(1, 51)
+        probabilidades = np.full(50, 1 / 50)
+    return valores, probabilidades
+
+def erlangC(servidores: int, carga: float) -> float:
+    """Probabilidad de esperar en una M/M/c con carga ofrecida carga = tasa * media"""
+    rho = carga / servidores
+    if rho >= 1:
+        return 1.0
+    termino = 1.0
+    suma = 1.0
+    for k in range(1, servidores):
+        termino *= carga / k
+        suma += termino
+    ultimo = termino * carga / servidores / (1 - rho)
+    return ultimo / (suma + ultimo)
+
+def esperaMGc(tasa: float, servidores: int, media: float, segundoMomento: float) -> float:
+    """Espera promedio en una fila única con servidores cajas (Allen-Cunneen, llegadas Poisson)"""
+    if servidores == 0 or tasa * media >= servidores:
+        return math.inf
+    cv2Servicio = segundoMomento / (media * media) - 1
+    esperaMMc = erlangC(servidores, tasa * media) * media / (servidores - tasa * media)
+    return esperaMMc * (1 + cv2Servicio) / 2
+
+class EstimadorAnalitico:
+    """
+    Tasas de llegada y momentos del tiempo de atención por caja, siguiendo la misma regla de
+    asignación que la simulación: los clientes con pocos artículos eligen al azar entre todas las
+    cajas y el resto solo entre las normales.
+    """
+    def __init__(self, cajas: List[Caja], clientesPorHora: float, sesgoexpress = True):
+        valores, probabilidades = distribucionArticulos(sesgoexpress)
+        esExpress = np.array([caja.esExpress for caja in cajas])
+        escaneo = np.array([caja.cajero.tiempoEscaneoPorArticulo for caja in cajas], dtype=np.float64)
+        cobro = np.array([caja.cajero.tiempoCobro for caja in cajas], dtype=np.float64)
+        limite = next((caja.LIMITE_EXPRESS for caja in cajas if caja.esExpress), 0)
+        normales = int((~esExpress).sum())
+
+        # peso[i, k]: probabilidad de que un cliente tenga valores[k] artículos y vaya a la caja i
+        pocos = valores <= limite
+        peso = np.tile(np.where(pocos, 1 / len(cajas), 0.0), (len(cajas), 1))
+        if normales:
+            peso[~esExpress] += np.where(pocos, 0.0, 1 / normales)
+        peso *= probabilidades
+
+        atencion = valores[None, :] * escaneo[:, None] + cobro[:, None]
+        fraccion = peso.sum(axis=1)
+        condicional = np.divide(peso, fraccion[:, None], out=np.zeros_like(peso), where=fraccion[:, None] > 0)
+
+        self.cajas = cajas
+        self.tasa = clientesPorHora / 3600.0 * fraccion  # clientes por segundo en cada caja
+        self.media = (condicional * atencion).sum(axis=1)
+        self.segundoMomento = (condicional * atencion * atencion).sum(axis=1)
+        self.utilizacion = self.tasa * self.media
+        self.normales = ~esExpress
+
+    def esperaPorCaja(self) -> np.ndarray:
+        """Espera promedio en fila (segundos) de cada caja: Wq = tasa * E[S^2] / (2 (1 - rho)), inf si rho >= 1"""
+        rho = self.utilizacion
+        espera = np.divide(self.tasa * self.segundoMomento, 2 * (1 - rho),
+                           out=np.full(len(rho), np.inf), where=rho < 1)
+        return np.where(self.tasa > 0, espera, 0.0)
+
+    def esperaPromedio(self) -> float:
+        """Espera promedio de un cliente cualquiera, ponderando cada caja por su tasa de llegada"""
+        total = self.tasa.sum()
+        if total == 0:
+            return 0.0
+        espera = self.esperaPorCaja()
+        usadas = self.tasa > 0
+        return float((self.tasa[usadas] * espera[usadas]).sum() / total)
+
+    def esperaFilaUnica(self) -> float:
+        """Espera si las cajas normales compartieran una sola fila (M/G/c, Allen-Cunneen)"""
+        tasa = self.tasa[self.normales].sum()
+        if tasa == 0:
+            return 0.0
+        # la fila única ve la mezcla de los clientes de todas las cajas normales
+        media = (self.tasa[self.normales] * self.media[self.normales]).sum() / tasa
+        segundoMomento = (self.tasa[self.normales] * self.segundoMomento[self.normales]).sum() / tasa
+        return esperaMGc(tasa, int(self.normales.sum()), media, segundoMomento)
+
+def cajasConfiguracion(configuracion: ConfiguracionSimulacion) -> List[Caja]:
+    """Las mismas cajas (cajeros y posición express) que arma Simulacion con esta configuración"""
+    generadores = Simulacion(configuracion).generadores()
+    cajeros = generadores["cajeros"].generarCajeros(configuracion.numeroCajeros, configuracion.probabilidadExperiencia)
+    posicion = indicePosicionExpress(configuracion.posicionExpress, configuracion.numeroCajeros, generadores["posicion"])
+    return [Caja(idCaja=i + 1, cajero=cajeros[i], esExpress=(i == posicion), limiteExpress=configuracion.limiteExpress)
+            for i in range(configuracion.numeroCajeros)]
+
+def estimarConfiguracion(configuracion: ConfiguracionSimulacion, clientesPorHora: float):
+    """Estimación de espera por caja y promedio para una configuración"""
+    estimador = EstimadorAnalitico(cajasConfiguracion(configuracion), clientesPorHora, configuracion.sesgoexpress)
+    return {
+        "esperaPorCaja": estimador.esperaPorCaja().tolist(),
+        "utilizacion": estimador.utilizacion.tolist(),
+        "esperaPromedio": estimador.esperaPromedio(),
+        "esperaFilaUnica": estimador.esperaFilaUnica(),
+    }
+
+def estimarPosiciones(configuracion: ConfiguracionSimulacion, clientesPorHora: float, posiciones=POSICIONES_EXPRESS):
+    """Espera promedio estimada para cada posición de la caja express, con los mismos cajeros"""
+    return {posicion: estimarConfiguracion(replace(configuracion, posicionExpress=posicion), clientesPorHora)["esperaPromedio"]
+            for posicion in posiciones}
+
+def ordenarConfiguraciones(configuraciones: List[ConfiguracionSimulacion], clientesPorHora: float,
+                           costoCajero: float = 0.0):
+    """
+    Configuraciones de menor a mayor espera estimada (más costoCajero por cajero), para simular solo
+    las prometedoras. Las que saturan alguna caja tienen espera infinita: van al final, ordenadas
+    por su utilización máxima para que no queden empatadas.
+    """
+    estimaciones = [estimarConfiguracion(configuracion, clientesPorHora) for configuracion in configuraciones]
+
+    def clave(i):
+        espera = estimaciones[i]["esperaPromedio"]
+        if math.isinf(espera):
+            return (True, max(estimaciones[i]["utilizacion"]))
+        return (False, espera + costoCajero * configuraciones[i].numeroCajeros)
+
+    orden = sorted(range(len(configuraciones)), key=clave)
+    return [(configuraciones[i], estimaciones[i]["esperaPromedio"]) for i in orden]
+
+def errorRelativo(estimada: float, simulada: float):
+    """Error de la estimación respecto de la simulación, o None si la estimación es infinita (caja saturada)"""
+    if not math.isfinite(estimada):
+        return None
+    return (estimada - simulada) / simulada if simulada > 0 else 0.0
+
+def formatoEspera(espera: float) -> str:
+    return f"{espera:.1f}s" if math.isfinite(espera) else "saturada"
+
+def validar(configuracion: ConfiguracionSimulacion, clientesPorHora: float, duracion: float = 43200,
+            replicas: int = 5):
+    """
+    Compara la estimación con réplicas de MotorEventos sobre las mismas cajas.
+    La simulación empieza con las filas vacías, así que en jornadas cortas o con cajas casi
+    saturadas espera algo menos que el estado estacionario que supone la fórmula.
+    """
+    estimacion = estimarConfiguracion(configuracion, clientesPorHora)
+    cajas = cajasConfiguracion(configuracion)
+    semillas = np.random.SeedSequence(configuracion.semilla).spawn(replicas)
+    esperaPorCaja = np.zeros(len(cajas))
+    atendidosPorCaja = np.zeros(len(cajas))
+    esperas = []
+    for semilla in semillas:
+        motor = MotorEventos(cajas, clientesPorHora, duracion, GeneradorDatos(semilla),
+                             configuracion.sesgoexpress, guardarClientes=False)
+        esperas.append(motor.ejecutar()["esperaPromedio"])
+        esperaPorCaja += motor.esperaPorCaja
+        atendidosPorCaja += motor.atendidosPorCaja
+    simulada = np.divide(esperaPorCaja, atendidosPorCaja, out=np.zeros(len(cajas)), where=atendidosPorCaja > 0)
+    return {
+        "estimacion": estimacion,
+        "simulacion": {"esperaPorCaja": simulada.tolist(), "esperaPromedio": float(np.mean(esperas))},
+        "errorRelativo": errorRelativo(estimacion["esperaPromedio"], float(np.mean(esperas))),
+    }
+
+def crearParser():
+    parser = argparse.ArgumentParser(description="Estimación analítica de la espera por caja (M/G/1, M/G/c)")
+    parser.add_argument("--cajeros", type=int, default=5)
+    parser.add_argument("--posicion", default="primera", choices=POSICIONES_EXPRESS)
+    parser.add_argument("--limite", type=int, default=10)
+    parser.add_argument("--experiencia", type=float, default=0.5)
+    parser.add_argument("--clientes-hora", type=float, default=120)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--validar", action="store_true", help="comparar con simulaciones de eventos discretos")
+    parser.add_argument("--duracion", type=float, default=43200, help="segundos de jornada al validar")
+    parser.add_argument("--replicas", type=int, default=5, help="réplicas de simulación al validar")
+    return parser
+
+if __name__ == "__main__":
+    args = crearParser().parse_args()
+    configuracion = ConfiguracionSimulacion(numeroCajeros=args.cajeros, posicionExpress=args.posicion,
+                                            semilla=args.semilla, limiteExpress=args.limite,
+                                            probabilidadExperiencia=args.experiencia)
+    estimacion = estimarConfiguracion(configuracion, args.clientes_hora)
+    print(f"=== ESTIMACIÓN ANALÍTICA ({args.clientes_hora:g} clientes/hora) ===")
+    for caja, espera, rho in zip(cajasConfiguracion(configuracion), estimacion["esperaPorCaja"], estimacion["utilizacion"]):
+        tipo_caja = "Express" if caja.esExpress else "Normal"
+        print(f"  Caja {caja.idCaja} ({tipo_caja}): utilización {rho:.2f}, espera {formatoEspera(espera)}")
+    print(f"Espera promedio: {formatoEspera(estimacion['esperaPromedio'])} | con fila única en normales: "
+          f"{formatoEspera(estimacion['esperaFilaUnica'])}")
+    for posicion, espera in estimarPosiciones(configuracion, args.clientes_hora).items():
+        print(f"  Express {posicion:9}: espera promedio {formatoEspera(espera)}")
+
+    if args.validar:
+        validacion = validar(configuracion, args.clientes_hora, args.duracion, args.replicas)
+        print("=== VALIDACIÓN CONTRA SIMULACIÓN ===")
+        for idx, (estimada, simulada) in enumerate(zip(validacion["estimacion"]["esperaPorCaja"],
+                                                       validacion["simulacion"]["esperaPorCaja"])):
+            print(f"  Caja {idx + 1}: estimada {formatoEspera(estimada)} | simulada {simulada:.1f}s")
+        error = validacion["errorRelativo"]
+        print(f"Espera promedio: estimada {formatoEspera(validacion['estimacion']['esperaPromedio'])} | simulada "
+              f"{validacion['simulacion']['esperaPromedio']:.1f}s "
+              f"({'sin estado estacionario' if error is None else f'{error:+.1%}'})")
@@ -0,0 +1,63 @@
+from typing import List
+import numpy as np
+from models.caja import Caja
+from models.cliente import Cliente
+from models.almacenClientes import AlmacenClientes
+from simulation.generadorDatos import GeneradorDatos
+from simulation import instrumentacion
+
+BLOQUE_ASIGNACION = 50_000  # clientes repartidos entre llamadas a revisar
+
+class Enrutador:
+    """
+    Asigna clientes a una caja válida elegida al azar, en bloque.
+
+    Los índices de cajas elegibles se calculan una sola vez: cualquier caja para clientes con
+    pocos artículos y solo las normales para el resto. Cada cliente usa un único sorteo uniforme.
+    """
+    def __init__(self, cajas: List[Caja], generador: GeneradorDatos):
+        self.generador = generador
+        self.todas = np.arange(len(cajas), dtype=np.int32)
+        self.normales = np.array([idx for idx, caja in enumerate(cajas) if not caja.esExpress], dtype=np.int32)
+        # límite de artículos de la caja express (si no hay express, todas son normales)
+        self.limiteExpress = next((caja.LIMITE_EXPRESS for caja in cajas if caja.esExpress), 0)
+
+    def enrutar(self, articulos: np.ndarray) -> np.ndarray:
+        """Posición de la caja elegida por cada cliente (SIN_CAJA si no tiene ninguna válida)"""
+        u = self.generador.uniformes(len(articulos))
+        cajas = self.todas[(u * len(self.todas)).astype(np.int32)]
+        # los clientes con muchos artículos solo pueden usar cajas normales
+        muchos = articulos > self.limiteExpress
+        if len(self.normales):
+            cajas[muchos] = self.normales[(u[muchos] * len(self.normales)).astype(np.int32)]
+        else:
+            cajas[muchos] = AlmacenClientes.SIN_CAJA
+            if instrumentacion.activa:
+                instrumentacion.contar("clientesSinCaja", int(np.count_nonzero(muchos)))
+        if instrumentacion.activa:
+            instrumentacion.contar("clientesEnrutados", len(articulos))
+        return cajas
+
+def asignarClientes(cajas: List[Caja], clientes: List[Cliente], generador: GeneradorDatos, revisar=None):
+    """
+    Reparte todos los clientes entre las cajas en una sola pasada, sin reintentos.
+    Retorna la posición de la caja asignada a cada cliente.
+    revisar: función opcional que se llama entre bloques de clientes (por ejemplo, para cancelar);
+    las cajas no se tocan hasta que todos los clientes tienen destino.
+    """
+    if not cajas:
+        return np.full(len(clientes), AlmacenClientes.SIN_CAJA, dtype=np.int32)
+    articulos = np.fromiter((cliente.numeroArticulos for cliente in clientes), dtype=np.int16, count=len(clientes))
+    destinos = Enrutador(cajas, generador).enrutar(articulos)
+
+    filas = [[] for _ in cajas]
+    for inicio in range(0, len(clientes), BLOQUE_ASIGNACION):
+        if revisar is not None:
+            revisar()
+        fin = inicio + BLOQUE_ASIGNACION
+        for cliente, destino in zip(clientes[inicio:fin], destinos[inicio:fin].tolist()):
+            if destino != AlmacenClientes.SIN_CAJA:
+                filas[destino].append(cliente)
+    for caja, fila in zip(cajas, filas):
+        caja.agregarClientes(fila)
+    return destinos
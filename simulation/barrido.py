@@ -0,0 +1,259 @@
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List
+from simulation.simulacion import POSICIONES_EXPRESS, ConfiguracionSimulacion, Simulacion
+from simulation.puntoControl import PuntoControl, cargarEstado
+
+# Barrido de configuraciones de cajas (cantidad de cajeros, posición y límite express, proporción
+# de cajeros con experiencia) con caché en disco por (configuración, semilla).
+
+DIRECTORIO_CACHE = ".cache_barrido"
+PARAMETROS = ("numeroCajeros", "posicionExpress", "limiteExpress", "probabilidadExperiencia")
+LOTE_MAXIMO = 64  # corridas por lote enviado a un proceso; cada una se guarda en caché al volver
+VERSION_METRICAS = 2  # forma parte de la clave: cambiar las métricas no reutiliza corridas viejas
+
+def evaluarConfiguracion(configuracion: ConfiguracionSimulacion):
+    """Ejecuta una corrida y retorna solo sus métricas"""
+    resultado = Simulacion(configuracion).ejecutar()
+    esperas = [cliente.tiempoEspera for caja in resultado.cajas for cliente in caja.filaClientes]
+    return {
+        "esperaPromedio": statistics.fmean(esperas) if esperas else 0.0,
+        "esperaMaxima": max(esperas, default=0.0),
+        "tiempoMaximoCaja": max((caja.tiempoAtencionTotal for caja in resultado.cajas), default=0.0),
+    }
+
+def evaluarLote(configuraciones):
+    return [evaluarConfiguracion(configuracion) for configuracion in configuraciones]
+
+class CacheResultados:
+    """Métricas guardadas en disco, un archivo JSON por (configuración, semilla)"""
+    def __init__(self, directorio: str = DIRECTORIO_CACHE):
+        self.directorio = directorio
+
+    @staticmethod
+    def clave(configuracion: ConfiguracionSimulacion) -> str:
+        datos = json.dumps({**asdict(configuracion), "versionMetricas": VERSION_METRICAS}, sort_keys=True)
+        return hashlib.sha256(datos.encode("utf-8")).hexdigest()
+
+    def ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], f"{clave}.json")
+
+    def obtener(self, configuracion: ConfiguracionSimulacion):
+        try:
+            with open(self.ruta(self.clave(configuracion)), encoding="utf-8") as archivo:
+                return json.load(archivo)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def guardar(self, configuracion: ConfiguracionSimulacion, metricas: dict):
+        ruta = self.ruta(self.clave(configuracion))
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        # escritura atómica: un proceso interrumpido nunca deja un archivo a medias
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(metricas, archivo)
+        os.replace(temporal, ruta)
+
+def expandirRejilla(rejilla: Dict[str, list]) -> List[dict]:
+    """Producto cartesiano de los valores de cada parámetro"""
+    nombres = [nombre for nombre in PARAMETROS if nombre in rejilla]
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*(rejilla[nombre] for nombre in nombres))]
+
+class Barrido:
+    """
+    Evalúa puntos de configuración con varias réplicas cada uno, en paralelo, reutilizando
+    lo que ya está en caché. La réplica r de cualquier punto usa la semilla [semilla, r], así
+    las configuraciones se comparan con los mismos números aleatorios y un barrido más grande
+    reaprovecha las réplicas de uno anterior.
+
+    Cada corrida se guarda en caché apenas termina, así un barrido interrumpido pierde a lo sumo
+    los lotes en curso y repetirlo (o reanudarlo desde su punto de control) no vuelve a simular nada.
+    """
+    def __init__(self, numeroClientes: int, semilla: int = 0, procesos: int = None,
+                 cache: CacheResultados = None, costoCajero: float = 0.0, puntoControl: PuntoControl = None,
+                 argumentos: dict = None):
+        self.numeroClientes = numeroClientes
+        self.semilla = semilla
+        self.procesos = procesos or os.cpu_count() or 1
+        self.cache = cache if cache is not None else CacheResultados()
+        self.costoCajero = costoCajero  # segundos de espera equivalentes al costo de un cajero más
+        self.corridasEjecutadas = 0
+        self.corridasEnCache = 0
+        self.puntoControl = puntoControl
+        self.argumentos = argumentos  # parámetros de la línea de comandos, para reanudar con los mismos
+        self.hechas = set()  # claves de las corridas del barrido ya disponibles (simuladas o en caché)
+        self.hechasPrevias = 0  # avance guardado por la sesión anterior de este barrido
+        self.ejecutadasPrevias = 0
+        self.saturadas = 0  # puntos de la última preselección que saturan alguna caja
+
+    def restaurarAvance(self, estado: dict):
+        """Continúa el avance de un punto de control; lo anterior se vuelve a leer de la caché"""
+        self.hechasPrevias = estado["corridasHechas"]
+        self.ejecutadasPrevias = estado["corridasEjecutadas"]
+
+    def guardarPunto(self, terminado: bool = False):
+        # al reanudar, las corridas anteriores se recorren de nuevo desde la caché: hasta alcanzarlas
+        # el avance guardado sigue siendo el de la sesión anterior
+        self.puntoControl.guardar("barrido", self.argumentos,
+                                  corridasHechas=max(self.hechasPrevias, len(self.hechas)),
+                                  corridasEjecutadas=self.ejecutadasPrevias + self.corridasEjecutadas,
+                                  terminado=terminado)
+
+    def configuracion(self, punto: dict, replica: int) -> ConfiguracionSimulacion:
+        return ConfiguracionSimulacion(numeroClientes=self.numeroClientes, semilla=[self.semilla, replica], **punto)
+
+    def evaluar(self, puntos: List[dict], replicas: int) -> List[dict]:
+        """Retorna las métricas promedio de cada punto, ordenadas de mejor a peor objetivo"""
+        configuraciones = [[self.configuracion(punto, r) for r in range(replicas)] for punto in puntos]
+        metricas = {}
+        pendientes = []
+        for fila in configuraciones:
+            for configuracion in fila:
+                clave = self.cache.clave(configuracion)
+                guardado = self.cache.obtener(configuracion)
+                if guardado is not None:
+                    metricas[clave] = guardado
+                    self.corridasEnCache += 1
+                    self.hechas.add(clave)
+                elif clave not in metricas:
+                    metricas[clave] = None
+                    pendientes.append(configuracion)
+
+        for configuracion, resultado in zip(pendientes, self.ejecutarPendientes(pendientes)):
+            self.cache.guardar(configuracion, resultado)
+            clave = self.cache.clave(configuracion)
+            metricas[clave] = resultado
+            self.corridasEjecutadas += 1
+            self.hechas.add(clave)
+            if self.puntoControl is not None and self.puntoControl.debeGuardar():
+                self.guardarPunto()
+
+        resumen = []
+        for punto, fila in zip(puntos, configuraciones):
+            valores = [metricas[self.cache.clave(configuracion)] for configuracion in fila]
+            promedio = {nombre: statistics.fmean(v[nombre] for v in valores) for nombre in valores[0]}
+            promedio["objetivo"] = promedio["esperaPromedio"] + self.costoCajero * punto.get("numeroCajeros", 0)
+            resumen.append({**punto, **promedio, "replicas": replicas})
+        return sorted(resumen, key=lambda fila: fila["objetivo"])
+
+    def ejecutarPendientes(self, configuraciones):
+        """Métricas de cada configuración, en orden y a medida que terminan"""
+        if not configuraciones:
+            return
+        if self.procesos == 1:
+            for configuracion in configuraciones:
+                yield evaluarConfiguracion(configuracion)
+            return
+        tamanoLote = min(LOTE_MAXIMO, max(1, len(configuraciones) // (self.procesos * 4)))
+        lotes = [configuraciones[i:i + tamanoLote] for i in range(0, len(configuraciones), tamanoLote)]
+        with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+            for parcial in pool.map(evaluarLote, lotes):
+                yield from parcial
+
+    def rejilla(self, rejilla: Dict[str, list], replicas: int) -> List[dict]:
+        return self.evaluar(expandirRejilla(rejilla), replicas)
+
+    def preseleccionar(self, rejilla: Dict[str, list], clientesPorHora: float, cantidad: int) -> List[dict]:
+        """
+        Los cantidad puntos con menor objetivo según la estimación analítica (M/G/1 por caja).
+        Los que saturan alguna caja quedan últimos y se cuentan en self.saturadas.
+        """
+        from simulation.analitico import ordenarConfiguraciones
+        puntos = expandirRejilla(rejilla)
+        ordenadas = ordenarConfiguraciones([self.configuracion(punto, 0) for punto in puntos], clientesPorHora,
+                                           self.costoCajero)
+        self.saturadas = sum(math.isinf(espera) for _, espera in ordenadas)
+        return [{nombre: getattr(configuracion, nombre) for nombre in PARAMETROS if nombre in rejilla}
+                for configuracion, _ in ordenadas[:cantidad]]
+
+    def adaptativo(self, rejilla: Dict[str, list], replicasIniciales: int = 4, replicasMaximas: int = 64,
+                   fraccion: float = 0.5) -> List[dict]:
+        """
+        Búsqueda por mitades sucesivas: evalúa todos los puntos con pocas réplicas, conserva la
+        mejor fracción y duplica las réplicas hasta llegar a replicasMaximas o a un solo punto.
+        """
+        puntos = expandirRejilla(rejilla)
+        replicas = replicasIniciales
+        while True:
+            resumen = self.evaluar(puntos, replicas)
+            if replicas >= replicasMaximas or len(resumen) == 1:
+                return resumen
+            conservar = max(1, int(len(resumen) * fraccion))
+            puntos = [{nombre: fila[nombre] for nombre in PARAMETROS if nombre in fila} for fila in resumen[:conservar]]
+            replicas = min(replicasMaximas, replicas * 2)
+
+def crearParser():
+    parser = argparse.ArgumentParser(description="Barrido de configuraciones de cajas con caché")
+    parser.add_argument("--cajeros", type=int, nargs="+", default=[4, 5, 6])
+    parser.add_argument("--posiciones", nargs="+", default=POSICIONES_EXPRESS[:3], choices=POSICIONES_EXPRESS)
+    parser.add_argument("--limites", type=int, nargs="+", default=[10])
+    parser.add_argument("--experiencia", type=float, nargs="+", default=[0.5])
+    parser.add_argument("--clientes", type=int, default=100)
+    parser.add_argument("--replicas", type=int, default=20)
+    parser.add_argument("--adaptativo", action="store_true", help="mitades sucesivas hasta --replicas")
+    parser.add_argument("--preseleccion", type=int, metavar="N",
+                        help="simular solo las N mejores según la estimación analítica")
+    parser.add_argument("--clientes-hora", type=float, default=120, help="tasa de llegada para la preselección")
+    parser.add_argument("--costo-cajero", type=float, default=0.0)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--cache", default=DIRECTORIO_CACHE)
+    parser.add_argument("--top", type=int, default=10, help="configuraciones a mostrar")
+    parser.add_argument("--punto-control", metavar="RUTA",
+                        help="guardar el avance y los parámetros del barrido; si RUTA ya existe, continuar su avance")
+    parser.add_argument("--intervalo-control", type=float, default=5.0, help="segundos entre puntos de control")
+    parser.add_argument("--reanudar", metavar="RUTA",
+                        help="repetir el barrido guardado en RUTA con sus mismos parámetros; lo hecho sale de la caché")
+    return parser
+
+if __name__ == "__main__":
+    args = crearParser().parse_args()
+    if args.reanudar:
+        estado = cargarEstado(args.reanudar)
+        if estado is None or estado.get("tipo") != "barrido":
+            raise SystemExit(f"{args.reanudar} no es un punto de control de barrido")
+        args = argparse.Namespace(**{**estado["parametros"], "punto_control": args.reanudar, "reanudar": None,
+                                     "intervalo_control": args.intervalo_control})
+        print(f"Reanudando barrido: {estado['corridasHechas']} corridas ya hechas")
+    rejilla = {
+        "numeroCajeros": args.cajeros,
+        "posicionExpress": args.posiciones,
+        "limiteExpress": args.limites,
+        "probabilidadExperiencia": args.experiencia,
+    }
+    puntoControl = PuntoControl(args.punto_control, args.intervalo_control) if args.punto_control else None
+    argumentos = {nombre: valor for nombre, valor in vars(args).items()
+                  if nombre not in ("punto_control", "reanudar", "intervalo_control")}
+    barrido = Barrido(args.clientes, args.semilla, args.procesos, CacheResultados(args.cache), args.costo_cajero,
+                      puntoControl, argumentos)
+    if puntoControl is not None:
+        estado = puntoControl.cargar("barrido", argumentos)
+        if estado is not None:
+            barrido.restaurarAvance(estado)
+        barrido.guardarPunto()  # los parámetros quedan guardados desde el principio
+    if args.preseleccion:
+        puntos = barrido.preseleccionar(rejilla, args.clientes_hora, args.preseleccion)
+        if barrido.saturadas:
+            print(f"{barrido.saturadas} configuraciones saturan alguna caja a {args.clientes_hora:g} clientes/hora; "
+                  f"solo se simulan si no alcanzan las demás")
+        resumen = barrido.evaluar(puntos, args.replicas)
+    elif args.adaptativo:
+        resumen = barrido.adaptativo(rejilla, replicasMaximas=args.replicas)
+    else:
+        resumen = barrido.rejilla(rejilla, args.replicas)
+    if puntoControl is not None:
+        barrido.guardarPunto(terminado=True)
+
+    print(f"=== MEJORES CONFIGURACIONES ({barrido.corridasEjecutadas} corridas nuevas, "
+          f"{barrido.corridasEnCache} desde caché) ===")
+    for fila in resumen[:args.top]:
+        print(f"  {fila['numeroCajeros']} cajeros | express {fila['posicionExpress']:9} | límite {fila['limiteExpress']:3} | "
+              f"experiencia {fila['probabilidadExperiencia']:.2f} -> espera {fila['esperaPromedio']:.2f}s "
+              f"(objetivo {fila['objetivo']:.2f}, {fila['replicas']} réplicas)")
@@ -0,0 +1,215 @@
+import argparse
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from typing import Dict
+from simulation.estadisticas import Welford
+from simulation.puntoControl import PuntoControl
+from simulation.simulacion import POSICIONES_EXPRESS, ConfiguracionSimulacion, Simulacion
+
+# Réplicas con reducción de varianza para comparar configuraciones:
+# - números aleatorios comunes: la réplica r de todas las configuraciones usa la semilla [semilla, r],
+#   y Simulacion reparte sorteos por flujo, así todas ven los mismos cajeros y clientes
+# - variables antitéticas: cada observación promedia la corrida con u y la corrida con 1 - u
+# - parada secuencial: se agregan lotes de réplicas hasta que los intervalos alcanzan el semiancho pedido
+
+def esperaPromedio(configuracion: ConfiguracionSimulacion) -> float:
+    clientes = Simulacion(configuracion).ejecutar().clientes
+    return sum(cliente.tiempoEspera for cliente in clientes) / len(clientes) if clientes else 0.0
+
+def observacion(configuracion: ConfiguracionSimulacion, antitetico: bool) -> float:
+    """Espera promedio de una réplica, o el promedio del par antitético"""
+    if not antitetico:
+        return esperaPromedio(configuracion)
+    return (esperaPromedio(configuracion) + esperaPromedio(replace(configuracion, antitetico=True))) / 2
+
+def evaluarLote(tareas):
+    return [observacion(configuracion, antitetico) for configuracion, antitetico in tareas]
+
+class ControlReplicas:
+    """
+    Compara configuraciones con réplicas por lotes. Con más de una configuración el criterio de
+    parada usa las diferencias respecto a la primera, que es lo que reducen los números comunes.
+    """
+    def __init__(self, configuraciones: Dict[str, ConfiguracionSimulacion], semilla: int = 0, comunes: bool = True,
+                 antitetico: bool = False, confianza: float = 0.95, semiancho: float = None, relativo: bool = False,
+                 minimo: int = 10, maximo: int = 10_000, lote: int = 10, procesos: int = 1,
+                 puntoControl: PuntoControl = None):
+        """
+        Args:
+            configuraciones: Nombre -> configuración a comparar (la primera es la referencia)
+            semilla: Semilla raíz de todas las réplicas
+            comunes: Usar la misma semilla en todas las configuraciones de una réplica
+            antitetico: Cada observación es el promedio de un par antitético
+            confianza: Nivel de confianza de los intervalos
+            semiancho: Semiancho objetivo del intervalo (segundos, o fracción de la media si relativo)
+            minimo, maximo: Réplicas mínimas antes de evaluar la parada y máximas en total
+            lote: Réplicas que se agregan entre evaluaciones del criterio
+            procesos: Procesos para ejecutar cada lote
+            puntoControl: Guarda los acumuladores entre lotes y continúa desde ellos al volver a ejecutar;
+                el criterio de parada se puede cambiar al reanudar (por ejemplo, pedir un semiancho menor)
+        """
+        self.configuraciones = configuraciones
+        self.nombres = list(configuraciones)
+        self.semillaRaiz = semilla
+        self.comunes = comunes
+        self.antitetico = antitetico
+        self.z = statistics.NormalDist().inv_cdf(0.5 + confianza / 2)
+        self.objetivo = semiancho
+        self.relativo = relativo
+        self.minimo = minimo
+        self.maximo = maximo
+        self.lote = lote
+        self.procesos = procesos or os.cpu_count() or 1
+
+        self.observaciones = {nombre: Welford() for nombre in self.nombres}
+        self.diferencias = {nombre: Welford() for nombre in self.nombres[1:]}  # configuración - referencia
+        self.replicas = 0
+        self.corridas = 0
+        self.pool = None
+        self.puntoControl = puntoControl
+
+    def semilla(self, replica: int, indiceConfiguracion: int):
+        if self.comunes:
+            return [self.semillaRaiz, replica]
+        return [self.semillaRaiz, replica, indiceConfiguracion]
+
+    def semiancho(self, acumulador: Welford) -> float:
+        if acumulador.cantidad < 2:
+            return math.inf
+        return self.z * math.sqrt(acumulador.varianza() / acumulador.cantidad)
+
+    def alcanzado(self) -> bool:
+        """True si todos los intervalos del criterio de parada ya son suficientemente angostos"""
+        if self.objetivo is None:
+            return False
+        criterio = self.diferencias if self.diferencias else self.observaciones
+        for acumulador in criterio.values():
+            limite = self.objetivo * abs(acumulador.media) if self.relativo else self.objetivo
+            if self.semiancho(acumulador) > limite:
+                return False
+        return True
+
+    def ejecutarLote(self, cantidad: int):
+        tareas = [(replace(self.configuraciones[nombre], semilla=self.semilla(r, i)), self.antitetico)
+                  for r in range(self.replicas, self.replicas + cantidad)
+                  for i, nombre in enumerate(self.nombres)]
+        if self.pool is None:
+            valores = evaluarLote(tareas)
+        else:
+            tamano = max(1, len(tareas) // (self.procesos * 4))
+            partes = [tareas[i:i + tamano] for i in range(0, len(tareas), tamano)]
+            valores = [valor for parcial in self.pool.map(evaluarLote, partes) for valor in parcial]
+
+        numero = len(self.nombres)
+        for inicio in range(0, len(valores), numero):
+            fila = valores[inicio:inicio + numero]
+            for nombre, valor in zip(self.nombres, fila):
+                self.observaciones[nombre].agregar(valor)
+            for nombre, valor in zip(self.nombres[1:], fila[1:]):
+                self.diferencias[nombre].agregar(valor - fila[0])
+        self.replicas += cantidad
+        self.corridas += len(tareas) * (2 if self.antitetico else 1)
+
+    def parametrosControl(self) -> dict:
+        """Lo que determina las observaciones de cada réplica (no el criterio de parada)"""
+        return {
+            "configuraciones": {nombre: asdict(configuracion) for nombre, configuracion in self.configuraciones.items()},
+            "semilla": self.semillaRaiz,
+            "comunes": self.comunes,
+            "antitetico": self.antitetico,
+        }
+
+    def restaurar(self):
+        estado = self.puntoControl.cargar("controlReplicas", self.parametrosControl())
+        if estado is not None:
+            self.observaciones = estado["observaciones"]
+            self.diferencias = estado["diferencias"]
+            self.replicas = estado["replicas"]
+            self.corridas = estado["corridas"]
+
+    def guardarPunto(self):
+        self.puntoControl.guardar("controlReplicas", self.parametrosControl(), observaciones=self.observaciones,
+                                  diferencias=self.diferencias, replicas=self.replicas, corridas=self.corridas)
+
+    def ejecutar(self):
+        """Agrega lotes hasta alcanzar el semiancho objetivo o el máximo de réplicas"""
+        if self.puntoControl is not None:
+            self.restaurar()
+        if self.procesos > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.procesos)
+        try:
+            while self.replicas < self.maximo:
+                if self.replicas >= self.minimo and self.alcanzado():
+                    break
+                self.ejecutarLote(min(self.lote, self.maximo - self.replicas))
+                if self.puntoControl is not None and self.puntoControl.debeGuardar():
+                    self.guardarPunto()
+            if self.puntoControl is not None:
+                self.guardarPunto()
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
+        return self.resumen()
+
+    def resumen(self):
+        referencia = self.observaciones[self.nombres[0]]
+        diferencias = {}
+        for nombre, acumulador in self.diferencias.items():
+            # corridas que necesitaría el muestreo independiente para la misma precisión en la diferencia
+            independiente = self.observaciones[nombre].varianza() + referencia.varianza()
+            diferencias[nombre] = {
+                "media": acumulador.media,
+                "semiancho": self.semiancho(acumulador),
+                "reduccion": independiente / acumulador.varianza() if acumulador.varianza() > 0 else math.inf,
+            }
+        return {
+            "replicas": self.replicas,
+            "corridas": self.corridas,
+            "alcanzado": self.alcanzado(),
+            "configuraciones": {nombre: {"media": acumulador.media, "semiancho": self.semiancho(acumulador)}
+                                for nombre, acumulador in self.observaciones.items()},
+            "diferencias": diferencias,
+        }
+
+def crearParser():
+    parser = argparse.ArgumentParser(description="Comparación de posiciones express con reducción de varianza")
+    parser.add_argument("--cajeros", type=int, default=5)
+    parser.add_argument("--clientes", type=int, default=25)
+    parser.add_argument("--posiciones", nargs="+", default=["primera", "medio", "ultima"], choices=POSICIONES_EXPRESS)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sin-comunes", action="store_true", help="semillas independientes por configuración")
+    parser.add_argument("--antitetico", action="store_true", help="usar pares antitéticos")
+    parser.add_argument("--semiancho", type=float, default=None, help="semiancho objetivo del intervalo")
+    parser.add_argument("--relativo", action="store_true", help="--semiancho es una fracción de la media")
+    parser.add_argument("--confianza", type=float, default=0.95)
+    parser.add_argument("--minimo", type=int, default=10)
+    parser.add_argument("--maximo", type=int, default=10_000)
+    parser.add_argument("--lote", type=int, default=20)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--punto-control", metavar="RUTA",
+                        help="guardar los acumuladores entre lotes y, si RUTA ya existe, continuar desde ahí")
+    parser.add_argument("--intervalo-control", type=float, default=5.0, help="segundos entre puntos de control")
+    return parser
+
+if __name__ == "__main__":
+    args = crearParser().parse_args()
+    configuraciones = {posicion: ConfiguracionSimulacion(args.cajeros, args.clientes, posicion)
+                       for posicion in args.posiciones}
+    puntoControl = PuntoControl(args.punto_control, args.intervalo_control) if args.punto_control else None
+    control = ControlReplicas(configuraciones, args.semilla, not args.sin_comunes, args.antitetico, args.confianza,
+                              args.semiancho, args.relativo, args.minimo, args.maximo, args.lote, args.procesos,
+                              puntoControl)
+    resumen = control.ejecutar()
+
+    estado = "objetivo alcanzado" if resumen["alcanzado"] else "máximo de réplicas"
+    print(f"=== {resumen['replicas']} réplicas, {resumen['corridas']} corridas ({estado}) ===")
+    for nombre, datos in resumen["configuraciones"].items():
+        print(f"  {nombre:9}: espera promedio {datos['media']:.2f}s ± {datos['semiancho']:.2f}")
+    referencia = control.nombres[0]
+    for nombre, datos in resumen["diferencias"].items():
+        print(f"  {nombre} - {referencia}: {datos['media']:+.2f}s ± {datos['semiancho']:.2f} "
+              f"(reducción de varianza {datos['reduccion']:.1f}x frente a réplicas independientes)")
@@ -0,0 +1,210 @@
+import math
+import numpy as np
+
+# Estadísticas en línea de los tiempos de espera: se alimentan cliente a cliente o por bloques,
+# usan memoria constante y se pueden combinar entre procesos (todas son objetos serializables).
+
+PERCENTILES = (0.50, 0.90, 0.95, 0.99)
+
+class Welford:
+    """Cantidad, media, varianza, mínimo y máximo con el método de Welford"""
+    __slots__ = ("cantidad", "media", "m2", "minimo", "maximo")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.media = 0.0
+        self.m2 = 0.0  # suma de cuadrados de desviaciones respecto a la media
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def agregar(self, valor: float):
+        self.cantidad += 1
+        delta = valor - self.media
+        self.media += delta / self.cantidad
+        self.m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def agregarBloque(self, valores: np.ndarray):
+        if len(valores):
+            bloque = Welford()
+            bloque.cantidad = len(valores)
+            bloque.media = float(valores.mean())
+            bloque.m2 = float(((valores - bloque.media) ** 2).sum())
+            bloque.minimo = float(valores.min())
+            bloque.maximo = float(valores.max())
+            self.combinar(bloque)
+
+    def combinar(self, otro: "Welford"):
+        """Agrega lo acumulado por otro (combinación de Chan et al.)"""
+        if otro.cantidad == 0:
+            return
+        total = self.cantidad + otro.cantidad
+        delta = otro.media - self.media
+        self.media += delta * otro.cantidad / total
+        self.m2 += otro.m2 + delta * delta * self.cantidad * otro.cantidad / total
+        self.cantidad = total
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+
+    def varianza(self) -> float:
+        return self.m2 / (self.cantidad - 1) if self.cantidad > 1 else 0.0
+
+    def desviacion(self) -> float:
+        return math.sqrt(self.varianza())
+
+class TDigest:
+    """
+    Resumen de cuantiles t-digest (versión que combina centroides ordenados).
+
+    Guarda a lo sumo unos compresion / 2 centroides (media, peso). Los centroides son más
+    pequeños en las colas (escala k1 = compresion / 2pi * asin(2q - 1)), así p95 y p99
+    conservan buena precisión. Los valores sueltos se juntan en un buffer y se comprimen por lotes.
+    """
+    def __init__(self, compresion: float = 200):
+        self.compresion = compresion
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self.buffer = []
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    @property
+    def cantidad(self) -> float:
+        return float(self.pesos.sum()) + len(self.buffer)
+
+    def agregar(self, valor: float):
+        self.buffer.append(valor)
+        if len(self.buffer) >= 20 * self.compresion:
+            self.comprimir()
+
+    def agregarBloque(self, valores: np.ndarray):
+        if len(valores):
+            self.fusionar(np.asarray(valores, dtype=np.float64), np.ones(len(valores)))
+
+    def combinar(self, otro: "TDigest"):
+        otro.comprimir()
+        self.fusionar(otro.medias, otro.pesos)
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+
+    def comprimir(self):
+        if self.buffer:
+            valores = np.array(self.buffer)
+            self.buffer = []
+            self.fusionar(valores, np.ones(len(valores)))
+
+    def fusionar(self, medias: np.ndarray, pesos: np.ndarray):
+        if len(medias) == 0:
+            return
+        if len(self.buffer):
+            medias = np.concatenate((medias, self.buffer))
+            pesos = np.concatenate((pesos, np.ones(len(self.buffer))))
+            self.buffer = []
+        self.minimo = min(self.minimo, float(medias.min()))
+        self.maximo = max(self.maximo, float(medias.max()))
+
+        medias = np.concatenate((self.medias, medias))
+        pesos = np.concatenate((self.pesos, pesos))
+        orden = np.argsort(medias, kind="stable")
+        medias, pesos = medias[orden], pesos[orden]
+
+        # cada centroide nuevo abarca a lo sumo una unidad de la escala k
+        acumulado = np.cumsum(pesos)
+        qIzquierda = (acumulado - pesos) / acumulado[-1]
+        k = self.compresion / (2 * math.pi) * np.arcsin(2 * qIzquierda - 1)
+        grupos = np.floor(k - k[0]).astype(np.int64)
+        grupos = np.concatenate(([0], np.cumsum(grupos[1:] != grupos[:-1])))
+
+        self.pesos = np.bincount(grupos, weights=pesos)
+        self.medias = np.bincount(grupos, weights=pesos * medias) / self.pesos
+
+    def cuantiles(self, qs) -> np.ndarray:
+        """Cuantiles aproximados para cada q en [0, 1], interpolando entre centros de centroides"""
+        self.comprimir()
+        qs = np.asarray(qs, dtype=np.float64)
+        if len(self.pesos) == 0:
+            return np.full(qs.shape, math.nan)
+        total = self.pesos.sum()
+        centros = np.cumsum(self.pesos) - self.pesos / 2
+        posiciones = np.concatenate(([0.0], centros, [total]))
+        valores = np.concatenate(([self.minimo], self.medias, [self.maximo]))
+        return np.interp(qs * total, posiciones, valores)
+
+    def cuantil(self, q: float) -> float:
+        return float(self.cuantiles([q])[0])
+
+class Histograma:
+    """Conteos en intervalos fijos [inicio, inicio + ancho * numeroIntervalos) más desbordes a cada lado"""
+    def __init__(self, inicio: float = 0.0, ancho: float = 60.0, numeroIntervalos: int = 240):
+        self.inicio = inicio
+        self.ancho = ancho
+        self.conteos = np.zeros(numeroIntervalos, dtype=np.int64)
+        self.debajo = 0
+        self.encima = 0
+
+    def bordes(self) -> np.ndarray:
+        return self.inicio + self.ancho * np.arange(len(self.conteos) + 1)
+
+    def agregar(self, valor: float):
+        posicion = int((valor - self.inicio) // self.ancho)
+        if posicion < 0:
+            self.debajo += 1
+        elif posicion >= len(self.conteos):
+            self.encima += 1
+        else:
+            self.conteos[posicion] += 1
+
+    def agregarBloque(self, valores: np.ndarray):
+        posiciones = np.floor((np.asarray(valores) - self.inicio) / self.ancho).astype(np.int64)
+        dentro = (posiciones >= 0) & (posiciones < len(self.conteos))
+        self.debajo += int((posiciones < 0).sum())
+        self.encima += int((posiciones >= len(self.conteos)).sum())
+        self.conteos += np.bincount(posiciones[dentro], minlength=len(self.conteos))
+
+    def combinar(self, otro: "Histograma"):
+        if (otro.inicio, otro.ancho, len(otro.conteos)) != (self.inicio, self.ancho, len(self.conteos)):
+            raise ValueError("Solo se pueden combinar histogramas con los mismos intervalos")
+        self.conteos += otro.conteos
+        self.debajo += otro.debajo
+        self.encima += otro.encima
+
+class EstadisticasEspera:
+    """Welford, t-digest e histograma alimentados juntos; es lo que guardan el flujo, el motor y las réplicas"""
+    def __init__(self, compresion: float = 200, histograma: Histograma = None):
+        self.momentos = Welford()
+        self.digest = TDigest(compresion)
+        self.histograma = histograma if histograma is not None else Histograma()
+
+    def agregar(self, valor: float):
+        self.momentos.agregar(valor)
+        self.digest.agregar(valor)
+        self.histograma.agregar(valor)
+
+    def agregarBloque(self, valores: np.ndarray):
+        valores = np.asarray(valores, dtype=np.float64)
+        self.momentos.agregarBloque(valores)
+        self.digest.agregarBloque(valores)
+        self.histograma.agregarBloque(valores)
+
+    def combinar(self, otro: "EstadisticasEspera"):
+        self.momentos.combinar(otro.momentos)
+        self.digest.combinar(otro.digest)
+        self.histograma.combinar(otro.histograma)
+        return self
+
+    def resumen(self, percentiles=PERCENTILES) -> dict:
+        momentos = self.momentos
+        datos = {
+            "cantidad": momentos.cantidad,
+            "media": momentos.media,
+            "desviacion": momentos.desviacion(),
+            "minimo": momentos.minimo if momentos.cantidad else 0.0,
+            "maximo": momentos.maximo if momentos.cantidad else 0.0,
+        }
+        if momentos.cantidad:
+            for q, valor in zip(percentiles, self.digest.cuantiles(percentiles).tolist()):
+                datos[f"p{round(q * 100)}"] = valor
+        return datos
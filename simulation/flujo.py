@@ -0,0 +1,164 @@
+from typing import Iterator, List
+import numpy as np
+from models.caja import Caja
+from models.almacenClientes import AlmacenClientes, sumaAcumuladaPorGrupo
+from simulation.asignacion import Enrutador
+from simulation.generadorDatos import GeneradorDatos
+from simulation.estadisticas import EstadisticasEspera
+
+# Simulación en flujo: fuente de clientes por bloques -> enrutamiento -> atención en cajas -> estadísticas.
+# Ningún paso guarda la población completa, así que la memoria depende solo del tamaño de bloque.
+
+TAMANO_BLOQUE = 100_000
+
+def fuenteClientes(generador: GeneradorDatos, totalClientes: int, tamanoBloque: int = TAMANO_BLOQUE,
+                   sesgoexpress = True) -> Iterator[np.ndarray]:
+    """Genera perezosamente los artículos de los clientes en bloques de tamanoBloque"""
+    restantes = totalClientes
+    while restantes > 0:
+        cantidad = min(tamanoBloque, restantes)
+        yield generador.articulosClientes(cantidad, sesgoexpress)
+        restantes -= cantidad
+
+class ServicioCajas:
+    """Atiende bloques de clientes en orden FIFO conservando la espera acumulada de cada caja"""
+    def __init__(self, cajas: List[Caja]):
+        self.escaneo = np.array([caja.cajero.tiempoEscaneoPorArticulo for caja in cajas], dtype=np.float64)
+        self.cobro = np.array([caja.cajero.tiempoCobro for caja in cajas], dtype=np.float64)
+        self.acumulado = np.zeros(len(cajas), dtype=np.float64)  # trabajo ya atendido por caja
+
+    def atender(self, articulos: np.ndarray, cajasAsignadas: np.ndarray):
+        """Retorna (caja, artículos, tiempo de atención, tiempo total) de cada cliente, agrupados por caja"""
+        orden = np.argsort(cajasAsignadas, kind="stable")
+        cajasOrden = cajasAsignadas[orden]
+        articulosOrden = articulos[orden]
+        atencion = articulosOrden * self.escaneo[cajasOrden] + self.cobro[cajasOrden]
+        total = sumaAcumuladaPorGrupo(atencion, cajasOrden) + self.acumulado[cajasOrden]
+        self.acumulado += np.bincount(cajasOrden, weights=atencion, minlength=len(self.acumulado))
+        return cajasOrden, articulosOrden, atencion, total
+
+class SumideroEstadisticas:
+    """
+    Cantidad, media, varianza, mínimo y máximo del tiempo total por caja, más percentiles e
+    histograma de la espera en fila de todos los clientes (EstadisticasEspera), en memoria constante
+    """
+    def __init__(self, numeroCajas: int, estadisticas: EstadisticasEspera = None):
+        self.cantidad = np.zeros(numeroCajas, dtype=np.int64)
+        self.media = np.zeros(numeroCajas, dtype=np.float64)
+        self.m2 = np.zeros(numeroCajas, dtype=np.float64)  # suma de cuadrados de desviaciones
+        self.minimo = np.full(numeroCajas, np.inf)
+        self.maximo = np.full(numeroCajas, -np.inf)
+        self.estadisticas = estadisticas if estadisticas is not None else EstadisticasEspera()
+
+    def agregar(self, cajas: np.ndarray, tiempos: np.ndarray, esperas: np.ndarray):
+        """tiempos: tiempo total de cada cliente; esperas: su espera en fila (sin la atención)"""
+        numeroCajas = len(self.cantidad)
+        cantidadBloque = np.bincount(cajas, minlength=numeroCajas)
+        hay = cantidadBloque > 0
+        sumaBloque = np.bincount(cajas, weights=tiempos, minlength=numeroCajas)
+        mediaBloque = np.divide(sumaBloque, cantidadBloque, out=np.zeros(numeroCajas), where=hay)
+        desviaciones = tiempos - mediaBloque[cajas]
+        m2Bloque = np.bincount(cajas, weights=desviaciones * desviaciones, minlength=numeroCajas)
+        self.combinarMomentos(cantidadBloque, mediaBloque, m2Bloque)
+
+        np.minimum.at(self.minimo, cajas, tiempos)
+        np.maximum.at(self.maximo, cajas, tiempos)
+        self.estadisticas.agregarBloque(esperas)
+
+    def combinar(self, otro: "SumideroEstadisticas"):
+        """Agrega lo acumulado por otro sumidero con las mismas cajas (por ejemplo, de otro proceso)"""
+        self.combinarMomentos(otro.cantidad, otro.media, otro.m2)
+        self.minimo = np.minimum(self.minimo, otro.minimo)
+        self.maximo = np.maximum(self.maximo, otro.maximo)
+        self.estadisticas.combinar(otro.estadisticas)
+
+    def combinarMomentos(self, cantidadBloque, mediaBloque, m2Bloque):
+        """Combinación de Chan et al. entre lo acumulado y un bloque (cantidad, media, m2 por caja)"""
+        numeroCajas = len(self.cantidad)
+        hay = cantidadBloque > 0
+        cantidadTotal = self.cantidad + cantidadBloque
+        delta = mediaBloque - self.media
+        peso = np.divide(cantidadBloque, cantidadTotal, out=np.zeros(numeroCajas), where=cantidadTotal > 0)
+        self.media = np.where(hay, self.media + delta * peso, self.media)
+        self.m2 = np.where(hay, self.m2 + m2Bloque + delta * delta * self.cantidad * peso, self.m2)
+        self.cantidad = cantidadTotal
+
+    def varianza(self) -> np.ndarray:
+        return np.divide(self.m2, self.cantidad - 1, out=np.zeros(len(self.m2)), where=self.cantidad > 1)
+
+    def mediaGlobal(self) -> float:
+        total = self.cantidad.sum()
+        return float((self.media * self.cantidad).sum() / total) if total else 0.0
+
+def ejecutarFlujo(cajas: List[Caja], totalClientes: int, tamanoBloque: int = TAMANO_BLOQUE,
+                  generador: GeneradorDatos = None, sesgoexpress = True, traza = None,
+                  puntoControl = None) -> SumideroEstadisticas:
+    """
+    Simula totalClientes clientes sin materializarlos: cada bloque se genera, enruta, atiende
+    y resume antes de pedir el siguiente.
+
+    Args:
+        cajas: Cajas a simular; al final tiempoAtencionTotal queda con el trabajo de cada una
+        totalClientes: Número total de clientes simulados
+        tamanoBloque: Clientes por bloque (más grande = más memoria y más vectorización)
+        generador: Generador de datos; si no se indica se crea uno nuevo
+        sesgoexpress: Distribución de artículos de los clientes
+        traza: EscritorTraza opcional (simulation/traza.py) que recibe cada bloque atendido
+        puntoControl: PuntoControl opcional (simulation/puntoControl.py); si ya tiene estado de esta
+            misma corrida se continúa desde ahí, y se guarda entre bloques cada tantos segundos
+    """
+    generador = generador if generador is not None else GeneradorDatos()
+    enrutador = Enrutador(cajas, generador)
+    servicio = ServicioCajas(cajas)
+    sumidero = SumideroEstadisticas(len(cajas))
+    procesados = 0
+
+    if puntoControl is not None:
+        # el estado inicial del generador identifica la semilla sin guardarla aparte
+        parametros = {
+            "totalClientes": totalClientes,
+            "tamanoBloque": tamanoBloque,
+            "sesgoexpress": sesgoexpress,
+            "cajas": [(caja.esExpress, caja.LIMITE_EXPRESS, caja.cajero.tiempoEscaneoPorArticulo, caja.cajero.tiempoCobro)
+                      for caja in cajas],
+            "generador": generador.rng.bit_generator.state,
+            "antitetico": generador.antitetico,
+        }
+        estado = puntoControl.cargar("flujo", parametros)
+        if estado is not None:
+            procesados = estado["procesados"]
+            generador.rng.bit_generator.state = estado["estadoGenerador"]
+            generador.buffer = estado["buffer"]
+            servicio.acumulado = estado["acumulado"]
+            sumidero = estado["sumidero"]
+            if traza is not None:
+                traza.truncar(estado["registrosTraza"])
+        elif traza is not None:
+            traza.truncar(0)  # registros de una corrida que murió antes de su primer punto de control
+
+    def guardarPunto():
+        if traza is not None:
+            traza.sincronizar()  # los registros deben estar en disco antes que el punto que los cuenta
+        puntoControl.guardar("flujo", parametros, procesados=procesados,
+                             estadoGenerador=generador.rng.bit_generator.state, buffer=list(generador.buffer),
+                             acumulado=servicio.acumulado, sumidero=sumidero,
+                             registrosTraza=traza.cantidad if traza is not None else 0)
+
+    # los bloques restantes tienen los mismos tamaños que en la corrida sin interrumpir
+    for articulos in fuenteClientes(generador, totalClientes - procesados, tamanoBloque, sesgoexpress):
+        procesados += len(articulos)
+        cajasAsignadas = enrutador.enrutar(articulos)
+        asignados = cajasAsignadas != AlmacenClientes.SIN_CAJA
+        if not asignados.all():
+            articulos, cajasAsignadas = articulos[asignados], cajasAsignadas[asignados]
+        cajasOrden, articulosOrden, atencion, tiempos = servicio.atender(articulos, cajasAsignadas)
+        esperas = tiempos - atencion
+        sumidero.agregar(cajasOrden, tiempos, esperas)
+        if traza is not None:
+            traza.agregar(cajasOrden, articulosOrden, esperas, tiempos)
+        if puntoControl is not None and (puntoControl.debeGuardar() or procesados == totalClientes):
+            guardarPunto()
+
+    for caja, acumulado in zip(cajas, servicio.acumulado.tolist()):
+        caja.tiempoAtencionTotal = acumulado
+    return sumidero
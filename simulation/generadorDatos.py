@@ -1,29 +1,89 @@
-import random
+import numpy as np
 from models.cliente import Cliente
 from models.cajero import Cajero
+from simulation import instrumentacion
 
 class GeneradorDatos:
-    def __init__(self):
-        pass
-    
-    def generaClientes(self, numeroClientes : int, sesgoexpress = True):
-        clientes = [] #lista vacia para almacenar clientes
-        for _ in range(numeroClientes):
-            if sesgoexpress:
-                if random.random() < 0.30:
-                    numeroArticulos = random.randint(1, 10) #generamos numero aleatorio de articulos entre 1 y 10
-                else:
-                    numeroArticulos = random.randint(11, 30) #generamos numero aleatorio de articulos entre 11 y 30
+    TAMANO_BUFFER = 4096  # uniformes que se piden de una vez para los sorteos uno a uno
+    MAXIMO_UNIFORME = np.nextafter(1.0, 0.0)  # mayor valor menor que 1
+    BLOQUE_CLIENTES = 20_000  # objetos Cliente creados entre llamadas a revisar
+
+    def __init__(self, semilla = None, antitetico = False):
+        """
+        Args:
+            semilla: Entero, numpy.random.SeedSequence o None (no reproducible)
+            antitetico: Si es True cada uniforme u se reemplaza por 1 - u (variable antitética)
+        """
+        self.rng = np.random.default_rng(semilla) #generador propio, independiente del modulo random
+        self.antitetico = antitetico
+        self.buffer = []
+
+    @classmethod
+    def subflujos(cls, semilla, cantidad : int, antitetico = False):
+        """
+        Generadores independientes derivados de una misma semilla, uno por tipo de sorteo.
+        Así cambiar un parámetro (por ejemplo la posición express) no desplaza los sorteos de los demás.
+        """
+        raiz = semilla if isinstance(semilla, np.random.SeedSequence) else np.random.SeedSequence(semilla)
+        #hijas armadas a mano: spawn() cambia el estado de raiz y daria otras hijas en la siguiente llamada
+        return [cls(np.random.SeedSequence(raiz.entropy, spawn_key=raiz.spawn_key + (i,), pool_size=raiz.pool_size),
+                    antitetico)
+                for i in range(cantidad)]
+
+    def uniformes(self, cantidad : int):
+        u = self.rng.random(cantidad) #todos los sorteos salen de uniformes en [0, 1)
+        if self.antitetico:
+            return np.minimum(1.0 - u, self.MAXIMO_UNIFORME) #1 - u cae en (0, 1], se mantiene bajo 1
+        return u
+
+    def uniforme(self) -> float:
+        if not self.buffer:
+            self.buffer = self.uniformes(self.TAMANO_BUFFER).tolist()[::-1] #pop() saca en orden
+        return self.buffer.pop()
+
+    def indiceAleatorio(self, cantidad : int) -> int:
+        return int(self.uniforme() * cantidad) #indice entre 0 y cantidad - 1
+
+    def articulosClientes(self, numeroClientes : int, sesgoexpress = True):
+        if instrumentacion.activa:
+            instrumentacion.contar("clientesGenerados", numeroClientes)
+        if sesgoexpress:
+            pocos = self.uniformes(numeroClientes) < 0.30
+            v = self.uniformes(numeroClientes)
+            #entre 1 y 10 articulos para el 30% de clientes, entre 11 y 30 para el resto
+            articulos = np.where(pocos, 1 + np.floor(v * 10), 11 + np.floor(v * 20))
+        else:
+            articulos = 1 + np.floor(self.uniformes(numeroClientes) * 50) #entre 1 y 50 articulos
+        return articulos.astype(np.int16)
+
+    def generaCliente(self, sesgoexpress = True):
+        if sesgoexpress:
+            if self.uniforme() < 0.30:
+                numeroArticulos = 1 + int(self.uniforme() * 10) #generamos numero aleatorio de articulos entre 1 y 10
             else:
-                numeroArticulos = random.randint(1, 50) #generamos numero aleatorio de articulos
-            cliente = Cliente(numeroArticulos) #instancia de cliente
-            clientes.append(cliente) #agregamos cliente  a la lista
+                numeroArticulos = 11 + int(self.uniforme() * 20) #generamos numero aleatorio de articulos entre 11 y 30
+        else:
+            numeroArticulos = 1 + int(self.uniforme() * 50) #generamos numero aleatorio de articulos
+        if instrumentacion.activa:
+            instrumentacion.contar("clientesGenerados")
+        return Cliente(numeroArticulos) #instancia de cliente
+
+    def generaClientes(self, numeroClientes : int, sesgoexpress = True, revisar = None):
+        """revisar: funcion opcional llamada entre bloques de clientes (por ejemplo, para cancelar)"""
+        articulos = self.articulosClientes(numeroClientes, sesgoexpress).tolist() #todos los articulos en una sola llamada
+        clientes = []
+        for inicio in range(0, len(articulos), self.BLOQUE_CLIENTES): #los sorteos no cambian, solo se crean los objetos por partes
+            if revisar is not None:
+                revisar()
+            clientes.extend([Cliente(numeroArticulos) for numeroArticulos in articulos[inicio:inicio + self.BLOQUE_CLIENTES]])
         return clientes
-    
-    def generarCajeros(self, numeroCajeros : int):
-        cajeros = [] #lista vacia para almacenar cajeros
-        for _ in range(numeroCajeros):
-            experienciaAleatoria = random.choice([True, False]) #generamos experiencia aleatoria
-            cajero = Cajero(experienciaAleatoria) #creamos instancia de cajero con experiencia aleatoria
-            cajeros.append(cajero) #agregamos cajero a la lista
-        return cajeros
\ No newline at end of file
+
+    def parametrosCajeros(self, numeroCajeros : int, probabilidadExperiencia = 0.5):
+        experiencia = self.uniformes(numeroCajeros) < probabilidadExperiencia
+        tiempoCobro = (15 + np.floor(self.uniformes(numeroCajeros) * 16)).astype(np.int16) #entre 15 y 30 segundos
+        return experiencia, tiempoCobro
+
+    def generarCajeros(self, numeroCajeros : int, probabilidadExperiencia = 0.5):
+        experiencia, tiempoCobro = self.parametrosCajeros(numeroCajeros, probabilidadExperiencia)
+        return [Cajero(tieneExperiencia, cobro)
+                for tieneExperiencia, cobro in zip(experiencia.tolist(), tiempoCobro.tolist())]
@@ -0,0 +1,80 @@
+import heapq
+from typing import List
+from models.caja import Caja
+
+class IndiceCajas:
+    """
+    Índice de cajas ordenadas por carga de trabajo pendiente.
+
+    Mantiene un heap para cajas express y otro para cajas normales con invalidación perezosa:
+    cada cambio de carga agrega una entrada nueva con una versión mayor y las entradas viejas
+    se descartan al llegar a la cima. Consultas y actualizaciones cuestan O(log n).
+    Se asume que todas las cajas express comparten el mismo LIMITE_EXPRESS.
+    """
+    def __init__(self, cajas: List[Caja]):
+        self.cajas = cajas
+        self.posiciones = {}  # id(caja) -> posición en la lista, desempata igual que min()
+        self.versiones = [0] * len(cajas)
+        self.heapExpress = []
+        self.heapNormales = []
+
+        for posicion, caja in enumerate(cajas):
+            self.posiciones[id(caja)] = posicion
+            heap = self.heapExpress if caja.esExpress else self.heapNormales
+            heap.append((caja.cargaTrabajo, posicion, 0))
+            caja.indice = self
+        heapq.heapify(self.heapExpress)
+        heapq.heapify(self.heapNormales)
+
+    def actualizar(self, caja: Caja):
+        """Registra la nueva carga de una caja; la entrada anterior queda invalidada"""
+        posicion = self.posiciones[id(caja)]
+        self.versiones[posicion] += 1
+        heap = self.heapExpress if caja.esExpress else self.heapNormales
+        heapq.heappush(heap, (caja.cargaTrabajo, posicion, self.versiones[posicion]))
+
+        # Reconstruir si las entradas vencidas superan a las vigentes
+        if len(heap) > 2 * len(self.cajas) + 16:
+            self.compactar(heap)
+
+    def compactar(self, heap):
+        vigentes = [entrada for entrada in heap if entrada[2] == self.versiones[entrada[1]]]
+        heapq.heapify(vigentes)
+        heap[:] = vigentes
+
+    def cima(self, heap):
+        """Retorna la entrada vigente de menor carga del heap, descartando las vencidas"""
+        while heap and heap[0][2] != self.versiones[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def cajaExpressMasRapida(self):
+        entrada = self.cima(self.heapExpress)
+        return self.cajas[entrada[1]] if entrada else None
+
+    def cajaNormalMasRapida(self):
+        entrada = self.cima(self.heapNormales)
+        return self.cajas[entrada[1]] if entrada else None
+
+    def cajaMasRapida(self, numeroArticulos: int = None):
+        """
+        Caja válida con menor carga para un cliente con numeroArticulos artículos.
+        Si numeroArticulos es None se consideran todas las cajas.
+        """
+        candidatos = []
+        normal = self.cima(self.heapNormales)
+        if normal:
+            candidatos.append(normal)
+        express = self.cima(self.heapExpress)
+        if express and (numeroArticulos is None
+                        or numeroArticulos <= self.cajas[express[1]].LIMITE_EXPRESS):
+            candidatos.append(express)
+        if not candidatos:
+            return None
+        return self.cajas[min(candidatos)[1]]
+
+    def desvincular(self):
+        """Deja de recibir notificaciones de las cajas"""
+        for caja in self.cajas:
+            if caja.indice is self:
+                caja.indice = None
@@ -0,0 +1,135 @@
+import atexit
+import os
+import time
+from contextlib import nullcontext
+
+# Instrumentación de la simulación: cronómetros, contadores y valores por nombre.
+# Está apagada por defecto; apagada, medir() retorna siempre el mismo contexto vacío. Quien llama
+# a contar()/registrar() lo hace dentro de "if instrumentacion.activa:", así apagada el costo es una
+# comparación y ni siquiera se calculan los argumentos.
+# Se enciende con activar() o con la variable de entorno SIMULACION_METRICAS=1 (o =perfil); con la
+# variable de entorno las métricas se imprimen al terminar el proceso, en cualquier modo (consola o interfaz).
+
+activa = False
+contadores = {}  # nombre -> total
+valores = {}     # nombre -> [llamadas, total, minimo, maximo]; los cronómetros guardan segundos
+perfilador = None
+reportada = False  # ya se imprimió la instantánea (así la salida del proceso no la repite)
+
+_NULO = nullcontext()
+
+class Cronometro:
+    __slots__ = ("nombre", "inicio")
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        registrar(self.nombre, time.perf_counter() - self.inicio)
+        return False
+
+def activar(perfil: bool = False):
+    """Enciende la instrumentación; con perfil=True además captura un cProfile de todo lo que corra"""
+    global activa, perfilador
+    activa = True
+    if perfil and perfilador is None:
+        import cProfile  # solo se carga si se pide el perfil
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+
+def desactivar():
+    global activa
+    activa = False
+    if perfilador is not None:
+        perfilador.disable()
+
+def reiniciar():
+    """Borra lo acumulado (y el perfil) sin cambiar si está activa"""
+    global perfilador
+    contadores.clear()
+    valores.clear()
+    if perfilador is not None:
+        perfilador.disable()
+        perfilador = type(perfilador)()
+        if activa:
+            perfilador.enable()
+
+def medir(nombre: str):
+    """Contexto que cronometra su bloque bajo nombre"""
+    if not activa:
+        return _NULO
+    return Cronometro(nombre)
+
+def contar(nombre: str, cantidad: int = 1):
+    if activa:
+        contadores[nombre] = contadores.get(nombre, 0) + cantidad
+
+def registrar(nombre: str, valor: float):
+    """Acumula un valor (duración, widgets por cuadro, etc.) con llamadas, total, mínimo y máximo"""
+    if not activa:
+        return
+    datos = valores.get(nombre)
+    if datos is None:
+        valores[nombre] = [1, valor, valor, valor]
+    else:
+        datos[0] += 1
+        datos[1] += valor
+        if valor < datos[2]:
+            datos[2] = valor
+        if valor > datos[3]:
+            datos[3] = valor
+
+def instantanea():
+    """Copia de las métricas actuales, lista para imprimir o guardar como JSON"""
+    return {
+        "activa": activa,
+        "contadores": dict(contadores),
+        "valores": {
+            nombre: {"llamadas": llamadas, "total": total, "promedio": total / llamadas,
+                     "minimo": minimo, "maximo": maximo}
+            for nombre, (llamadas, total, minimo, maximo) in valores.items()
+        },
+    }
+
+def perfil(orden: str = "cumulative", limite: int = 25) -> str:
+    """Texto de pstats con las funciones más costosas, o cadena vacía si no se pidió perfil"""
+    if perfilador is None:
+        return ""
+    import io
+    import pstats
+    salida = io.StringIO()
+    pstats.Stats(perfilador, stream=salida).sort_stats(orden).print_stats(limite)
+    return salida.getvalue()
+
+def guardarPerfil(ruta: str):
+    """Guarda el perfil en formato pstats (para snakeviz, pstats, etc.)"""
+    if perfilador is not None:
+        perfilador.dump_stats(ruta)
+
+def imprimirInstantanea(datos: dict = None):
+    global reportada
+    reportada = True
+    datos = datos if datos is not None else instantanea()
+    print("=== MÉTRICAS ===")
+    for nombre, valor in sorted(datos["contadores"].items()):
+        print(f"  {nombre}: {valor}")
+    for nombre, v in sorted(datos["valores"].items()):
+        print(f"  {nombre}: {v['llamadas']} llamadas, total {v['total']:.4f}, "
+              f"promedio {v['promedio']:.6f}, máximo {v['maximo']:.6f}")
+
+def reportarAlSalir():
+    """Imprime métricas y perfil al terminar, salvo que el programa ya los haya mostrado"""
+    if reportada:
+        return
+    imprimirInstantanea()
+    if perfilador is not None:
+        print(perfil())
+
+_modo = os.environ.get("SIMULACION_METRICAS", "")
+if _modo and _modo != "0":
+    activar(perfil=(_modo == "perfil"))
+    atexit.register(reportarAlSalir)
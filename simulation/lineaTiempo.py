@@ -0,0 +1,103 @@
+import math
+from typing import List
+import numpy as np
+from models.caja import Caja
+from models.almacenClientes import sumaAcumuladaPorGrupo
+
+class LineaTiempo:
+    """
+    Índice de salidas de todas las cajas para ubicarse en cualquier instante sin repetir la atención.
+
+    Las salidas de cada caja quedan ordenadas (la fila es FIFO) en un único arreglo plano, con
+    inicios[i]:inicios[i + 1] como tramo de la caja i. Junto a cada salida se guardan los artículos
+    del cliente y la suma acumulada del tiempo de atención, así la carga pendiente en un instante
+    sale de una resta. Ubicarse en el instante t es una búsqueda binaria por caja,
+    O(cajas * log clientes), hecha en una sola llamada a NumPy.
+    """
+    __slots__ = ("cajas", "inicios", "salidas", "articulos", "atencionAcumulada", "desplazamientos", "claves",
+                 "duracion")
+
+    def __init__(self, cajas: List[Caja], tamanos, articulos: np.ndarray, salidas: np.ndarray):
+        """
+        Args:
+            cajas: Cajas de la simulación (no se modifican)
+            tamanos: Clientes atendidos por cada caja
+            articulos, salidas: Artículos e instante de salida de cada cliente, agrupados por caja en orden FIFO
+        """
+        self.cajas = cajas
+        self.inicios = np.zeros(len(cajas) + 1, dtype=np.int64)
+        np.cumsum(tamanos, out=self.inicios[1:])
+        self.articulos = np.asarray(articulos, dtype=np.int16)
+        self.salidas = np.asarray(salidas, dtype=np.float64)
+        self.duracion = float(self.salidas.max()) if len(self.salidas) else 0.0  # instante de la última salida
+
+        grupos = np.repeat(np.arange(len(cajas)), tamanos)
+        escaneo = np.array([caja.cajero.tiempoEscaneoPorArticulo for caja in cajas], dtype=np.float64)
+        cobro = np.array([caja.cajero.tiempoCobro for caja in cajas], dtype=np.float64)
+        atencion = self.articulos * escaneo[grupos] + cobro[grupos]
+        self.atencionAcumulada = sumaAcumuladaPorGrupo(atencion, grupos) if len(atencion) else atencion
+
+        # claves = salida + i * base con base > duración: las cajas quedan en tramos disjuntos de un
+        # solo arreglo ordenado y todas las búsquedas se hacen con una llamada a searchsorted
+        base = 2.0 ** math.ceil(math.log2(self.duracion + 2))
+        self.desplazamientos = np.arange(len(cajas)) * base
+        self.claves = self.salidas + self.desplazamientos[grupos]
+
+    @classmethod
+    def desdeCajas(cls, cajas: List[Caja]):
+        """Toma las filas tal como quedaron tras calcularTiempoAtencion"""
+        clientes = [cliente for caja in cajas for cliente in caja.filaClientes]
+        articulos = np.fromiter((cliente.numeroArticulos for cliente in clientes), dtype=np.int16, count=len(clientes))
+        salidas = np.fromiter((cliente.tiempoLlegada + cliente.tiempoTotal for cliente in clientes),
+                              dtype=np.float64, count=len(clientes))
+        return cls(cajas, [len(caja.filaClientes) for caja in cajas], articulos, salidas)
+
+    @classmethod
+    def desdeColumnas(cls, cajas: List[Caja], posicionCaja: np.ndarray, articulos: np.ndarray, salidas: np.ndarray):
+        """
+        Desde columnas por cliente (por ejemplo, una traza). Los clientes de una misma caja deben
+        venir en orden FIFO, aunque estén intercalados con los de otras cajas.
+        """
+        orden = np.argsort(posicionCaja, kind="stable")
+        tamanos = np.bincount(posicionCaja, minlength=len(cajas))
+        return cls(cajas, tamanos, np.asarray(articulos)[orden], np.asarray(salidas)[orden])
+
+    def tamano(self, indice: int) -> int:
+        return int(self.inicios[indice + 1] - self.inicios[indice])
+
+    def atendidosCaja(self, indice: int, instante: float) -> int:
+        """Clientes de la caja que ya salieron en el instante dado (búsqueda binaria)"""
+        inicio, fin = self.inicios[indice], self.inicios[indice + 1]
+        return int(np.searchsorted(self.salidas[inicio:fin], instante, side="right"))
+
+    def atendidos(self, instante: float) -> List[int]:
+        """Clientes atendidos de cada caja en el instante dado"""
+        if instante < 0:
+            return [0] * len(self.cajas)
+        instante = min(instante, self.duracion)  # más allá de la duración se invadiría el tramo siguiente
+        posiciones = np.searchsorted(self.claves, instante + self.desplazamientos, side="right")
+        return (posiciones - self.inicios[:-1]).tolist()
+
+    def enFila(self, indice: int, atendidos: int) -> int:
+        return self.tamano(indice) - atendidos
+
+    def maximaFila(self, atendidos) -> int:
+        """Clientes en la fila más larga cuando ya salieron atendidos[i] clientes de cada caja"""
+        if not len(self.cajas):
+            return 0
+        return int((np.diff(self.inicios) - np.asarray(atendidos)).max())
+
+    def cargaPendiente(self, indice: int, atendidos: int) -> float:
+        """Tiempo de atención que le queda a la caja cuando ya salieron atendidos clientes"""
+        inicio, fin = self.inicios[indice], self.inicios[indice + 1]
+        if fin == inicio:
+            return 0.0
+        hecho = self.atencionAcumulada[inicio + atendidos - 1] if atendidos else 0.0
+        return float(self.atencionAcumulada[fin - 1] - hecho)
+
+    def articulosEnFila(self, indice: int, atendidos: int, desde: int = 0, hasta: int = None) -> List[int]:
+        """Artículos de los clientes en fila (posiciones desde:hasta contadas desde el frente)"""
+        inicio, fin = self.inicios[indice] + atendidos, self.inicios[indice + 1]
+        if hasta is not None:
+            fin = min(fin, inicio + hasta)
+        return self.articulos[inicio + desde:fin].tolist()
@@ -0,0 +1,158 @@
+import heapq
+import math
+from typing import List
+from models.caja import Caja
+from simulation.generadorDatos import GeneradorDatos
+from simulation.estadisticas import EstadisticasEspera
+
+# Tipos de evento del calendario
+LLEGADA = 0
+INICIO_ATENCION = 1
+SALIDA = 2
+
+class MotorEventos:
+    """
+    Simulación de eventos discretos con calendario de eventos en un heap.
+
+    Los clientes llegan a lo largo de la jornada (proceso de Poisson), eligen una caja válida
+    al azar y esperan su turno. Cada evento se procesa en O(log n) sobre el calendario.
+    """
+    def __init__(self, cajas: List[Caja], clientesPorHora: float, duracion: float,
+                 generador: GeneradorDatos = None, sesgoexpress = True, guardarClientes = True):
+        """
+        Args:
+            cajas: Cajas a simular (se reutilizan los modelos Caja, Cajero y Cliente)
+            clientesPorHora: Tasa promedio de llegada de clientes
+            duracion: Segundos durante los que llegan clientes (12 horas = 43200)
+            generador: Generador de clientes; si no se indica se crea uno nuevo
+            sesgoexpress: Distribución de artículos usada al generar cada cliente
+            guardarClientes: Si es False no se guardan los clientes atendidos en self.atendidos (memoria constante)
+        """
+        self.cajas = cajas
+        self.tasaLlegadas = clientesPorHora / 3600.0  # clientes por segundo
+        self.duracion = duracion
+        self.generador = generador if generador is not None else GeneradorDatos()
+        self.sesgoexpress = sesgoexpress
+        self.guardarClientes = guardarClientes
+
+        self.cajasNormales = [idx for idx, caja in enumerate(cajas) if not caja.esExpress]
+        self.todasLasCajas = list(range(len(cajas)))
+        # límite de artículos de la caja express (si no hay express, todas son normales)
+        self.limiteExpress = next((caja.LIMITE_EXPRESS for caja in cajas if caja.esExpress), 0)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vuelve al inicio de la jornada: reloj, calendario, filas y estadísticas (el generador sigue su secuencia)"""
+        self.reloj = 0.0
+        self.calendario = []  # heap de (tiempo, secuencia, tipo, idxCaja, cliente)
+        self.secuencia = 0  # desempata eventos simultáneos en orden de programación
+
+        self.atendidos = []  # clientes en orden de salida (solo si guardarClientes)
+        self.ocupadas = [False] * len(self.cajas)
+        # la fila de cada caja contiene a los clientes esperando y al que está en atención
+        for caja in self.cajas:
+            caja.tiempoAtencionTotal = 0.0
+            caja.restablecerFila([])
+
+        # Estadísticas acumuladas
+        self.eventosProcesados = 0
+        self.clientesLlegados = 0
+        self.clientesAtendidos = 0
+        self.sumaEspera = 0.0
+        self.sumaTiempoTotal = 0.0
+        self.maximaFila = 0
+        self.esperaPorCaja = [0.0] * len(self.cajas)  # suma de esperas de los atendidos en cada caja
+        self.atendidosPorCaja = [0] * len(self.cajas)
+        self.estadisticasEspera = EstadisticasEspera()  # percentiles e histograma de la espera en fila
+
+    def programarEvento(self, tiempo: float, tipo: int, idxCaja: int = -1, cliente = None):
+        heapq.heappush(self.calendario, (tiempo, self.secuencia, tipo, idxCaja, cliente))
+        self.secuencia += 1
+
+    def ejecutar(self):
+        """Procesa el calendario hasta atender al último cliente y retorna el resumen de esta corrida"""
+        self.reiniciar()
+        if self.tasaLlegadas > 0:
+            self.programarLlegada(self.tiempoEntreLlegadas())
+
+        while self.calendario:
+            tiempo, _, tipo, idxCaja, cliente = heapq.heappop(self.calendario)
+            self.reloj = tiempo
+            self.eventosProcesados += 1
+            if tipo == LLEGADA:
+                self.procesarLlegada()
+            elif tipo == INICIO_ATENCION:
+                self.procesarInicioAtencion(idxCaja)
+            else:
+                self.procesarSalida(idxCaja, cliente)
+        return self.resumen()
+
+    def procesarLlegada(self):
+        cliente = self.generador.generaCliente(self.sesgoexpress)
+        cliente.tiempoLlegada = self.reloj
+        self.clientesLlegados += 1
+
+        # Clientes con pocos artículos pueden usar cualquier caja, el resto solo las normales
+        if cliente.numeroArticulos <= self.limiteExpress:
+            cajas_validas = self.todasLasCajas
+        else:
+            cajas_validas = self.cajasNormales
+        if cajas_validas:
+            idxCaja = cajas_validas[self.generador.indiceAleatorio(len(cajas_validas))]
+            caja = self.cajas[idxCaja]
+            caja.agregarCliente(cliente)
+            self.maximaFila = max(self.maximaFila, len(caja.filaClientes))
+            if not self.ocupadas[idxCaja]:
+                self.ocupadas[idxCaja] = True
+                self.programarEvento(self.reloj, INICIO_ATENCION, idxCaja)
+
+        self.programarLlegada(self.reloj + self.tiempoEntreLlegadas())
+
+    def programarLlegada(self, tiempo: float):
+        # una llegada solo se programa si cae dentro de la jornada
+        if tiempo < self.duracion:
+            self.programarEvento(tiempo, LLEGADA)
+
+    def tiempoEntreLlegadas(self) -> float:
+        # exponencial por transformada inversa sobre los uniformes del generador (reproducible)
+        return -math.log(1.0 - self.generador.uniforme()) / self.tasaLlegadas
+
+    def procesarInicioAtencion(self, idxCaja: int):
+        caja = self.cajas[idxCaja]
+        cliente = caja.filaClientes[0]
+        cliente.tiempoEspera = self.reloj - cliente.tiempoLlegada
+        tiempoAtencion = caja.tiempoAtencionCliente(cliente)
+        self.programarEvento(self.reloj + tiempoAtencion, SALIDA, idxCaja, cliente)
+
+    def procesarSalida(self, idxCaja: int, cliente):
+        caja = self.cajas[idxCaja]
+        caja.atenderSiguiente()
+        cliente.tiempoTotal = self.reloj - cliente.tiempoLlegada
+        caja.tiempoAtencionTotal += caja.tiempoAtencionCliente(cliente)
+
+        self.clientesAtendidos += 1
+        self.sumaEspera += cliente.tiempoEspera
+        self.esperaPorCaja[idxCaja] += cliente.tiempoEspera
+        self.atendidosPorCaja[idxCaja] += 1
+        self.estadisticasEspera.agregar(cliente.tiempoEspera)
+        self.sumaTiempoTotal += cliente.tiempoTotal
+        if self.guardarClientes:
+            self.atendidos.append(cliente)
+
+        if caja.filaClientes:
+            self.programarEvento(self.reloj, INICIO_ATENCION, idxCaja)
+        else:
+            self.ocupadas[idxCaja] = False
+
+    def resumen(self):
+        atendidos = self.clientesAtendidos
+        return {
+            "reloj": self.reloj,
+            "eventos": self.eventosProcesados,
+            "clientesLlegados": self.clientesLlegados,
+            "clientesAtendidos": atendidos,
+            "esperaPromedio": self.sumaEspera / atendidos if atendidos else 0.0,
+            "tiempoTotalPromedio": self.sumaTiempoTotal / atendidos if atendidos else 0.0,
+            "maximaFila": self.maximaFila,
+            "espera": self.estadisticasEspera.resumen(),
+        }
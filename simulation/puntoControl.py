@@ -0,0 +1,63 @@
+import os
+import pickle
+import time
+
+# Puntos de control de corridas largas (flujo, réplicas, barridos). El estado se guarda con pickle
+# en un archivo temporal y se renombra con os.replace: si el proceso muere a mitad de una escritura
+# queda el punto de control anterior intacto. Reanudar desde el último punto da el mismo resultado,
+# bit a bit, que la corrida sin interrumpir, porque se guarda también el estado del generador.
+
+VERSION = 2  # 2: las esperas son tiempoEspera, sin el tiempo de atención
+
+def guardarAtomico(ruta: str, estado: dict):
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        pickle.dump({"version": VERSION, **estado}, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        archivo.flush()
+        os.fsync(archivo.fileno())  # que el rename no llegue al disco antes que los datos
+    os.replace(temporal, ruta)
+
+def cargarEstado(ruta: str):
+    """Estado guardado en ruta, o None si todavía no hay punto de control"""
+    try:
+        with open(ruta, "rb") as archivo:
+            estado = pickle.load(archivo)
+    except FileNotFoundError:
+        return None
+    if estado.get("version") != VERSION:
+        raise ValueError(f"Punto de control con versión no soportada: {estado.get('version')}")
+    return estado
+
+class PuntoControl:
+    """
+    Guarda el estado de una corrida a lo sumo cada intervalo segundos. El que ejecuta pregunta
+    debeGuardar() en cada frontera segura (fin de un bloque o de un lote) y solo entonces arma el estado.
+    """
+    def __init__(self, ruta: str, intervalo: float = 5.0):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.ultimo = time.monotonic()
+        self.guardados = 0
+
+    def cargar(self, tipo: str, parametros: dict):
+        """
+        Estado guardado por una corrida del mismo tipo y con los mismos parámetros, o None.
+        Reanudar con otros parámetros daría resultados mezclados, así que se rechaza.
+        """
+        estado = cargarEstado(self.ruta)
+        if estado is None:
+            return None
+        if estado.get("tipo") != tipo or estado.get("parametros") != parametros:
+            raise ValueError(f"{self.ruta} es el punto de control de otra corrida ({estado.get('tipo')})")
+        return estado
+
+    def debeGuardar(self) -> bool:
+        return time.monotonic() - self.ultimo >= self.intervalo
+
+    def guardar(self, tipo: str, parametros: dict, **estado):
+        guardarAtomico(self.ruta, {"tipo": tipo, "parametros": parametros, **estado})
+        self.ultimo = time.monotonic()
+        self.guardados += 1
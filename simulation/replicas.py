@@ -0,0 +1,208 @@
+import argparse
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+import numpy as np
+
+from simulation.simulacion import POSICIONES_EXPRESS, ConfiguracionSimulacion, Simulacion
+from simulation.estadisticas import EstadisticasEspera, Welford
+from simulation.puntoControl import PuntoControl
+
+LOTE_PUNTO_CONTROL = 50  # réplicas por lote como máximo cuando hay punto de control
+
+def ejecutarReplica(num_cajeros: int, num_clientes: int, posicion_express: str, semilla):
+    """
+    Ejecuta una réplica de la simulación y retorna solo un resumen compacto.
+    Cada réplica siembra su propio flujo aleatorio para ser reproducible e independiente.
+    """
+    resultado = Simulacion(ConfiguracionSimulacion(num_cajeros, num_clientes, posicion_express, semilla)).ejecutar()
+    cajas, clientes = resultado.cajas, resultado.clientes
+
+    tiemposCaja = [caja.tiempoAtencionTotal for caja in cajas]
+    esperaPromedioCaja = [
+        sum(cliente.tiempoEspera for cliente in caja.filaClientes) / len(caja.filaClientes)
+        if caja.filaClientes else 0.0
+        for caja in cajas
+    ]
+    # percentiles combinables entre réplicas y procesos, sin enviar los tiempos de cada cliente
+    estadisticasEspera = EstadisticasEspera()
+    estadisticasEspera.agregarBloque(np.fromiter((cliente.tiempoEspera for cliente in clientes),
+                                                 dtype=np.float64, count=len(clientes)))
+    return {
+        "posicion": posicion_express,
+        "idxExpress": next((idx for idx, caja in enumerate(cajas) if caja.esExpress), -1),
+        "tiemposCaja": tiemposCaja,
+        "esperaPromedioCaja": esperaPromedioCaja,
+        "esperaPromedio": sum(cliente.tiempoEspera for cliente in clientes) / len(clientes) if clientes else 0.0,
+        "estadisticasEspera": estadisticasEspera,
+    }
+
+def ejecutarLote(tareas):
+    """Ejecuta varias réplicas en un mismo proceso para amortizar el costo de comunicación"""
+    return [ejecutarReplica(*tarea) for tarea in tareas]
+
+def resumirMuestra(acumulador: Welford, confianza: float = 0.95):
+    """Media, varianza muestral e intervalo de confianza (aproximación normal) de una muestra acumulada"""
+    n = acumulador.cantidad
+    varianza = acumulador.varianza()
+    z = statistics.NormalDist().inv_cdf(0.5 + confianza / 2)
+    semiancho = z * (varianza / n) ** 0.5 if n > 1 else 0.0
+    return {"n": n, "media": acumulador.media, "varianza": varianza,
+            "icInferior": acumulador.media - semiancho, "icSuperior": acumulador.media + semiancho}
+
+class AcumuladoPosicion:
+    """
+    Réplicas de una posición express resumidas en línea: Welford por caja y EstadisticasEspera de
+    todos los clientes. Su tamaño no crece con el número de réplicas, así un punto de control
+    cuesta lo mismo al principio que al final de la corrida.
+    """
+    def __init__(self):
+        self.esperaPromedio = Welford()
+        self.tiemposCaja = []
+        self.esperasCaja = []
+        self.estadisticasEspera = EstadisticasEspera()
+
+    @property
+    def replicas(self) -> int:
+        return self.esperaPromedio.cantidad
+
+    def agregar(self, resultado: dict):
+        if not self.tiemposCaja:
+            self.tiemposCaja = [Welford() for _ in resultado["tiemposCaja"]]
+            self.esperasCaja = [Welford() for _ in resultado["esperaPromedioCaja"]]
+        self.esperaPromedio.agregar(resultado["esperaPromedio"])
+        for acumulador, valor in zip(self.tiemposCaja, resultado["tiemposCaja"]):
+            acumulador.agregar(valor)
+        for acumulador, valor in zip(self.esperasCaja, resultado["esperaPromedioCaja"]):
+            acumulador.agregar(valor)
+        self.estadisticasEspera.combinar(resultado["estadisticasEspera"])
+
+def acumularResultados(resultados: List[dict], acumulados: dict = None) -> dict:
+    """Agrega cada resultado, en orden, al AcumuladoPosicion de su posición express"""
+    acumulados = acumulados if acumulados is not None else {}
+    for r in resultados:
+        acumulados.setdefault(r["posicion"], AcumuladoPosicion()).agregar(r)
+    return acumulados
+
+def resumirAcumulados(acumulados: dict, confianza: float = 0.95):
+    """Estadísticas por posición express y por caja a partir de los acumulados"""
+    return {
+        posicion: {
+            "replicas": acumulado.replicas,
+            "esperaPromedio": resumirMuestra(acumulado.esperaPromedio, confianza),
+            "esperaClientes": acumulado.estadisticasEspera.resumen(),  # todos los clientes de todas las réplicas
+            "cajas": [
+                {
+                    "idCaja": idx + 1,
+                    "tiempoAtencionTotal": resumirMuestra(tiempo, confianza),
+                    "esperaPromedio": resumirMuestra(espera, confianza),
+                }
+                for idx, (tiempo, espera) in enumerate(zip(acumulado.tiemposCaja, acumulado.esperasCaja))
+            ],
+        }
+        for posicion, acumulado in acumulados.items()
+    }
+
+def agregarResultados(resultados: List[dict], confianza: float = 0.95):
+    """Agrupa los resúmenes por posición express y calcula estadísticas por caja"""
+    return resumirAcumulados(acumularResultados(resultados), confianza)
+
+def ejecutarReplicas(num_cajeros: int, num_clientes: int, posiciones: List[str], num_replicas: int,
+                     semilla: int = None, procesos: int = None, confianza: float = 0.95,
+                     puntoControl: PuntoControl = None):
+    """
+    Ejecuta num_replicas réplicas por cada posición express en un pool de procesos.
+
+    Args:
+        num_cajeros: Número de cajeros por réplica
+        num_clientes: Número de clientes por réplica
+        posiciones: Posiciones de la caja express a comparar
+        num_replicas: Réplicas por posición
+        semilla: Semilla raíz; cada réplica recibe un flujo independiente derivado de ella
+        procesos: Número de procesos (por defecto, todos los núcleos)
+        confianza: Nivel de confianza de los intervalos
+        puntoControl: Si se indica, guarda cada tanto los acumulados de las réplicas terminadas y
+            continúa desde ellos si ya estaban guardados para los mismos parámetros
+    """
+    procesos = procesos or os.cpu_count() or 1
+    raiz = np.random.SeedSequence(semilla)
+    acumulados = {}
+    terminadas = 0
+    if puntoControl is not None:
+        parametros = {"cajeros": num_cajeros, "clientes": num_clientes, "posiciones": list(posiciones),
+                      "replicas": num_replicas, "semilla": semilla}
+        estado = puntoControl.cargar("replicas", parametros)
+        if estado is not None:
+            raiz = np.random.SeedSequence(estado["entropia"])  # misma raíz aunque semilla sea None
+            acumulados, terminadas = estado["acumulados"], estado["terminadas"]
+
+    # SeedSequence deriva flujos estadísticamente independientes para cada réplica
+    hijas = raiz.spawn(num_replicas * len(posiciones))
+    tareas = [
+        (num_cajeros, num_clientes, posicion, hijas[i * num_replicas + r])
+        for i, posicion in enumerate(posiciones)
+        for r in range(num_replicas)
+    ][terminadas:]
+
+    # Lotes grandes para que cada proceso trabaje sin esperar al proceso principal
+    tamanoLote = max(1, len(tareas) // (procesos * 4))
+    if puntoControl is not None:
+        tamanoLote = min(tamanoLote, LOTE_PUNTO_CONTROL)  # lotes cortos: se pierde poco al interrumpir
+    lotes = [tareas[i:i + tamanoLote] for i in range(0, len(tareas), tamanoLote)]
+
+    def recibir(parcial):
+        # se acumula en el orden de las réplicas, igual que sin punto de control
+        nonlocal terminadas
+        acumularResultados(parcial, acumulados)
+        terminadas += len(parcial)
+        if puntoControl is not None and (puntoControl.debeGuardar() or terminadas == len(hijas)):
+            puntoControl.guardar("replicas", parametros, entropia=raiz.entropy, terminadas=terminadas,
+                                 acumulados=acumulados)
+
+    if procesos == 1:
+        for lote in lotes:
+            recibir(ejecutarLote(lote))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for parcial in pool.map(ejecutarLote, lotes):
+                recibir(parcial)
+    return resumirAcumulados(acumulados, confianza)
+
+def imprimirAgregado(agregado):
+    for posicion, datos in agregado.items():
+        espera = datos["esperaPromedio"]
+        print(f"=== Posición express: {posicion} ({datos['replicas']} réplicas) ===")
+        print(f"Espera promedio por cliente: {espera['media']:.2f}s "
+              f"IC [{espera['icInferior']:.2f}, {espera['icSuperior']:.2f}]")
+        clientes = datos["esperaClientes"]
+        if clientes["cantidad"]:
+            print(f"Espera por cliente: p50 {clientes['p50']:.2f}s | p90 {clientes['p90']:.2f}s | "
+                  f"p95 {clientes['p95']:.2f}s | p99 {clientes['p99']:.2f}s | máximo {clientes['maximo']:.2f}s")
+        for caja in datos["cajas"]:
+            tiempo = caja["tiempoAtencionTotal"]
+            print(f"  Caja {caja['idCaja']}: tiempo total {tiempo['media']:.2f}s "
+                  f"(var {tiempo['varianza']:.2f}, IC [{tiempo['icInferior']:.2f}, {tiempo['icSuperior']:.2f}])")
+        print()
+
+def crearParser():
+    parser = argparse.ArgumentParser(description="Réplicas Monte Carlo de la simulación de supermercado")
+    parser.add_argument("--cajeros", type=int, default=5)
+    parser.add_argument("--clientes", type=int, default=25)
+    parser.add_argument("--posiciones", nargs="+", default=["primera"], choices=POSICIONES_EXPRESS)
+    parser.add_argument("--replicas", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--confianza", type=float, default=0.95)
+    parser.add_argument("--punto-control", metavar="RUTA",
+                        help="guardar las réplicas terminadas y, si RUTA ya existe, continuar desde ahí")
+    parser.add_argument("--intervalo-control", type=float, default=5.0, help="segundos entre puntos de control")
+    return parser
+
+if __name__ == "__main__":
+    args = crearParser().parse_args()
+    puntoControl = PuntoControl(args.punto_control, args.intervalo_control) if args.punto_control else None
+    agregado = ejecutarReplicas(args.cajeros, args.clientes, args.posiciones, args.replicas,
+                                semilla=args.semilla, procesos=args.procesos, confianza=args.confianza,
+                                puntoControl=puntoControl)
+    imprimirAgregado(agregado)
@@ -0,0 +1,116 @@
+import json
+import os
+from contextlib import ExitStack
+from typing import List
+import numpy as np
+from models.caja import Caja
+from models.almacenClientes import AlmacenClientes
+from simulation import instrumentacion
+
+# Escritura de resultados: resumen corto en consola y exportación en bloque (CSV, JSONL, .npz)
+# a partir de los datos columnares, sin formatear un print por cliente.
+
+FORMATOS = ("csv", "jsonl", "npz")
+FILAS_POR_BLOQUE = 100_000  # filas que se formatean antes de cada escritura
+
+def columnasCajas(cajas: List[Caja]):
+    """Datos por caja como arreglos alineados"""
+    return {
+        "idCaja": np.array([caja.idCaja for caja in cajas], dtype=np.int32),
+        "esExpress": np.array([caja.esExpress for caja in cajas], dtype=bool),
+        "experiencia": np.array([caja.cajero.experiencia for caja in cajas], dtype=bool),
+        "tiempoEscaneoPorArticulo": np.array([caja.cajero.tiempoEscaneoPorArticulo for caja in cajas], dtype=np.int16),
+        "tiempoCobro": np.array([caja.cajero.tiempoCobro for caja in cajas], dtype=np.int16),
+        "clientes": np.array([len(caja.filaClientes) for caja in cajas], dtype=np.int64),
+        "tiempoAtencionTotal": np.array([caja.tiempoAtencionTotal for caja in cajas], dtype=np.float64),
+    }
+
+def imprimirResumen(cajas: List[Caja], totalClientes: int):
+    """Modo consola de solo resumen: una línea por caja, sin detalle de clientes"""
+    with instrumentacion.medir("impresion"):
+        print("=== RESUMEN DE LA SIMULACIÓN ===")
+        normales = sum(1 for caja in cajas if not caja.esExpress)
+        print(f"Total de clientes: {totalClientes} | Cajas: {len(cajas)} ({normales} normales, "
+              f"{len(cajas) - normales} express)")
+        for caja in cajas:
+            tipo_caja = "Express" if caja.esExpress else "Normal"
+            print(f"  Caja {caja.idCaja} ({tipo_caja}): {len(caja.filaClientes)} clientes, "
+                  f"{caja.tiempoAtencionTotal:.2f}s")
+        if cajas:
+            caja_mas_rapida = min(cajas, key=lambda caja: caja.tiempoAtencionTotal)
+            print(f"Caja más rápida: Caja {caja_mas_rapida.idCaja} ({caja_mas_rapida.tiempoAtencionTotal:.2f}s)")
+
+# formato de cada línea por cliente: sufijo del archivo, encabezado y plantilla de str.format
+LINEAS_CLIENTE = {
+    "csv": ("_clientes.csv", "cliente,idCaja,numeroArticulos,tiempoEspera,tiempoTotal\n", "{},{},{},{!r},{!r}\n"),
+    "jsonl": ("_clientes.jsonl", "", '{{"cliente": {}, "idCaja": {}, "numeroArticulos": {}, '
+                                    '"tiempoEspera": {!r}, "tiempoTotal": {!r}}}\n'),
+}
+
+def bloquesClientes(almacen: AlmacenClientes, idCajas: np.ndarray):
+    """Filas por cliente con tipos de Python, de a FILAS_POR_BLOQUE (idCaja 0 = sin asignar)"""
+    idCaja = np.where(almacen.caja >= 0, idCajas[np.maximum(almacen.caja, 0)], 0)
+    for inicio in range(0, len(almacen), FILAS_POR_BLOQUE):
+        fin = min(inicio + FILAS_POR_BLOQUE, len(almacen))
+        yield list(zip(range(inicio, fin), idCaja[inicio:fin].tolist(), almacen.numeroArticulos[inicio:fin].tolist(),
+                       almacen.tiempoEspera[inicio:fin].tolist(), almacen.tiempoTotal[inicio:fin].tolist()))
+
+def exportarClientes(rutaBase: str, almacen: AlmacenClientes, idCajas: np.ndarray, formatos):
+    """Una sola pasada por los clientes: cada bloque se convierte una vez y se escribe en todos los formatos de texto"""
+    formatos = [formato for formato in formatos if formato in LINEAS_CLIENTE]
+    if not formatos:
+        return
+    with ExitStack() as archivos:
+        salidas = []
+        for formato in formatos:
+            sufijo, encabezado, linea = LINEAS_CLIENTE[formato]
+            archivo = archivos.enter_context(open(rutaBase + sufijo, "w", encoding="utf-8", buffering=1 << 20))
+            archivo.write(encabezado)
+            salidas.append((archivo, linea))
+        for filas in bloquesClientes(almacen, idCajas):
+            for archivo, linea in salidas:
+                archivo.write("".join(linea.format(*fila) for fila in filas))
+
+def exportarCajas(rutaBase: str, columnas: dict, formatos):
+    nombres = list(columnas)
+    filas = list(zip(*(columnas[nombre].tolist() for nombre in nombres)))
+    if "csv" in formatos:
+        with open(f"{rutaBase}_cajas.csv", "w", encoding="utf-8") as archivo:
+            archivo.write(",".join(nombres) + "\n")
+            archivo.writelines(",".join(str(valor) for valor in fila) + "\n" for fila in filas)
+    if "jsonl" in formatos:
+        with open(f"{rutaBase}_cajas.jsonl", "w", encoding="utf-8") as archivo:
+            archivo.writelines(json.dumps(dict(zip(nombres, fila))) + "\n" for fila in filas)
+
+def exportarNPZ(rutaBase: str, almacen: AlmacenClientes, columnas: dict):
+    """Un solo archivo comprimido con las columnas de clientes y cajas (prefijo caja_)"""
+    columnas = {f"caja_{nombre}": valores for nombre, valores in columnas.items()}
+    np.savez_compressed(f"{rutaBase}.npz", numeroArticulos=almacen.numeroArticulos, caja=almacen.caja,
+                        tiempoEspera=almacen.tiempoEspera, tiempoTotal=almacen.tiempoTotal, **columnas)
+
+def exportarResultados(rutaBase: str, cajas: List[Caja], almacen: AlmacenClientes = None,
+                       formatos = FORMATOS):
+    """
+    Exporta los resultados por cliente y por caja en los formatos pedidos. Los clientes se
+    recorren una sola vez para todos los formatos de texto; el .npz guarda las columnas tal cual.
+
+    Args:
+        rutaBase: Ruta sin extensión; se agregan sufijos como _clientes.csv o .npz (el directorio se crea si falta)
+        cajas: Cajas de la simulación
+        almacen: Datos columnares de clientes; si no se indica se construyen desde las filas de las cajas
+        formatos: Subconjunto de ("csv", "jsonl", "npz")
+    """
+    directorio = os.path.dirname(rutaBase)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    almacen = almacen if almacen is not None else AlmacenClientes.desdeCajas(cajas)
+    columnas = columnasCajas(cajas)
+    exportarClientes(rutaBase, almacen, columnas["idCaja"], formatos)
+    exportarCajas(rutaBase, columnas, formatos)
+    if "npz" in formatos:
+        exportarNPZ(rutaBase, almacen, columnas)
+
+def cargarNPZ(ruta: str):
+    """Carga un .npz exportado como diccionario de arreglos"""
+    with np.load(ruta) as datos:
+        return {nombre: datos[nombre] for nombre in datos.files}
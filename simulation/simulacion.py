@@ -0,0 +1,130 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from models.caja import Caja
+from models.cliente import Cliente
+from simulation.asignacion import asignarClientes
+from simulation.generadorDatos import GeneradorDatos
+from simulation.lineaTiempo import LineaTiempo
+from simulation import instrumentacion
+
+POSICIONES_EXPRESS = ["primera", "medio", "ultima", "aleatoria"]
+FLUJOS = ("cajeros", "posicion", "clientes", "asignacion")  # un generador independiente por tipo de sorteo
+
+@dataclass
+class ConfiguracionSimulacion:
+    """Parámetros de una corrida; la misma configuración con la misma semilla da el mismo resultado"""
+    numeroCajeros: int = 5
+    numeroClientes: int = 25
+    posicionExpress: str = "primera"  # "primera", "medio", "ultima", "aleatoria"
+    semilla: object = None  # entero, SeedSequence o None
+    sesgoexpress: bool = True
+    vectorizado: bool = False  # usar calcularTiempoAtencionVectorizado en cada caja
+    limiteExpress: int = 10  # artículos máximos para usar la caja express
+    probabilidadExperiencia: float = 0.5  # proporción esperada de cajeros con experiencia
+    antitetico: bool = False  # usar 1 - u en todos los sorteos (par antitético de la misma semilla)
+    lineaTiempo: bool = False  # armar el índice de salidas por caja (para recorrer la jornada en la interfaz)
+
+@dataclass
+class ResultadoSimulacion:
+    configuracion: ConfiguracionSimulacion
+    cajas: List[Caja]
+    clientes: List[Cliente]
+    tiemposFase: Dict[str, float] = field(default_factory=dict)  # segundos por fase
+    lineaTiempo: Optional[LineaTiempo] = None  # solo si configuracion.lineaTiempo
+
+def indicePosicionExpress(posicionExpress: str, numeroCajeros: int, generador: GeneradorDatos):
+    """Posición (desde 0) de la caja express, o None si la posición no es válida"""
+    if posicionExpress == "primera":
+        return 0
+    elif posicionExpress == "medio":
+        return numeroCajeros // 2  # Posición central
+    elif posicionExpress == "ultima":
+        return numeroCajeros - 1
+    elif posicionExpress == "aleatoria":
+        return generador.indiceAleatorio(numeroCajeros)
+    return None
+
+class SimulacionCancelada(Exception):
+    """La simulación se detuvo antes de terminar (por ejemplo, con DETENER en la interfaz)"""
+
+class Simulacion:
+    """
+    Núcleo de la simulación compartido por la consola, la interfaz y las herramientas en lote:
+    genera cajeros y clientes, arma las cajas, asigna clientes y calcula tiempos.
+    Cada fase se cronometra en ResultadoSimulacion.tiemposFase (y en instrumentacion si está activa).
+    """
+    def __init__(self, configuracion: ConfiguracionSimulacion, cancelacion=None, progreso=None):
+        """
+        Args:
+            configuracion: Parámetros de la corrida
+            cancelacion: threading.Event opcional; si se activa, la corrida lanza SimulacionCancelada
+            progreso: Función opcional que recibe el nombre de cada fase al empezar
+        """
+        self.configuracion = configuracion
+        self.tiemposFase = {}
+        self.cancelacion = cancelacion
+        self.progreso = progreso
+
+    def revisarCancelacion(self):
+        if self.cancelacion is not None and self.cancelacion.is_set():
+            raise SimulacionCancelada()
+
+    @contextmanager
+    def fase(self, nombre: str):
+        self.revisarCancelacion()
+        if self.progreso is not None:
+            self.progreso(nombre)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.tiemposFase[nombre] = self.tiemposFase.get(nombre, 0.0) + duracion
+            if instrumentacion.activa:
+                instrumentacion.registrar(f"fase.{nombre}", duracion)
+
+    def generadores(self) -> Dict[str, GeneradorDatos]:
+        """
+        Generadores de cada tipo de sorteo (FLUJOS). Con la misma semilla, configuraciones distintas
+        reciben los mismos cajeros, clientes y sorteos de asignación (números aleatorios comunes).
+        """
+        flujos = GeneradorDatos.subflujos(self.configuracion.semilla, len(FLUJOS), self.configuracion.antitetico)
+        return dict(zip(FLUJOS, flujos))
+
+    def ejecutar(self) -> ResultadoSimulacion:
+        configuracion = self.configuracion
+        self.tiemposFase = {}
+        generadores = self.generadores()
+
+        with self.fase("cajeros"):
+            cajeros = generadores["cajeros"].generarCajeros(configuracion.numeroCajeros,
+                                                            configuracion.probabilidadExperiencia)
+
+        with self.fase("cajas"):
+            posicion = indicePosicionExpress(configuracion.posicionExpress, configuracion.numeroCajeros,
+                                             generadores["posicion"])
+            cajas = [Caja(idCaja=i + 1, cajero=cajeros[i], esExpress=(i == posicion),
+                          limiteExpress=configuracion.limiteExpress)
+                     for i in range(configuracion.numeroCajeros)]
+
+        with self.fase("clientes"):
+            clientes = generadores["clientes"].generaClientes(configuracion.numeroClientes, configuracion.sesgoexpress,
+                                                              self.revisarCancelacion)
+
+        with self.fase("asignacion"):
+            asignarClientes(cajas, clientes, generadores["asignacion"], self.revisarCancelacion)
+
+        with self.fase("tiempos"):
+            for caja in cajas:
+                self.revisarCancelacion()
+                with instrumentacion.medir("calcularTiempoAtencion"):
+                    caja.calcularTiempoAtencion(configuracion.vectorizado)
+
+        lineaTiempo = None
+        if configuracion.lineaTiempo:
+            with self.fase("lineaTiempo"):
+                lineaTiempo = LineaTiempo.desdeCajas(cajas)
+
+        return ResultadoSimulacion(configuracion, cajas, clientes, dict(self.tiemposFase), lineaTiempo)
@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import struct
+from dataclasses import asdict, is_dataclass
+from typing import Iterator, List
+import numpy as np
+from models.caja import Caja
+from models.cajero import Cajero
+from models.almacenClientes import AlmacenClientes
+from simulation.estadisticas import EstadisticasEspera
+from simulation.flujo import TAMANO_BLOQUE, SumideroEstadisticas
+from simulation.lineaTiempo import LineaTiempo
+
+# Traza binaria por cliente para auditar corridas que no caben en memoria como objetos.
+# Formato: MAGICO (8 bytes) | versión y largo del encabezado (2 x uint32, little endian) |
+# encabezado JSON (configuración, semilla y cajas) rellenado hasta múltiplo de ALINEACION |
+# registros de tamaño fijo REGISTRO, uno por cliente en el orden en que se atendieron.
+# La cantidad de registros sale del tamaño del archivo, así el encabezado no se reescribe al cerrar.
+
+MAGICO = b"SUPTRAZA"
+VERSION = 1
+ALINEACION = 64
+REGISTRO = np.dtype([
+    ("caja", "<i4"),             # posición de la caja (desde 0)
+    ("numeroArticulos", "<i2"),
+    ("tiempoEspera", "<f8"),
+    ("tiempoTotal", "<f8"),
+])
+
+def encabezadoCajas(cajas: List[Caja]) -> dict:
+    return {
+        "idCaja": [caja.idCaja for caja in cajas],
+        "esExpress": [caja.esExpress for caja in cajas],
+        "experiencia": [caja.cajero.experiencia for caja in cajas],
+        "tiempoCobro": [caja.cajero.tiempoCobro for caja in cajas],
+        "limiteExpress": [caja.LIMITE_EXPRESS for caja in cajas],
+    }
+
+def verificarEncabezado(ruta: str, encabezado: bytes):
+    with open(ruta, "rb") as archivo:
+        if archivo.read(len(encabezado)) != encabezado:
+            raise ValueError(f"{ruta} es la traza de otra corrida")
+
+class EscritorTraza:
+    """
+    Escribe una traza por bloques. Todo va a ruta + ".tmp" y se renombra con os.replace al cerrar,
+    así nunca queda una traza a medias con el nombre definitivo.
+    """
+    def __init__(self, ruta: str, cajas: List[Caja], configuracion=None, reanudar: bool = False):
+        """
+        Args:
+            ruta: Archivo de destino
+            cajas: Cajas de la corrida (se guardan en el encabezado para reconstruirlas)
+            configuracion: ConfiguracionSimulacion o diccionario con los parámetros y la semilla
+            reanudar: Continuar la traza a medias (o ya cerrada) de una corrida con el mismo encabezado;
+                si la corrida se interrumpe, el .tmp se conserva para la próxima vez
+        """
+        self.ruta = ruta
+        self.temporal = ruta + ".tmp"
+        self.cantidad = 0
+        self.reanudar = reanudar
+        if is_dataclass(configuracion):
+            configuracion = asdict(configuracion)
+        encabezado = json.dumps({
+            "configuracion": configuracion or {},
+            "cajas": encabezadoCajas(cajas),
+            "registro": REGISTRO.descr,
+        }, default=repr).encode("utf-8")  # una semilla SeedSequence queda como su repr
+        relleno = -(len(MAGICO) + 8 + len(encabezado)) % ALINEACION
+        encabezado += b" " * relleno
+        encabezado = MAGICO + struct.pack("<II", VERSION, len(encabezado)) + encabezado
+        self.inicio = len(encabezado)
+
+        if reanudar and not os.path.exists(self.temporal) and os.path.exists(ruta):
+            verificarEncabezado(ruta, encabezado)  # antes de moverla: si es de otra corrida queda donde estaba
+            os.replace(ruta, self.temporal)  # la corrida ya había terminado: se vuelve a abrir
+        if reanudar and os.path.exists(self.temporal):
+            verificarEncabezado(self.temporal, encabezado)
+            self.archivo = open(self.temporal, "r+b", buffering=1 << 20)
+            self.cantidad = (os.path.getsize(self.temporal) - self.inicio) // REGISTRO.itemsize
+            self.truncar(self.cantidad)
+        else:
+            self.archivo = open(self.temporal, "wb", buffering=1 << 20)
+            self.archivo.write(encabezado)
+
+    def agregar(self, posicionCaja: np.ndarray, numeroArticulos: np.ndarray, tiempoEspera: np.ndarray,
+                tiempoTotal: np.ndarray):
+        """Agrega un bloque de clientes; dentro de cada caja deben venir en orden FIFO"""
+        bloque = np.empty(len(posicionCaja), dtype=REGISTRO)
+        bloque["caja"] = posicionCaja
+        bloque["numeroArticulos"] = numeroArticulos
+        bloque["tiempoEspera"] = tiempoEspera
+        bloque["tiempoTotal"] = tiempoTotal
+        self.archivo.write(bloque.tobytes())
+        self.cantidad += len(bloque)
+
+    def agregarAlmacen(self, almacen: AlmacenClientes):
+        """Agrega los clientes asignados de un almacén columnar"""
+        asignados = almacen.caja != AlmacenClientes.SIN_CAJA
+        self.agregar(almacen.caja[asignados], almacen.numeroArticulos[asignados],
+                     almacen.tiempoEspera[asignados], almacen.tiempoTotal[asignados])
+
+    def truncar(self, cantidad: int):
+        """Descarta los registros posteriores a los primeros cantidad (los escritos tras el último punto de control)"""
+        if cantidad > self.cantidad:
+            raise ValueError(f"La traza tiene {self.cantidad} registros y se pidieron {cantidad}")
+        self.archivo.flush()
+        self.archivo.truncate(self.inicio + cantidad * REGISTRO.itemsize)
+        self.archivo.seek(0, os.SEEK_END)
+        self.cantidad = cantidad
+
+    def sincronizar(self):
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+
+    def cerrar(self):
+        self.archivo.close()
+        os.replace(self.temporal, self.ruta)
+
+    def descartar(self):
+        self.archivo.close()
+        os.remove(self.temporal)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        elif self.reanudar:
+            self.archivo.close()
+        else:
+            self.descartar()
+
+def escribirTraza(ruta: str, cajas: List[Caja], configuracion=None):
+    """Traza de una corrida ya calculada (las filas de las cajas con sus tiempos)"""
+    with EscritorTraza(ruta, cajas, configuracion) as escritor:
+        escritor.agregarAlmacen(AlmacenClientes.desdeCajas(cajas))
+
+class Traza:
+    """
+    Lectura de una traza con numpy.memmap: los registros no se cargan en memoria, cortar devuelve
+    vistas sin copia y las agregaciones recorren el archivo por bloques.
+    """
+    def __init__(self, ruta: str):
+        with open(ruta, "rb") as archivo:
+            if archivo.read(len(MAGICO)) != MAGICO:
+                raise ValueError(f"{ruta} no es una traza de simulación")
+            version, largo = struct.unpack("<II", archivo.read(8))
+            if version != VERSION:
+                raise ValueError(f"Versión de traza no soportada: {version}")
+            encabezado = json.loads(archivo.read(largo))
+
+        inicio = len(MAGICO) + 8 + largo
+        cantidad = (os.path.getsize(ruta) - inicio) // REGISTRO.itemsize  # un registro cortado se ignora
+        self.ruta = ruta
+        self.configuracion = encabezado["configuracion"]
+        self.columnasCajas = encabezado["cajas"]
+        if cantidad:
+            self.registros = np.memmap(ruta, dtype=REGISTRO, mode="r", offset=inicio, shape=(cantidad,))
+        else:
+            self.registros = np.empty(0, dtype=REGISTRO)  # memmap no acepta archivos sin datos
+
+    def __len__(self):
+        return len(self.registros)
+
+    def __getitem__(self, clave):
+        """Registros o columnas (traza["tiempoEspera"], traza[1000:2000]) como vistas del archivo"""
+        return self.registros[clave]
+
+    @property
+    def numeroCajas(self) -> int:
+        return len(self.columnasCajas["idCaja"])
+
+    def bloques(self, tamanoBloque: int = TAMANO_BLOQUE) -> Iterator[np.ndarray]:
+        for inicio in range(0, len(self.registros), tamanoBloque):
+            yield self.registros[inicio:inicio + tamanoBloque]
+
+    def cajas(self, tamanoBloque: int = TAMANO_BLOQUE) -> List[Caja]:
+        """
+        Cajas de la corrida sin clientes en fila; tiempoAtencionTotal es la última salida de cada una
+        (la fila empieza llena en el instante 0, así que coincide con el trabajo atendido).
+        """
+        cajas = [Caja(idCaja, Cajero(experiencia, tiempoCobro), esExpress, limiteExpress=limite)
+                 for idCaja, esExpress, experiencia, tiempoCobro, limite in zip(
+                     *(self.columnasCajas[nombre] for nombre in
+                       ("idCaja", "esExpress", "experiencia", "tiempoCobro", "limiteExpress")))]
+        ultima = np.zeros(len(cajas))
+        for bloque in self.bloques(tamanoBloque):
+            np.maximum.at(ultima, bloque["caja"], bloque["tiempoTotal"])
+        for caja, tiempo in zip(cajas, ultima.tolist()):
+            caja.tiempoAtencionTotal = tiempo
+        return cajas
+
+    def sumidero(self, tamanoBloque: int = TAMANO_BLOQUE) -> SumideroEstadisticas:
+        """Tiempo total por caja y percentiles de espera, lo mismo que retorna ejecutarFlujo"""
+        sumidero = SumideroEstadisticas(self.numeroCajas)
+        for bloque in self.bloques(tamanoBloque):
+            sumidero.agregar(bloque["caja"], bloque["tiempoTotal"], bloque["tiempoEspera"])
+        return sumidero
+
+    def estadisticas(self, campo: str = "tiempoEspera", tamanoBloque: int = TAMANO_BLOQUE) -> EstadisticasEspera:
+        """Media, desviación, percentiles e histograma de una columna de tiempos"""
+        estadisticas = EstadisticasEspera()
+        for bloque in self.bloques(tamanoBloque):
+            estadisticas.agregarBloque(bloque[campo])
+        return estadisticas
+
+    def lineaTiempo(self, inicio: int = 0, fin: int = None) -> LineaTiempo:
+        """
+        Línea de tiempo de los registros inicio:fin para la interfaz. Solo se leen las columnas
+        de ese tramo; para trazas enormes conviene reproducir un tramo y no el archivo completo.
+        """
+        registros = self.registros[inicio:fin]
+        return LineaTiempo.desdeColumnas(self.cajas(), registros["caja"], registros["numeroArticulos"],
+                                         registros["tiempoTotal"])
+
+def crearParser():
+    parser = argparse.ArgumentParser(prog="python -m simulation.traza", description="Resumen de una traza binaria")
+    parser.add_argument("ruta")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="registros por bloque al recorrer")
+    parser.add_argument("--gui", action="store_true", help="reproducir la traza en la interfaz gráfica")
+    parser.add_argument("--desde", type=int, default=0, help="primer registro a reproducir con --gui")
+    parser.add_argument("--hasta", type=int, default=None, help="registro final (excluido) con --gui")
+    return parser
+
+if __name__ == "__main__":
+    args = crearParser().parse_args()
+    traza = Traza(args.ruta)
+    print(f"=== TRAZA {args.ruta} ===")
+    print(f"Registros: {len(traza)} | Cajas: {traza.numeroCajas}")
+    print(f"Configuración: {json.dumps(traza.configuracion)}")
+    sumidero = traza.sumidero(args.bloque)
+    for idCaja, cantidad, media, maximo in zip(traza.columnasCajas["idCaja"], sumidero.cantidad.tolist(),
+                                               sumidero.media.tolist(), sumidero.maximo.tolist()):
+        if cantidad:
+            print(f"  Caja {idCaja}: {cantidad} clientes, tiempo total medio {media:.2f}s, máximo {maximo:.2f}s")
+    espera = traza.estadisticas("tiempoEspera", args.bloque).resumen()
+    if espera["cantidad"]:
+        print(f"Espera: media {espera['media']:.2f}s | p50 {espera['p50']:.1f}s | p90 {espera['p90']:.1f}s | "
+              f"p99 {espera['p99']:.1f}s | máx {espera['maximo']:.1f}s")
+
+    if args.gui:
+        from display.interfaz import iniciar_interfaz_con_traza
+        iniciar_interfaz_con_traza(traza.lineaTiempo(args.desde, args.hasta))
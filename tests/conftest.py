@@ -0,0 +1,5 @@
+import os
+import sys
+
+# las pruebas importan los módulos del proyecto (models, simulation, display) desde la raíz
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
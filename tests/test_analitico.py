@@ -0,0 +1,20 @@
+import math
+from simulation.analitico import errorRelativo, estimarConfiguracion, ordenarConfiguraciones
+from simulation.simulacion import ConfiguracionSimulacion
+
+def test_ordenarConfiguracionesDejaLasSaturadasAlFinalPorUtilizacion():
+    configuraciones = [ConfiguracionSimulacion(numeroCajeros=n, posicionExpress=posicion, semilla=[3, 0])
+                       for n in (2, 3, 4, 6) for posicion in ("primera", "ultima")]
+    ordenadas = ordenarConfiguraciones(configuraciones, clientesPorHora=60)
+    esperas = [espera for _, espera in ordenadas]
+    finitas = [espera for espera in esperas if math.isfinite(espera)]
+    assert finitas and len(finitas) < len(esperas)
+    assert esperas[:len(finitas)] == sorted(finitas)
+    maximas = [max(estimarConfiguracion(configuracion, 60)["utilizacion"])
+               for configuracion, _ in ordenadas[len(finitas):]]
+    assert maximas == sorted(maximas)
+
+def test_errorRelativoDeUnaCajaSaturada():
+    assert errorRelativo(math.inf, 120.0) is None
+    assert errorRelativo(110.0, 100.0) == 0.1
+    assert errorRelativo(5.0, 0.0) == 0.0
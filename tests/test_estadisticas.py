@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from simulation.estadisticas import EstadisticasEspera, Histograma, TDigest, Welford
+from simulation.flujo import SumideroEstadisticas
+
+QS = (0.01, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999)
+
+@pytest.fixture
+def esperas():
+    return np.random.default_rng(5).exponential(300.0, 200_000)
+
+def errorRango(valores, qs, estimados):
+    """Distancia entre el cuantil pedido y la fracción de valores menores o iguales al estimado"""
+    ordenados = np.sort(valores)
+    return np.abs(np.searchsorted(ordenados, estimados, side="right") / len(valores) - np.asarray(qs))
+
+def test_tdigestCuantilesPrecisos(esperas):
+    digest = TDigest()
+    for bloque in np.array_split(esperas, 37):
+        digest.agregarBloque(bloque)
+    assert errorRango(esperas, QS, digest.cuantiles(QS)).max() < 0.002
+    assert len(digest.pesos) <= digest.compresion
+    assert digest.cuantil(0.0) == esperas.min() and digest.cuantil(1.0) == esperas.max()
+
+def test_tdigestUnoAUnoYCombinado(esperas):
+    partes = [TDigest() for _ in range(4)]
+    for parte, bloque in zip(partes, np.array_split(esperas[:40_000], 4)):
+        for valor in bloque.tolist():
+            parte.agregar(valor)
+    combinado = partes[0]
+    for parte in partes[1:]:
+        combinado.combinar(parte)
+    assert combinado.cantidad == 40_000
+    assert errorRango(esperas[:40_000], QS, combinado.cuantiles(QS)).max() < 0.003
+
+def test_welfordIgualANumpy(esperas):
+    uno = Welford()
+    for valor in esperas[:5000].tolist():
+        uno.agregar(valor)
+    assert uno.media == pytest.approx(esperas[:5000].mean(), rel=1e-12)
+    assert uno.varianza() == pytest.approx(esperas[:5000].var(ddof=1), rel=1e-10)
+
+    # combinación de Chan entre partes de tamaños distintos, una vacía
+    combinado = Welford()
+    for bloque in np.array_split(esperas, [10, 10, 7000, 123_456]):
+        parte = Welford()
+        parte.agregarBloque(bloque)
+        combinado.combinar(parte)
+    assert combinado.cantidad == len(esperas)
+    assert combinado.media == pytest.approx(esperas.mean(), rel=1e-12)
+    assert combinado.varianza() == pytest.approx(esperas.var(ddof=1), rel=1e-10)
+    assert (combinado.minimo, combinado.maximo) == (esperas.min(), esperas.max())
+
+def test_histogramaIgualANumpy(esperas):
+    histograma = Histograma(inicio=100.0, ancho=50.0, numeroIntervalos=20)
+    histograma.agregarBloque(esperas[:1000])
+    for valor in esperas[1000:2000].tolist():
+        histograma.agregar(valor)
+    conteos, _ = np.histogram(esperas[:2000], bins=histograma.bordes())
+    assert np.array_equal(histograma.conteos, conteos)
+    assert histograma.debajo == (esperas[:2000] < 100.0).sum()
+    assert histograma.encima == (esperas[:2000] >= histograma.bordes()[-1]).sum()
+
+def test_estadisticasEsperaCombinadas(esperas):
+    total = EstadisticasEspera()
+    total.agregarBloque(esperas)
+    partes = EstadisticasEspera()
+    for bloque in np.array_split(esperas, 8):
+        parte = EstadisticasEspera()
+        parte.agregarBloque(bloque)
+        partes.combinar(parte)
+    esperado, obtenido = total.resumen(), partes.resumen()
+    assert obtenido["cantidad"] == esperado["cantidad"]
+    assert obtenido["media"] == pytest.approx(esperado["media"], rel=1e-12)
+    assert errorRango(esperas, (0.5, 0.99), [obtenido["p50"], obtenido["p99"]]).max() < 0.002
+
+def test_sumideroPorCajaIgualANumpy(esperas):
+    cajas = np.random.default_rng(1).integers(0, 6, len(esperas))
+    tiempos = esperas + 40.0
+    sumidero = SumideroEstadisticas(7)  # la última caja queda sin clientes
+    for inicio in range(0, len(esperas), 30_000):
+        fin = inicio + 30_000
+        sumidero.agregar(cajas[inicio:fin], tiempos[inicio:fin], esperas[inicio:fin])
+    for caja in range(6):
+        deCaja = tiempos[cajas == caja]
+        assert sumidero.cantidad[caja] == len(deCaja)
+        assert sumidero.media[caja] == pytest.approx(deCaja.mean(), rel=1e-12)
+        assert sumidero.varianza()[caja] == pytest.approx(deCaja.var(ddof=1), rel=1e-10)
+    assert sumidero.cantidad[6] == 0 and sumidero.varianza()[6] == 0.0
+    # los percentiles son de la espera en fila, no del tiempo total
+    assert sumidero.estadisticas.momentos.media == pytest.approx(esperas.mean(), rel=1e-12)
+
+def test_replicasResumenLaEsperaEnFila():
+    from simulation.replicas import ejecutarReplica
+    from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+    clientes = Simulacion(ConfiguracionSimulacion(4, 200, "medio", 9)).ejecutar().clientes
+    resultado = ejecutarReplica(4, 200, "medio", 9)
+    assert resultado["estadisticasEspera"].momentos.media == pytest.approx(
+        np.mean([cliente.tiempoEspera for cliente in clientes]), rel=1e-12)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from simulation.lineaTiempo import LineaTiempo
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+
+@pytest.fixture(scope="module")
+def resultado():
+    return Simulacion(ConfiguracionSimulacion(7, 3000, "medio", 5, lineaTiempo=True)).ejecutar()
+
+def instantes(linea):
+    return [-1.0, 0.0, 1.0, linea.duracion / 3, linea.duracion / 2, linea.duracion - 1e-9, linea.duracion,
+            linea.duracion * 2]
+
+def test_maximaFila(resultado):
+    linea, cajas = resultado.lineaTiempo, resultado.cajas
+    assert linea.maximaFila([0] * len(cajas)) == max(len(caja.filaClientes) for caja in cajas)
+    for instante in instantes(linea):
+        atendidos = linea.atendidos(instante)
+        assert linea.maximaFila(atendidos) == max(linea.enFila(i, n) for i, n in enumerate(atendidos))
+    assert linea.maximaFila(linea.atendidos(linea.duracion)) == 0
+
+def salidasCaja(caja):
+    return [cliente.tiempoLlegada + cliente.tiempoTotal for cliente in caja.filaClientes]
+
+def test_atendidosContraConteoDirecto(resultado):
+    linea, cajas = resultado.lineaTiempo, resultado.cajas
+    for instante in instantes(linea):
+        esperado = [sum(1 for salida in salidasCaja(caja) if salida <= instante) for caja in cajas]
+        assert linea.atendidos(instante) == esperado
+        assert [linea.atendidosCaja(i, instante) for i in range(len(cajas))] == esperado
+
+def test_cargaPendienteYFilaContraConteoDirecto(resultado):
+    linea, cajas = resultado.lineaTiempo, resultado.cajas
+    for instante in instantes(linea):
+        for i, atendidos in enumerate(linea.atendidos(instante)):
+            caja = cajas[i]
+            enFila = list(caja.filaClientes)[atendidos:]
+            assert linea.enFila(i, atendidos) == len(enFila)
+            assert linea.cargaPendiente(i, atendidos) == pytest.approx(
+                sum(caja.tiempoAtencionCliente(cliente) for cliente in enFila), abs=1e-6)
+            assert linea.articulosEnFila(i, atendidos) == [cliente.numeroArticulos for cliente in enFila]
+            assert linea.articulosEnFila(i, atendidos, 2, 5) == [cliente.numeroArticulos for cliente in enFila[2:5]]
+
+def test_desdeColumnasIntercaladas(resultado):
+    linea, cajas = resultado.lineaTiempo, resultado.cajas
+    posicion = np.repeat(np.arange(len(cajas)), np.diff(linea.inicios))
+    orden = np.argsort(linea.salidas, kind="stable")  # intercaladas por instante de salida, FIFO en cada caja
+    otra = LineaTiempo.desdeColumnas(cajas, posicion[orden], linea.articulos[orden], linea.salidas[orden])
+    assert np.array_equal(otra.inicios, linea.inicios)
+    assert np.array_equal(otra.salidas, linea.salidas)
+    assert np.array_equal(otra.atencionAcumulada, linea.atencionAcumulada)
+
+def test_sinClientes():
+    resultado = Simulacion(ConfiguracionSimulacion(3, 0, "primera", 1, lineaTiempo=True)).ejecutar()
+    linea = resultado.lineaTiempo
+    assert linea.duracion == 0.0
+    assert linea.atendidos(10.0) == [0, 0, 0]
+    assert linea.cargaPendiente(0, 0) == 0.0 and linea.maximaFila([0, 0, 0]) == 0
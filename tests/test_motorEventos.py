@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from simulation.generadorDatos import GeneradorDatos
+from simulation.motorEventos import MotorEventos
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+
+def cajasPrueba():
+    return Simulacion(ConfiguracionSimulacion(5, 0, "medio", 2)).ejecutar().cajas
+
+def test_segundaCorridaNoMezclaTotales():
+    motor = MotorEventos(cajasPrueba(), clientesPorHora=600, duracion=2 * 3600, generador=GeneradorDatos(1))
+    primera = motor.ejecutar()
+    esperaPorCaja, atendidosPorCaja = list(motor.esperaPorCaja), list(motor.atendidosPorCaja)
+    motor.generador = GeneradorDatos(1)
+    assert motor.ejecutar() == primera
+    assert (motor.esperaPorCaja, motor.atendidosPorCaja) == (esperaPorCaja, atendidosPorCaja)
+    assert len(motor.atendidos) == primera["clientesAtendidos"]
+
+def test_resumenCoincideConLosClientes():
+    motor = MotorEventos(cajasPrueba(), clientesPorHora=900, duracion=3600, generador=GeneradorDatos(3))
+    resumen = motor.ejecutar()
+    esperas = np.array([cliente.tiempoEspera for cliente in motor.atendidos])
+    assert resumen["clientesAtendidos"] == resumen["clientesLlegados"] == len(esperas)
+    assert resumen["esperaPromedio"] == pytest.approx(esperas.mean())
+    assert resumen["espera"]["maximo"] == esperas.max()
+    assert all(cliente.tiempoLlegada < 3600 for cliente in motor.atendidos)
+    assert all(len(caja.filaClientes) == 0 for caja in motor.cajas)
+
+def test_primeraLlegadaRespetaLaDuracion():
+    motor = MotorEventos(cajasPrueba(), clientesPorHora=60, duracion=1e-6, generador=GeneradorDatos(1))
+    resumen = motor.ejecutar()
+    assert resumen["clientesLlegados"] == 0 and resumen["eventos"] == 0
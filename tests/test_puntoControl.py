@@ -0,0 +1,180 @@
+import os
+import numpy as np
+import pytest
+from simulation.barrido import Barrido, CacheResultados
+from simulation.controlReplicas import ControlReplicas
+from simulation.flujo import ejecutarFlujo
+from simulation.generadorDatos import GeneradorDatos
+from simulation.puntoControl import PuntoControl, cargarEstado
+from simulation.replicas import ejecutarReplicas
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+from simulation.traza import EscritorTraza
+
+TOTAL = 15_000
+BLOQUE = 1_000
+SEMILLA = 7
+
+class Caida(Exception):
+    pass
+
+class EscritorQueCae(EscritorTraza):
+    """Escritor que simula la muerte del proceso justo después de escribir el bloque número caerEn"""
+    caerEn = None
+
+    def agregar(self, *columnas):
+        super().agregar(*columnas)
+        if self.caerEn is not None and self.cantidad >= self.caerEn * BLOQUE:
+            raise Caida()
+
+def cajasPrueba():
+    return Simulacion(ConfiguracionSimulacion(6, 0, "medio", 3)).ejecutar().cajas
+
+def correrFlujo(rutaTraza, rutaControl=None, intervalo=0.0, caerEn=None):
+    cajas = cajasPrueba()
+    puntoControl = PuntoControl(rutaControl, intervalo) if rutaControl else None
+    with EscritorQueCae(rutaTraza, cajas, reanudar=puntoControl is not None) as escritor:
+        escritor.caerEn = caerEn
+        sumidero = ejecutarFlujo(cajas, TOTAL, BLOQUE, GeneradorDatos(SEMILLA), traza=escritor,
+                                 puntoControl=puntoControl)
+    return sumidero, cajas
+
+def leer(ruta):
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
+
+def mismoSumidero(a, b):
+    return (all(np.array_equal(getattr(a, nombre), getattr(b, nombre))
+                for nombre in ("cantidad", "media", "m2", "minimo", "maximo"))
+            and a.estadisticas.resumen() == b.estadisticas.resumen())
+
+@pytest.fixture
+def directo(tmp_path):
+    ruta = str(tmp_path / "directo.traza")
+    sumidero, cajas = correrFlujo(ruta)
+    return leer(ruta), sumidero, cajas
+
+def test_flujoReanudadoIgualAlDirecto(tmp_path, directo):
+    traza, control = str(tmp_path / "b.traza"), str(tmp_path / "b.pc")
+    with pytest.raises(Caida):
+        correrFlujo(traza, control, caerEn=5)
+    assert os.path.exists(traza + ".tmp") and not os.path.exists(traza)
+
+    sumidero, cajas = correrFlujo(traza, control)
+    assert leer(traza) == directo[0]
+    assert mismoSumidero(sumidero, directo[1])
+    assert [caja.tiempoAtencionTotal for caja in cajas] == [caja.tiempoAtencionTotal for caja in directo[2]]
+
+def test_flujoCaidoAntesDelPrimerPuntoNoDuplicaLaTraza(tmp_path, directo):
+    traza, control = str(tmp_path / "b.traza"), str(tmp_path / "b.pc")
+    with pytest.raises(Caida):
+        correrFlujo(traza, control, intervalo=1e9, caerEn=5)
+    assert not os.path.exists(control)
+
+    sumidero, _ = correrFlujo(traza, control)
+    assert leer(traza) == directo[0]
+    assert mismoSumidero(sumidero, directo[1])
+
+def test_flujoTerminadoSinPuntoDeControlSeRehace(tmp_path, directo):
+    traza, control = str(tmp_path / "b.traza"), str(tmp_path / "b.pc")
+    correrFlujo(traza, control)
+    os.remove(control)
+    correrFlujo(traza, control)
+    assert leer(traza) == directo[0]
+
+def test_flujoTerminadoNoSeRecalcula(tmp_path, directo):
+    traza, control = str(tmp_path / "b.traza"), str(tmp_path / "b.pc")
+    correrFlujo(traza, control)
+    sumidero, _ = correrFlujo(traza, control, caerEn=0)  # caería en cuanto escribiera un registro
+    assert leer(traza) == directo[0]
+    assert mismoSumidero(sumidero, directo[1])
+
+def test_flujoOtraSemillaSeRechaza(tmp_path):
+    control = str(tmp_path / "b.pc")
+    correrFlujo(str(tmp_path / "b.traza"), control)
+    cajas = cajasPrueba()
+    with pytest.raises(ValueError):
+        ejecutarFlujo(cajas, TOTAL, BLOQUE, GeneradorDatos(SEMILLA + 1), puntoControl=PuntoControl(control))
+
+class PuntoQueCae(PuntoControl):
+    """Punto de control que simula la muerte del proceso después de su guardado número caerEn"""
+    def __init__(self, ruta, caerEn):
+        super().__init__(ruta, intervalo=0.0)
+        self.caerEn = caerEn
+
+    def guardar(self, *argumentos, **estado):
+        super().guardar(*argumentos, **estado)
+        if self.guardados >= self.caerEn:
+            raise Caida()
+
+POSICIONES = ["primera", "ultima"]
+
+def test_replicasReanudadasIgualesALasDirectas(tmp_path):
+    control = str(tmp_path / "r.pc")
+    directo = ejecutarReplicas(4, 30, POSICIONES, 40, semilla=11, procesos=1)
+    with pytest.raises(Caida):
+        ejecutarReplicas(4, 30, POSICIONES, 40, semilla=11, procesos=1, puntoControl=PuntoQueCae(control, 2))
+    assert 0 < cargarEstado(control)["terminadas"] < 80
+
+    # otro número de procesos (y de lotes) da el mismo resultado
+    assert ejecutarReplicas(4, 30, POSICIONES, 40, semilla=11, procesos=2,
+                            puntoControl=PuntoControl(control, 0.0)) == directo
+
+def test_replicasSinSemillaSeReanudanConLaMismaRaiz(tmp_path):
+    control = str(tmp_path / "r.pc")
+    with pytest.raises(Caida):
+        ejecutarReplicas(3, 20, POSICIONES, 30, procesos=1, puntoControl=PuntoQueCae(control, 1))
+    entropia = cargarEstado(control)["entropia"]
+    reanudado = ejecutarReplicas(3, 20, POSICIONES, 30, procesos=1, puntoControl=PuntoControl(control, 0.0))
+    assert reanudado == ejecutarReplicas(3, 20, POSICIONES, 30, semilla=entropia, procesos=1)
+
+def test_puntoControlDeReplicasNoCreceConLasReplicas(tmp_path):
+    tamanos = []
+    for replicas in (20, 200):
+        control = str(tmp_path / f"{replicas}.pc")
+        ejecutarReplicas(3, 20, POSICIONES, replicas, semilla=1, procesos=1, puntoControl=PuntoControl(control))
+        tamanos.append(os.path.getsize(control))
+    assert tamanos[1] < tamanos[0] * 1.5
+
+REJILLA = {"numeroCajeros": [3, 4], "posicionExpress": ["primera", "ultima"]}
+
+def test_barridoReanudadoConservaElAvance(tmp_path):
+    directo = Barrido(40, 5, 1, CacheResultados(str(tmp_path / "directo")))
+    resumen = directo.adaptativo(REJILLA, replicasIniciales=2, replicasMaximas=8)
+
+    cache, control = CacheResultados(str(tmp_path / "cache")), str(tmp_path / "b.pc")
+    with pytest.raises(Caida):
+        Barrido(40, 5, 1, cache, puntoControl=PuntoQueCae(control, 6),
+                argumentos=REJILLA).adaptativo(REJILLA, replicasIniciales=2, replicasMaximas=8)
+    antes = cargarEstado(control)["corridasHechas"]
+    assert antes > 0
+
+    barrido = Barrido(40, 5, 1, cache, puntoControl=PuntoControl(control, 0.0), argumentos=REJILLA)
+    barrido.restaurarAvance(barrido.puntoControl.cargar("barrido", REJILLA))
+    barrido.guardarPunto()
+    assert cargarEstado(control)["corridasHechas"] == antes  # el avance no vuelve a cero
+
+    assert barrido.adaptativo(REJILLA, replicasIniciales=2, replicasMaximas=8) == resumen
+    barrido.guardarPunto(terminado=True)
+    estado = cargarEstado(control)
+    assert estado["corridasHechas"] == estado["corridasEjecutadas"] == directo.corridasEjecutadas
+
+def controlPrueba(maximo, puntoControl=None):
+    configuraciones = {posicion: ConfiguracionSimulacion(4, 20, posicion) for posicion in POSICIONES}
+    return ControlReplicas(configuraciones, semilla=3, antitetico=True, maximo=maximo, lote=10,
+                           puntoControl=puntoControl)
+
+def test_controlReplicasReanudadoIgualAlDirecto(tmp_path):
+    control = str(tmp_path / "c.pc")
+    directo = controlPrueba(60).ejecutar()
+    with pytest.raises(Caida):
+        controlPrueba(60, PuntoQueCae(control, 2)).ejecutar()
+    assert cargarEstado(control)["replicas"] == 20
+    assert controlPrueba(60, PuntoControl(control, 0.0)).ejecutar() == directo
+
+def test_controlReplicasAmpliaUnaCorridaTerminada(tmp_path):
+    control = str(tmp_path / "c.pc")
+    controlPrueba(30, PuntoControl(control)).ejecutar()
+    assert controlPrueba(60, PuntoControl(control)).ejecutar() == controlPrueba(60).ejecutar()
+    with pytest.raises(ValueError):
+        ControlReplicas({"primera": ConfiguracionSimulacion(5, 20, "primera")},
+                        puntoControl=PuntoControl(control)).ejecutar()
@@ -0,0 +1,27 @@
+import csv
+import json
+import numpy as np
+from simulation.resultados import FILAS_POR_BLOQUE, cargarNPZ, exportarResultados
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+
+def test_exportarCreaElDirectorioYLosFormatosCoinciden(tmp_path):
+    cajas = Simulacion(ConfiguracionSimulacion(5, FILAS_POR_BLOQUE + 123, "medio", 2)).ejecutar().cajas
+    base = tmp_path / "salida" / "corrida"
+    exportarResultados(str(base), cajas)
+
+    with open(f"{base}_clientes.csv", encoding="utf-8") as archivo:
+        filasCSV = list(csv.DictReader(archivo))
+    with open(f"{base}_clientes.jsonl", encoding="utf-8") as archivo:
+        filasJSON = [json.loads(linea) for linea in archivo]
+    datos = cargarNPZ(f"{base}.npz")
+
+    assert len(filasCSV) == len(filasJSON) == len(datos["tiempoTotal"]) == FILAS_POR_BLOQUE + 123
+    assert [float(fila["tiempoTotal"]) for fila in filasCSV] == [fila["tiempoTotal"] for fila in filasJSON]
+    assert np.array_equal([fila["tiempoEspera"] for fila in filasJSON], datos["tiempoEspera"])
+    assert [fila["idCaja"] for fila in filasJSON] == datos["caja_idCaja"][datos["caja"]].tolist()
+    assert [int(fila["cliente"]) for fila in filasCSV] == list(range(len(filasCSV)))
+
+def test_exportarSoloLosFormatosPedidos(tmp_path):
+    cajas = Simulacion(ConfiguracionSimulacion(3, 50, "primera", 1)).ejecutar().cajas
+    exportarResultados(str(tmp_path / "x"), cajas, formatos=["jsonl"])
+    assert sorted(ruta.name for ruta in tmp_path.iterdir()) == ["x_cajas.jsonl", "x_clientes.jsonl"]
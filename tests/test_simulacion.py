@@ -0,0 +1,50 @@
+import pytest
+from simulation.asignacion import BLOQUE_ASIGNACION, asignarClientes
+from simulation.generadorDatos import GeneradorDatos
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion, SimulacionCancelada
+
+class Revisor:
+    """revisar() que cancela en la llamada número cancelarEn"""
+    def __init__(self, cancelarEn):
+        self.cancelarEn = cancelarEn
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        if self.llamadas >= self.cancelarEn:
+            raise SimulacionCancelada()
+
+def test_generaClientesPorBloquesMismosSorteos():
+    cantidad = GeneradorDatos.BLOQUE_CLIENTES * 2 + 5
+    revisor = Revisor(cancelarEn=10)
+    clientes = GeneradorDatos(4).generaClientes(cantidad, revisar=revisor)
+    assert revisor.llamadas == 3
+    assert [cliente.numeroArticulos for cliente in clientes] == GeneradorDatos(4).articulosClientes(cantidad).tolist()
+
+def test_generaClientesSeCancelaEntreBloques():
+    with pytest.raises(SimulacionCancelada):
+        GeneradorDatos(4).generaClientes(GeneradorDatos.BLOQUE_CLIENTES * 5, revisar=Revisor(cancelarEn=2))
+
+def test_asignarClientesSeCancelaSinTocarLasCajas():
+    configuracion = ConfiguracionSimulacion(5, 0, "medio", 1)
+    cajas = Simulacion(configuracion).ejecutar().cajas
+    clientes = GeneradorDatos(2).generaClientes(BLOQUE_ASIGNACION * 3)
+    with pytest.raises(SimulacionCancelada):
+        asignarClientes(cajas, clientes, GeneradorDatos(3), revisar=Revisor(cancelarEn=2))
+    assert all(len(caja.filaClientes) == 0 for caja in cajas)
+
+def test_mismaSemillaMismoResultado():
+    configuracion = ConfiguracionSimulacion(6, 500, "aleatoria", 8)
+    a, b = Simulacion(configuracion).ejecutar(), Simulacion(configuracion).ejecutar()
+    assert [c.tiempoTotal for c in a.clientes] == [c.tiempoTotal for c in b.clientes]
+    assert [c.tiempoAtencionTotal for c in a.cajas] == [c.tiempoAtencionTotal for c in b.cajas]
+
+def test_resultadoNoDependeDelModuloRandom():
+    import random
+    configuracion = ConfiguracionSimulacion(6, 300, "medio", 8)
+    random.seed(1)
+    a = Simulacion(configuracion).ejecutar()
+    random.seed(2)
+    b = Simulacion(configuracion).ejecutar()
+    assert [caja.cajero.tiempoCobro for caja in a.cajas] == [caja.cajero.tiempoCobro for caja in b.cajas]
+    assert [c.tiempoTotal for c in a.clientes] == [c.tiempoTotal for c in b.clientes]
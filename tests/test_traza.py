@@ -0,0 +1,131 @@
+import os
+import numpy as np
+import pytest
+from simulation.simulacion import ConfiguracionSimulacion, Simulacion
+from models.almacenClientes import AlmacenClientes
+from simulation.lineaTiempo import LineaTiempo
+from simulation.traza import REGISTRO, EscritorTraza, Traza, escribirTraza
+
+def cajasPrueba(numeroCajeros=4):
+    return Simulacion(ConfiguracionSimulacion(numeroCajeros, 0, "primera", 1)).ejecutar().cajas
+
+def bloque(inicio, cantidad, numeroCajas=4):
+    indices = np.arange(inicio, inicio + cantidad)
+    return (indices % numeroCajas, indices % 30 + 1, indices * 0.5, indices * 0.5 + 3.0)
+
+def test_reanudarConservaLosRegistros(tmp_path):
+    ruta = str(tmp_path / "t.traza")
+    cajas = cajasPrueba()
+    with pytest.raises(RuntimeError):
+        with EscritorTraza(ruta, cajas, reanudar=True) as escritor:
+            escritor.agregar(*bloque(0, 100))
+            raise RuntimeError()
+    assert os.path.exists(ruta + ".tmp") and not os.path.exists(ruta)
+
+    with EscritorTraza(ruta, cajas, reanudar=True) as escritor:
+        assert escritor.cantidad == 100
+        escritor.agregar(*bloque(100, 50))
+    traza = Traza(ruta)
+    assert len(traza) == 150
+    assert np.array_equal(traza["tiempoEspera"], np.arange(150) * 0.5)
+
+def test_truncarDescartaLaCola(tmp_path):
+    ruta = str(tmp_path / "t.traza")
+    cajas = cajasPrueba()
+    with EscritorTraza(ruta, cajas, reanudar=True) as escritor:
+        escritor.agregar(*bloque(0, 100))
+        escritor.truncar(40)
+        escritor.agregar(*bloque(40, 10))
+        with pytest.raises(ValueError):
+            escritor.truncar(51)
+    assert os.path.getsize(ruta) == escritor.inicio + 50 * REGISTRO.itemsize
+    assert np.array_equal(Traza(ruta)["caja"], np.arange(50) % 4)
+
+def test_reanudarTrazaCerradaLaReabre(tmp_path):
+    ruta = str(tmp_path / "t.traza")
+    cajas = cajasPrueba()
+    with EscritorTraza(ruta, cajas, reanudar=True) as escritor:
+        escritor.agregar(*bloque(0, 30))
+    with EscritorTraza(ruta, cajas, reanudar=True) as escritor:
+        assert escritor.cantidad == 30
+        escritor.truncar(0)
+    assert len(Traza(ruta)) == 0
+
+def test_reanudarRegistroCortadoSeDescarta(tmp_path):
+    ruta = str(tmp_path / "t.traza")
+    cajas = cajasPrueba()
+    with pytest.raises(RuntimeError):
+        with EscritorTraza(ruta, cajas, reanudar=True) as escritor:
+            escritor.agregar(*bloque(0, 10))
+            raise RuntimeError()
+    with open(ruta + ".tmp", "ab") as archivo:
+        archivo.write(b"\x00" * 7)  # escritura interrumpida a mitad de un registro
+    with EscritorTraza(ruta, cajas, reanudar=True) as escritor:
+        assert escritor.cantidad == 10
+    assert os.path.getsize(ruta) == escritor.inicio + 10 * REGISTRO.itemsize
+
+def test_reanudarTrazaDeOtraCorridaSeRechaza(tmp_path):
+    ruta = str(tmp_path / "t.traza")
+    with pytest.raises(RuntimeError):
+        with EscritorTraza(ruta, cajasPrueba(), reanudar=True) as escritor:
+            raise RuntimeError()
+    with pytest.raises(ValueError):
+        EscritorTraza(ruta, cajasPrueba(5), reanudar=True)
+
+def test_reanudarTrazaTerminadaDeOtraCorridaNoLaMueve(tmp_path):
+    ruta = str(tmp_path / "t.traza")
+    with EscritorTraza(ruta, cajasPrueba(), reanudar=True) as escritor:
+        escritor.agregar(*bloque(0, 20))
+    with open(ruta, "rb") as archivo:
+        original = archivo.read()
+    with pytest.raises(ValueError):
+        EscritorTraza(ruta, cajasPrueba(5), reanudar=True)
+    assert not os.path.exists(ruta + ".tmp")
+    with open(ruta, "rb") as archivo:
+        assert archivo.read() == original
+
+def test_sinReanudarUnErrorNoDejaArchivos(tmp_path):
+    ruta = str(tmp_path / "t.traza")
+    with pytest.raises(RuntimeError):
+        with EscritorTraza(ruta, cajasPrueba()) as escritor:
+            escritor.agregar(*bloque(0, 10))
+            raise RuntimeError()
+    assert os.listdir(tmp_path) == []
+
+def test_escribirTrazaIdaYVuelta(tmp_path):
+    ruta = str(tmp_path / "corrida.traza")
+    configuracion = ConfiguracionSimulacion(6, 5000, "medio", 4)
+    cajas = Simulacion(configuracion).ejecutar().cajas
+    escribirTraza(ruta, cajas, configuracion)
+
+    traza = Traza(ruta)
+    almacen = AlmacenClientes.desdeCajas(cajas)
+    asignados = almacen.caja != AlmacenClientes.SIN_CAJA
+    assert len(traza) == asignados.sum()
+    for campo in ("caja", "numeroArticulos", "tiempoEspera", "tiempoTotal"):
+        assert np.array_equal(traza[campo], getattr(almacen, campo)[asignados])
+    assert traza.configuracion["semilla"] == 4
+
+    reconstruidas = traza.cajas()
+    assert [(c.idCaja, c.esExpress, c.cajero.experiencia, c.cajero.tiempoCobro) for c in reconstruidas] == \
+           [(c.idCaja, c.esExpress, c.cajero.experiencia, c.cajero.tiempoCobro) for c in cajas]
+    assert [c.tiempoAtencionTotal for c in reconstruidas] == pytest.approx([c.tiempoAtencionTotal for c in cajas])
+
+    linea, esperada = traza.lineaTiempo(), LineaTiempo.desdeCajas(cajas)
+    assert np.array_equal(linea.inicios, esperada.inicios)
+    assert np.array_equal(linea.articulos, esperada.articulos)
+    assert np.array_equal(linea.salidas, esperada.salidas)
+    for instante in (0.0, esperada.duracion / 2, esperada.duracion):
+        assert linea.atendidos(instante) == esperada.atendidos(instante)
+
+def test_sumideroDeLaTrazaIgualAlDelFlujo(tmp_path):
+    from simulation.flujo import ejecutarFlujo
+    from simulation.generadorDatos import GeneradorDatos
+    ruta = str(tmp_path / "flujo.traza")
+    cajas = cajasPrueba()
+    with EscritorTraza(ruta, cajas) as escritor:
+        sumidero = ejecutarFlujo(cajas, 12_345, 1_000, GeneradorDatos(2), traza=escritor)
+    desdeTraza = Traza(ruta).sumidero(tamanoBloque=777)
+    assert np.array_equal(desdeTraza.cantidad, sumidero.cantidad)
+    assert np.allclose(desdeTraza.media, sumidero.media)
+    assert desdeTraza.estadisticas.momentos.media == pytest.approx(sumidero.estadisticas.momentos.media)